@@ -0,0 +1,67 @@
+"""Startup cost and client count of per-agent LLM clients vs the shared client pool.
+
+Constructs the clients a batch of stories would need (one director plus the
+scenario's characters per story), first the old way with one
+ChatGoogleGenerativeAI per agent, then borrowed from the pool in
+src/llm/backends.py. Each client owns its own HTTP transport, so the client
+count is also the number of connection pools. No requests are sent.
+
+    uv run benchmarks/bench_client_pool.py --stories 20
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+# Client construction does not contact the API, but it needs a key to be set
+os.environ.setdefault("GOOGLE_API_KEY", "benchmark-placeholder")
+
+from langchain_google_genai import ChatGoogleGenerativeAI
+
+from src.config import StoryConfig
+from src.llm.backends import client_pool_stats, create_llm, prewarm_clients
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--stories", type=int, default=20)
+    parser.add_argument("--scenario", default=str(project_root / "examples" / "rickshaw_accident"))
+    args = parser.parse_args()
+
+    char_configs = json.loads((Path(args.scenario) / "character_configs.json").read_text())
+    agent_names = ["Director"] + [c["name"] for c in char_configs["characters"]]
+    config = StoryConfig()
+
+    started = time.perf_counter()
+    owned = [
+        ChatGoogleGenerativeAI(
+            model=config.model_name,
+            temperature=config.temperature,
+            max_output_tokens=config.max_tokens_per_prompt
+        )
+        for _ in range(args.stories)
+        for _ in agent_names
+    ]
+    per_agent_seconds = time.perf_counter() - started
+
+    prewarm_seconds = prewarm_clients(config)
+    started = time.perf_counter()
+    borrowed = [create_llm(config, name) for _ in range(args.stories) for name in agent_names]
+    pooled_seconds = time.perf_counter() - started
+
+    print(f"{args.stories} stories x {len(agent_names)} agents = {len(borrowed)} agent clients")
+    print(f"{'':>12} {'clients':>8} {'startup s':>10}")
+    print(f"{'per-agent':>12} {len(owned):>8} {per_agent_seconds:>10.3f}")
+    print(f"{'pooled':>12} {len({id(c) for c in borrowed}):>8} {prewarm_seconds + pooled_seconds:>10.3f}"
+          f"  (prewarm {prewarm_seconds:.3f}s)")
+    print(f"pool stats: {client_pool_stats()}")
+
+
+if __name__ == "__main__":
+    main()
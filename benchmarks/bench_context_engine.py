@@ -0,0 +1,95 @@
+"""Per-turn cost of building a character context as the story grows.
+
+Compares ContextEngine against a full-history scan of the kind it replaced.
+
+    uv run benchmarks/bench_context_engine.py --turns 2000
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from src.config import StoryConfig
+from src.context_budget import estimate_tokens
+from src.context_engine import ContextEngine
+from src.schemas import Action, CharacterProfile, DialogueTurn, StoryState
+from src.story_state import start_scene
+from src.world_model import WorldModel
+
+NAMES = ["Saleem", "Ahmed Malik", "Constable Raza", "Uncle Jameel"]
+
+
+def full_scan_own_lines(state: StoryState, name: str) -> str:
+    """The per-turn history walk the engine replaces."""
+    own_previous_lines = []
+    for turn in state.dialogue_history:
+        if turn.speaker == name:
+            own_previous_lines.append(f"[DIALOGUE] {turn.dialogue}")
+    for action in state.action_history:
+        if action.actor == name:
+            own_previous_lines.append(f"[ACTION: {action.action_type.upper()}] {action.description}")
+    return "\n".join(own_previous_lines[-5:])
+
+
+def make_state() -> StoryState:
+    state = StoryState(
+        seed_story={"description": "A rickshaw and a car have collided."},
+        character_profiles={name: CharacterProfile(name=name, description=name) for name in NAMES},
+        world=WorldModel(location="Shahrah-e-Faisal"),
+    )
+    start_scene(state)
+    return state
+
+
+def add_turn(state: StoryState, turn: int) -> None:
+    speaker = NAMES[turn % len(NAMES)]
+    if turn % 5 == 0:
+        state.action_history.append(Action(turn_number=turn, actor=speaker, action_type="gesture",
+                                           description=f"{speaker} gestures ({turn})"))
+    else:
+        state.dialogue_history.append(DialogueTurn(turn_number=turn, speaker=speaker,
+                                                   dialogue=f"Line {turn} from {speaker}"))
+    state.observation_log.note(speaker, f"I did something on turn {turn}")
+    state.current_turn = turn
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--turns", type=int, default=2000)
+    parser.add_argument("--report-every", type=int, default=250)
+    args = parser.parse_args()
+
+    config = StoryConfig(max_turns=args.turns + 1)
+    engine = ContextEngine(config)
+    state = make_state()
+    engine_window, scan_window, token_window = [], [], []
+
+    print(f"Median microseconds per turn over each window of {args.report_every} turns")
+    print(f"{'turn':>6} {'engine':>10} {'full scan':>10} {'max context tokens':>19}")
+    for turn in range(1, args.turns + 1):
+        add_turn(state, turn)
+        speaker = NAMES[(turn + 1) % len(NAMES)]
+
+        started = time.perf_counter()
+        context = engine.character_context(state, speaker)
+        engine_window.append(time.perf_counter() - started)
+        token_window.append(estimate_tokens(context))
+
+        started = time.perf_counter()
+        full_scan_own_lines(state, speaker)
+        scan_window.append(time.perf_counter() - started)
+
+        if turn % args.report_every == 0:
+            engine_us = statistics.median(engine_window) * 1e6
+            scan_us = statistics.median(scan_window) * 1e6
+            print(f"{turn:>6} {engine_us:>10.1f} {scan_us:>10.1f} {max(token_window):>19}")
+            engine_window, scan_window, token_window = [], [], []
+
+
+if __name__ == "__main__":
+    main()
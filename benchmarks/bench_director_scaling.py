@@ -0,0 +1,113 @@
+"""Director speaker-selection prompt size and latency as the cast grows.
+
+Builds a scene with a synthetic cast (each with a secret) and a recent history
+that names and hands items to cast members, then issues the director's
+speaker-selection call offering everyone vs. only the top-k candidates from
+the local scorer (config.director_candidates). Calls are answered by the
+replay backend, so the reported latency is the local cost (ranking and prompt
+building); the LLM's prompt-processing time is estimated from the prompt size
+at --prefill-tps tokens per second.
+
+    uv run benchmarks/bench_director_scaling.py --casts 4,20,50,100,200 --top-k 6
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from src.agents.director_agent import DirectorAgent
+from src.config import StoryConfig
+from src.graph.speaker_ranking import director_candidates
+from src.schemas import Action, CharacterProfile, DialogueTurn, StoryState
+from src.story_state import start_scene
+from src.world_model import WorldModel
+
+SYLLABLES = ["ba", "ka", "ra", "ji", "lo", "mi", "sa", "te", "nu", "zo", "fa", "ri"]
+
+
+def make_cast(size: int):
+    words = ("".join(parts).capitalize() for parts in itertools.product(SYLLABLES, repeat=3))
+    return [f"Bystander {word}" for word in itertools.islice(words, size)]
+
+
+def make_state(cast, rng: random.Random, turns: int = 30) -> StoryState:
+    profiles = {
+        name: CharacterProfile(
+            name=name,
+            description=f"{name} watches the accident from the roadside.",
+            secret=f"{name} saw the car jump the signal but owes the driver's cousin money and will not say so."
+        )
+        for name in cast
+    }
+    state = StoryState(
+        seed_story={"description": "A rickshaw and a car collide near the airport as a crowd gathers."},
+        character_profiles=profiles,
+        world=WorldModel(location="Shahrah-e-Faisal")
+    )
+    start_scene(state)
+    for turn in range(1, turns + 1):
+        speaker, other = rng.sample(cast, 2)
+        if turn % 6 == 0:
+            state.action_history.append(Action(
+                turn_number=turn, actor=speaker, action_type="give", target=other,
+                description=f"{speaker} hands {other} a crumpled challan slip."
+            ))
+        else:
+            state.dialogue_history.append(DialogueTurn(
+                turn_number=turn, speaker=speaker,
+                dialogue=f"{other.split()[-1]}, you saw it too. Tell them who was at fault!"
+            ))
+        state.current_turn = turn
+    return state
+
+
+def select(config: StoryConfig, state: StoryState, cast):
+    director = DirectorAgent(config)
+    started = time.perf_counter()
+    candidates = director_candidates(state, cast, config)
+    ranked = time.perf_counter()
+    asyncio.run(director.select_next_speaker(state, candidates, []))
+    finished = time.perf_counter()
+    return director.logs[-1]["prompt_tokens"], (ranked - started) * 1e6, (finished - started) * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--casts", default="4,20,50,100,200")
+    parser.add_argument("--top-k", type=int, default=6)
+    parser.add_argument("--prefill-tps", type=float, default=3000.0,
+                        help="assumed LLM prompt-processing speed, tokens per second")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        cassette = Path(tmp) / "cassette.json"
+        cassette.write_text(json.dumps([
+            {"agent": "Director", "prompt": "", "response": '{"next_speaker": "", "narration": "Horns blare."}'}
+        ]))
+        base = dict(llm_backend="replay", cassette_path=str(cassette), stop_at_json_end=False)
+
+        print(f"Estimated prefill at {args.prefill_tps:.0f} tokens/s; local ms is ranking + prompt building")
+        print(f"{'cast':>5} | {'all: tokens':>11} {'est ms':>7} {'local ms':>8} | "
+              f"{f'top-{args.top_k}: tokens':>13} {'est ms':>7} {'local ms':>8} {'rank us':>8}")
+        for size in (int(n) for n in args.casts.split(",")):
+            cast = make_cast(size)
+            state = make_state(cast, rng)
+            all_tokens, _, all_ms = select(StoryConfig(**base), state, cast)
+            top_tokens, rank_us, top_ms = select(StoryConfig(**base, director_candidates=args.top_k), state, cast)
+            print(f"{size:>5} | {all_tokens:>11} {all_tokens / args.prefill_tps * 1e3:>7.0f} {all_ms:>8.2f} | "
+                  f"{top_tokens:>13} {top_tokens / args.prefill_tps * 1e3:>7.0f} {top_ms:>8.2f} {rank_us:>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
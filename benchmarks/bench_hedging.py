@@ -0,0 +1,78 @@
+"""Tail latency of LLM calls with and without hedged requests.
+
+Replays calls against a synthetic cassette with heavy-tailed injected latency
+(lognormal), first plainly and then with hedging enabled, and reports the
+latency percentiles and how many extra requests hedging sent. No network access.
+
+    uv run benchmarks/bench_hedging.py --calls 400 --sigma 1.0
+"""
+import argparse
+import asyncio
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from src.agents.director_agent import DirectorAgent
+from src.config import StoryConfig
+from src.llm.latency import get_latency_tracker
+from src.metrics import RunMetrics
+
+
+async def run_calls(config: StoryConfig, calls: int, concurrency: int) -> RunMetrics:
+    # Each configuration starts with an empty latency history
+    get_latency_tracker().clear()
+    agent = DirectorAgent(config)
+    slots = asyncio.Semaphore(concurrency)
+
+    async def one(i):
+        async with slots:
+            await agent.generate_response(f"Who speaks next? ({i})", call_type="director_select")
+
+    await asyncio.gather(*(one(i) for i in range(calls)))
+    return agent.call_metrics
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--mu", type=float, default=-3.0, help="lognormal mu of per-call latency (log seconds)")
+    parser.add_argument("--sigma", type=float, default=1.0, help="lognormal sigma; larger means a heavier tail")
+    parser.add_argument("--percentile", type=float, default=0.9, help="hedge once a call outlives this quantile")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cassette = Path(tmp) / "cassette.json"
+        cassette.write_text(json.dumps([
+            {"agent": "Director", "prompt": "", "response": '{"next_speaker": "Saleem", "narration": "Horns blare."}'}
+        ]))
+        base = dict(
+            llm_backend="replay",
+            cassette_path=str(cassette),
+            replay_latency=f"lognormal:{args.mu},{args.sigma}",
+            stop_at_json_end=False
+        )
+        results = {
+            "plain": asyncio.run(run_calls(StoryConfig(**base), args.calls, args.concurrency)),
+            "hedged": asyncio.run(run_calls(
+                StoryConfig(**base, hedge_requests=True, hedge_percentile=args.percentile, hedge_min_samples=20),
+                args.calls, args.concurrency
+            )),
+        }
+
+    print(f"{args.calls} calls, latency lognormal(mu={args.mu}, sigma={args.sigma}), hedge at p{int(args.percentile * 100)}")
+    print(f"{'':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8} {'extra calls':>12}")
+    for name, metrics in results.items():
+        timing = metrics.to_dict()["timings"]["llm_latency_director_select_seconds"]
+        extra = metrics.counters.get("llm_hedges_launched", 0)
+        print(f"{name:>8} {timing['p50'] * 1000:>8.1f} {timing['p95'] * 1000:>8.1f} {timing['p99'] * 1000:>8.1f} "
+              f"{timing['max'] * 1000:>8.1f} {extra:>6} ({extra / args.calls:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Query latency of the per-character memory index as observations accumulate.
+
+Fills a MemoryIndex with synthetic observations in the style the story state
+writes, and reports the cost of appending and of top-k retrieval at each size,
+next to a pure-Python BM25 scan over the same observations.
+
+    uv run benchmarks/bench_memory_index.py --observations 10000 --k 5
+"""
+import argparse
+import math
+import random
+import statistics
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from src.memory_index import MemoryIndex, tokenize
+
+NAMES = ["Saleem", "Ahmed Malik", "Constable Raza", "Uncle Jameel"]
+ITEMS = ["expired rickshaw license", "leather wallet", "prayer beads", "Rolex watch", "business class ticket",
+         "traffic challan book", "police radio", "water bottle", "photo of the children", "insurance papers"]
+VERBS = ["showed me", "gave me", "pointed at", "argued about", "hid", "asked about", "waved", "mentioned"]
+WORDS = ("traffic crowd horn dent bumper car rickshaw airport flight money fine bribe police road heat "
+         "afternoon damage fault driver family school fees papers signal lane honking").split()
+
+
+def make_observation(rng: random.Random, turn: int) -> str:
+    filler = " ".join(rng.choice(WORDS) for _ in range(rng.randint(4, 12)))
+    return f"[{turn}] {rng.choice(NAMES)} {rng.choice(VERBS)} the {rng.choice(ITEMS)} near the {filler}"
+
+
+def python_bm25_top(docs, query: str, k: int):
+    """The straightforward per-observation loop the index replaces."""
+    tokenized = [Counter(tokenize(doc)) for doc in docs]
+    avg = sum(sum(t.values()) for t in tokenized) / len(tokenized)
+    df = Counter(term for t in tokenized for term in t)
+    scores = []
+    for i, terms in enumerate(tokenized):
+        length, score = sum(terms.values()), 0.0
+        for term in set(tokenize(query)):
+            tf = terms.get(term, 0)
+            if tf:
+                idf = math.log(1 + (len(docs) - df[term] + 0.5) / (df[term] + 0.5))
+                score += idf * tf * 2.2 / (tf + 1.2 * (0.25 + 0.75 * length / avg))
+        scores.append((score, i))
+    return sorted(scores, reverse=True)[:k]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--observations", type=int, default=10000)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    index = MemoryIndex()
+    docs = []
+    queries = [
+        f"{rng.choice(NAMES)}: What about the {rng.choice(ITEMS)}? The {rng.choice(WORDS)} and the {rng.choice(WORDS)}!"
+        for _ in range(args.queries)
+    ]
+    sizes = sorted({n for n in (100, 1000, 5000, 10000, 50000) if n < args.observations} | {args.observations})
+
+    print(f"{'observations':>12} {'append us':>10} {'query p50 ms':>13} {'query p99 ms':>13} {'python scan ms':>15}")
+    for size in sizes:
+        started = time.perf_counter()
+        added = size - len(docs)
+        for turn in range(len(docs), size):
+            docs.append(make_observation(rng, turn))
+            index.add(docs[-1])
+        append_us = (time.perf_counter() - started) / added * 1e6
+
+        latencies = []
+        for query in queries:
+            started = time.perf_counter()
+            index.top(query, args.k, budget_tokens=200)
+            latencies.append(time.perf_counter() - started)
+        latencies.sort()
+
+        started = time.perf_counter()
+        python_bm25_top(docs, queries[0], args.k)
+        scan_ms = (time.perf_counter() - started) * 1e3
+
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+        print(f"{size:>12} {append_us:>10.1f} {statistics.median(latencies) * 1e3:>13.3f} "
+              f"{p99 * 1e3:>13.3f} {scan_ms:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Per-action cost of recording observations as the cast grows.
+
+Compares the shared ObservationLog (what StoryStateManager.add_action does
+now) against copying a formatted string into every present character's
+memory, and reports the stored strings and the cost of reading a
+character's latest observations.
+
+    uv run benchmarks/bench_observation_log.py --actions 2000
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from src.config import StoryConfig
+from src.story_state import StoryStateManager
+from src.world_model import WorldEvent
+
+
+def fan_out_add_action(memories, present, actor: str, description: str) -> None:
+    """The per-character copy loop the shared log replaced."""
+    memories[actor].append(f"I performed action: {description}")
+    for name in memories:
+        if name != actor and name in present:
+            memories[name].append(f"{actor} performed action: {description}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--actions", type=int, default=2000)
+    parser.add_argument("--casts", default="4,20,50,200,400")
+    args = parser.parse_args()
+
+    print("One action in 50 changes who is present (a LEAVE or a return)")
+    print(f"{'cast':>5} {'fan-out us/action':>18} {'log us/action':>14} "
+          f"{'fan-out strings':>16} {'log entries':>12} {'log tail(5) us':>15}")
+    for cast in (int(n) for n in args.casts.split(",")):
+        names = [f"Character {i}" for i in range(cast)]
+        manager = StoryStateManager(
+            {"description": "A crowded street."},
+            [{"name": name, "description": name} for name in names],
+            StoryConfig()
+        )
+        # Someone steps away every 100 actions and comes back 50 later
+        leavers = {}
+
+        memories = {name: [] for name in names}
+        present = list(names)
+        started = time.perf_counter()
+        for i in range(args.actions):
+            fan_out_add_action(memories, present, names[i % cast], f"gestures ({i})")
+        fan_out_us = (time.perf_counter() - started) / args.actions * 1e6
+
+        started = time.perf_counter()
+        for i in range(args.actions):
+            actor, event = names[i % cast], None
+            if i % 100 == 0:
+                actor = leavers[i + 50] = names[(i // 100) % cast]
+                event = WorldEvent(kind="left", actor=actor, turn=i)
+            elif i in leavers:
+                actor = leavers.pop(i)
+                event = WorldEvent(kind="entered", actor=actor, turn=i)
+            manager.add_action(actor, "gesture", None, f"gestures ({i})", event)
+        log_us = (time.perf_counter() - started) / args.actions * 1e6
+
+        log = manager.state.observation_log
+        started = time.perf_counter()
+        for name in names:
+            log.tail(name, 5)
+        tail_us = (time.perf_counter() - started) / cast * 1e6
+
+        print(f"{cast:>5} {fan_out_us:>18.1f} {log_us:>14.1f} "
+              f"{sum(len(m) for m in memories.values()):>16} {len(log.entries):>12} {tail_us:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
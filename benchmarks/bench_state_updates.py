@@ -0,0 +1,99 @@
+"""Per-turn cost of a LangGraph state update as the story grows.
+
+Compares the old pattern (nodes return `state.events + [...]`, and every node
+input is a revalidated StoryState) with append reducers plus the
+validation-free TrustedStoryState input used by NarrativeGraph.
+
+    uv run benchmarks/bench_state_updates.py --turns 2000
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from langgraph.graph import END, StateGraph
+from langgraph.types import Command
+from pydantic import BaseModel, Field
+
+from src.schemas import DialogueTurn, StoryState, TrustedStoryState
+
+
+class LegacyState(BaseModel):
+    """The relevant StoryState fields as they were before append reducers."""
+    seed_story: Dict[str, Any]
+    current_turn: int = 0
+    dialogue_history: List[DialogueTurn] = Field(default_factory=list)
+    events: List[Dict[str, Any]] = Field(default_factory=list)
+    director_notes: List[str] = Field(default_factory=list)
+
+
+def build_graph(schema, input_schema, legacy: bool, turns: int):
+    async def turn_node(state):
+        turn = DialogueTurn(turn_number=state.current_turn + 1, speaker="Saleem", dialogue="Bhai, look!")
+        event = {"type": "dialogue", "speaker": "Saleem", "content": turn.dialogue, "turn": turn.turn_number}
+        note = f"Selected: Saleem ({turn.turn_number})"
+        if legacy:
+            update = {
+                "dialogue_history": state.dialogue_history + [turn],
+                "events": state.events + [event],
+                "director_notes": state.director_notes + [note],
+            }
+        else:
+            update = {"dialogue_history": [turn], "events": [event], "director_notes": [note]}
+        update["current_turn"] = turn.turn_number
+        return update
+
+    async def check_node(state):
+        return Command(goto=END if state.current_turn >= turns else "turn")
+
+    workflow = StateGraph(schema)
+    workflow.add_node("turn", turn_node, input_schema=input_schema)
+    workflow.add_node("check", check_node, input_schema=input_schema, destinations=("turn", END))
+    workflow.set_entry_point("turn")
+    workflow.add_edge("turn", "check")
+    return workflow.compile()
+
+
+async def measure(label, schema, input_schema, legacy, turns, report_every):
+    graph = build_graph(schema, input_schema, legacy, turns)
+    step_times: List[float] = []
+    last = time.perf_counter()
+    async for _ in graph.astream(schema(seed_story={}), {"recursion_limit": turns * 3}, stream_mode="updates"):
+        now = time.perf_counter()
+        step_times.append(now - last)
+        last = now
+    # Two graph steps (turn + check) per story turn
+    per_turn = [a + b for a, b in zip(step_times[0::2], step_times[1::2])]
+    rows = []
+    for end in range(report_every, turns + 1, report_every):
+        window = per_turn[end - report_every:end]
+        rows.append((end, statistics.median(window) * 1e6))
+    return label, rows
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--turns", type=int, default=2000)
+    parser.add_argument("--report-every", type=int, default=250)
+    args = parser.parse_args()
+
+    results = [
+        await measure("concat + validation", LegacyState, LegacyState, True, args.turns, args.report_every),
+        await measure("reducers + trusted", StoryState, TrustedStoryState, False, args.turns, args.report_every),
+    ]
+
+    print(f"Median microseconds per turn over each window of {args.report_every} turns")
+    print(f"{'turn':>6} " + " ".join(f"{label:>22}" for label, _ in results))
+    for i, (turn, _) in enumerate(results[0][1]):
+        print(f"{turn:>6} " + " ".join(f"{rows[i][1]:>22.1f}" for _, rows in results))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,120 @@
+"""Per-action cost of updating and querying the world state as actions accumulate.
+
+Compares the WorldModel (events applied to indexes in place) against the
+flag dict it replaced, where each action's effects were merged into a fresh
+copy of world_state and item ownership lived only in character inventories.
+
+    uv run benchmarks/bench_world_model.py --actions 5000 --cast 50
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from src.world_model import WorldEvent, WorldModel
+
+KINDS = ["item_given", "item_shown", "call_started", "threatened", "took", "searched", "moved", "gestured"]
+
+
+def flag_effects(event: WorldEvent):
+    """The string-keyed effects the old if/elif chain produced for the same event."""
+    return {
+        "item_given": {f"item_transferred_{event.actor}_to_{event.target}_{event.turn}": event.item},
+        "item_shown": {f"item_shown_by_{event.actor}": event.item},
+        "call_started": {f"{event.actor}_on_call": True},
+        "threatened": {"tension_level": "high"},
+        "took": {f"{event.actor}_took_from_{event.target}": True},
+        "searched": {f"{event.actor}_searching": True},
+        "moved": {f"{event.actor}_moved": True},
+        "gestured": {f"{event.actor}_gestured": True},
+    }[event.kind]
+
+
+def make_events(names, items, count: int, rng: random.Random):
+    holding = {item: names[i % len(names)] for i, item in enumerate(items)}
+    events = []
+    for turn in range(1, count + 1):
+        kind = rng.choice(KINDS)
+        if kind == "item_given":
+            item = rng.choice(items)
+            actor = holding[item]
+            target = rng.choice([n for n in names if n != actor])
+            holding[item] = target
+            events.append(WorldEvent(kind=kind, actor=actor, target=target, item=item, turn=turn))
+        else:
+            actor, target = rng.sample(names, 2)
+            events.append(WorldEvent(kind=kind, actor=actor, target=target, turn=turn))
+    return events
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--actions", type=int, default=5000)
+    parser.add_argument("--cast", type=int, default=50)
+    parser.add_argument("--items-each", type=int, default=3)
+    parser.add_argument("--report-every", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    names = [f"Character {i}" for i in range(args.cast)]
+    items = [f"Item {i}" for i in range(args.cast * args.items_each)]
+    events = make_events(names, items, args.actions, rng)
+
+    world = WorldModel(location="Shahrah-e-Faisal")
+    inventories = {name: [] for name in names}
+    for i, item in enumerate(items):
+        world.join(names[i % args.cast], [item])
+        inventories[names[i % args.cast]].append(item)
+    world_state = {"location": "Shahrah-e-Faisal", "characters_present": list(names)}
+
+    print(f"Microseconds: updates per action over each window of {args.report_every}, queries and copies "
+          f"per call at its end; cast {args.cast}, {len(items)} items")
+    print(f"{'actions':>8} {'dict merge':>11} {'world apply':>12} {'dict keys':>10} "
+          f"{'who holds (scan)':>17} {'who holds (index)':>18} {'dict copy':>10} {'snapshot':>9}")
+    merge_total = apply_total = 0.0
+    for done, event in enumerate(events, 1):
+        started = time.perf_counter()
+        world_state = {**world_state, **flag_effects(event)}
+        if event.kind == "item_given":
+            inventories[event.actor] = [i for i in inventories[event.actor] if i != event.item]
+            inventories[event.target].append(event.item)
+        merge_total += time.perf_counter() - started
+
+        started = time.perf_counter()
+        world.apply(event)
+        apply_total += time.perf_counter() - started
+
+        if done % args.report_every == 0:
+            probe = rng.sample(items, 100)
+            started = time.perf_counter()
+            for item in probe:
+                [name for name, held in inventories.items() if item in held]
+            scan_us = (time.perf_counter() - started) / len(probe) * 1e6
+            started = time.perf_counter()
+            for item in probe:
+                world.holders_of(item)
+            index_us = (time.perf_counter() - started) / len(probe) * 1e6
+
+            started = time.perf_counter()
+            for _ in range(100):
+                dict(world_state)
+            copy_us = (time.perf_counter() - started) / 100 * 1e6
+            started = time.perf_counter()
+            for _ in range(100):
+                world.snapshot()
+            snapshot_us = (time.perf_counter() - started) / 100 * 1e6
+
+            print(f"{done:>8} {merge_total / args.report_every * 1e6:>11.2f} "
+                  f"{apply_total / args.report_every * 1e6:>12.2f} {len(world_state):>10} "
+                  f"{scan_us:>17.2f} {index_us:>18.3f} {copy_us:>10.2f} {snapshot_us:>9.2f}")
+            merge_total = apply_total = 0.0
+
+
+if __name__ == "__main__":
+    main()
@@ -1,55 +1,391 @@
-import json
+import asyncio
+import time
+from collections import Counter
 from datetime import datetime
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
-from langchain_google_genai import ChatGoogleGenerativeAI
+from typing import Dict, Any, Callable, Optional, Tuple
 from ..config import StoryConfig
+from ..context_budget import estimate_tokens
+from ..llm.backends import create_llm
+from ..llm.cache import ResponseCache, get_response_cache
+from ..llm.circuit_breaker import get_breaker
+from ..llm.concurrency import get_call_slots
+from ..llm.latency import get_latency_tracker
+from ..llm.rate_limit import get_rate_limiter
+from ..llm.retry import FATAL, backoff_delay, classify_error, retry_after_seconds
+from ..metrics import RunMetrics
+from ..prompt_log import PromptLogStore
+from .json_stream import JsonObjectScanner, extract_partial_field, parse_json_object
 
 class BaseAgent(ABC):
-    def __init__(self, name: str, config: StoryConfig):
+    def __init__(self, name: str, config: StoryConfig, prompt_log: Optional[PromptLogStore] = None):
         self.name = name
         self.config = config
-        self.logs = [] # Store logs in memory
-        self.llm = ChatGoogleGenerativeAI(
-            model=config.model_name,
-            temperature=config.temperature,
-            max_output_tokens=config.max_tokens_per_prompt
-        )
+        self.role = name
+        self.logs = [] # Store logs in memory when there is no prompt log store
+        self.prompt_log = prompt_log
+        self.llm_calls = 0
+        self.cached_replies = 0  # Replies served from the response cache (not counted in llm_calls)
+        # Live clients are borrowed from the process-wide pool (src/llm/backends.py)
+        self.llm = create_llm(config, name)
+        self._override_llms = {}
+        # Shared by all agents with the same cache_dir (None when caching is off)
+        self.cache = get_response_cache(config)
+        # Global RPM/TPM quota (None when unlimited)
+        self.rate_limiter = get_rate_limiter(config.requests_per_minute, config.tokens_per_minute)
+        # Recent latencies per call type across all agents, for hedging
+        self.latency_tracker = get_latency_tracker()
+        # Early stops and local JSON repairs, folded into the run metrics
+        self.json_stats = Counter()
+        # Throttling and retry counters/timings, merged into the run metrics
+        self.call_metrics = RunMetrics()
     
-    async def generate_response(self, prompt: str) -> str:
-        """Generate a response using the LLM."""
+    async def generate_response(self, prompt: str, on_text: Optional[Callable[[str], Any]] = None,
+                                json_reply: bool = False, temperature: Optional[float] = None,
+                                max_tokens: Optional[int] = None, call_type: str = "default") -> str:
+        """Generate a response using the LLM, served from the response cache when possible.
+        
+        When config.stream_responses is on, on_text is called with the accumulated text
+        each time a chunk arrives (and once with the full text on a cache hit).
+        With json_reply and config.stop_at_json_end, generation stops as soon as the
+        reply's top-level JSON object is closed. temperature/max_tokens override the
+        config for this call only. call_type selects the deadline and latency histogram.
+        With config.fallback_models, calls go to the first model whose circuit breaker is closed.
+        """
+        if not self.config.stream_responses:
+            on_text = None
+        stop_at_end = json_reply and self.config.stop_at_json_end
+        
+        def make_on_text(forward: bool = True) -> Optional[Callable[[str], Any]]:
+            # Every attempt (retry or hedge) scans its own stream; only one forwards partials
+            target = on_text if forward else None
+            return self._stop_at_object_end(target) if stop_at_end else target
+        
+        temperature = self.config.temperature if temperature is None else temperature
+        max_tokens = self.config.max_tokens_per_prompt if max_tokens is None else max_tokens
         try:
-            # Merging system prompt concept into single message if needed, 
-            # but here we just take the prompt as is, assuming it contains everything.
-            messages = [
-                ("human", prompt)
-            ]
-            
-            response = await self.llm.ainvoke(messages)
+            if self.cache is not None and self.cache.is_cacheable(temperature):
+                served = {}
+                
+                def store(response: str) -> None:
+                    # File the response under the model that answered, which is a fallback during an outage
+                    model = served.get("model", self.config.model_name)
+                    self.cache.put(
+                        ResponseCache.make_key(model, temperature, max_tokens, prompt),
+                        response,
+                        model=model,
+                        temperature=temperature,
+                        max_output_tokens=max_tokens,
+                        prompt=prompt
+                    )
+                
+                key = ResponseCache.make_key(
+                    self.config.model_name,
+                    temperature,
+                    max_tokens,
+                    prompt
+                )
+                content, from_cache = await self.cache.get_or_generate(
+                    key,
+                    lambda: self._invoke(prompt, make_on_text, temperature, max_tokens, call_type, served),
+                    store=store
+                )
+                if from_cache and on_text is not None:
+                    on_text(content)
+            else:
+                content = await self._invoke(prompt, make_on_text, temperature, max_tokens, call_type)
+                from_cache = False
             
             # Log the prompt and response
-            self._log_interaction(prompt, response.content)
+            self._log_interaction(prompt, content, cached=from_cache)
             
-            return response.content
+            return content
         except Exception as e:
             print(f"Error generating response for {self.name}: {e}")
             return ""
 
-    def _log_interaction(self, prompt: str, response: str):
-        """Log interaction to memory."""
+    def _client(self, temperature: float, max_tokens: int, model: Optional[str] = None):
+        """The chat model for these generation parameters (the agent's default unless overridden)."""
+        model = self.config.model_name if model is None else model
+        if (model == self.config.model_name and temperature == self.config.temperature
+                and max_tokens == self.config.max_tokens_per_prompt) or self.config.llm_backend == "replay":
+            return self.llm
+        key = (model, temperature, max_tokens)
+        if key not in self._override_llms:
+            self._override_llms[key] = create_llm(self.config, self.name, temperature, max_tokens, model_name=model)
+        return self._override_llms[key]
+
+    def _pick_model(self, excluded=()):
+        """The first model in the fallback chain whose breaker lets a call through, with that breaker.
+        
+        Without fallback models there are no breakers: (model_name, None).
+        Returns (None, None) when every model not in `excluded` is unavailable.
+        """
+        if not self.config.fallback_models:
+            return self.config.model_name, None
+        for model in [self.config.model_name, *self.config.fallback_models]:
+            if model in excluded:
+                continue
+            breaker = get_breaker(model, self.config)
+            allowed, transition = breaker.allow()
+            if transition is not None:
+                self._record_transition(transition)
+            if allowed:
+                if model != self.config.model_name:
+                    self.call_metrics.incr("llm_fallback_calls")
+                return model, breaker
+        return None, None
+
+    def _record_transition(self, transition: Dict) -> None:
+        self.call_metrics.record("breaker_transitions", {**transition, "agent": self.name})
+        print(f"  [{self.name}: {transition['model']} breaker {transition['from']} -> {transition['to']} ({transition['reason']})]")
+
+    async def _invoke(self, prompt: str, make_on_text: Optional[Callable[[bool], Any]] = None,
+                      temperature: Optional[float] = None, max_tokens: Optional[int] = None,
+                      call_type: str = "default", served: Optional[Dict] = None) -> str:
+        """Send a single prompt to the LLM backend and return the raw text.
+        
+        Rate-limited and transient failures are retried with exponential backoff
+        and jitter (at least the server's retry-after hint); anything else, or the
+        last failed retry, is raised. The call type's deadline covers the whole
+        call, attempts and backoff included: an attempt only gets the time left,
+        and no retry is started that could not begin before it expires.
+        Each attempt goes to the model picked by _pick_model(); a model that fails
+        with a non-retryable error is dropped for the rest of the call, so the next
+        model in the chain is tried before giving up.
+        make_on_text(forward) builds a fresh stream callback for each attempt.
+        The model that answered is stored in served["model"] when served is given.
+        """
+        make_on_text = make_on_text or (lambda forward=True: None)
+        temperature = self.config.temperature if temperature is None else temperature
+        max_tokens = self.config.max_tokens_per_prompt if max_tokens is None else max_tokens
+        # Merging system prompt concept into single message if needed, 
+        # but here we just take the prompt as is, assuming it contains everything.
+        messages = [
+            ("human", prompt)
+        ]
+        
+        deadline = self.config.call_deadlines.get(call_type)
+        expires = None if deadline is None else time.monotonic() + deadline
+        attempt, failed_models, last_error = 0, set(), None
+        while True:
+            remaining = None if expires is None else expires - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                self.call_metrics.incr("llm_deadlines_missed")
+                raise last_error or asyncio.TimeoutError()
+            model, breaker = self._pick_model(failed_models)
+            if model is None:
+                if last_error is not None:
+                    raise last_error
+                # Every breaker is open: keep trying the primary rather than failing outright
+                self.call_metrics.incr("llm_all_breakers_open")
+                model = self.config.model_name
+            llm = self._client(temperature, max_tokens, model)
+            self.call_metrics.incr(f"llm_model_calls_{model}")
+            try:
+                text, backend_seconds = await self._timed_attempt(llm, messages, prompt, make_on_text, max_tokens,
+                                                                  call_type, remaining)
+            except asyncio.CancelledError:
+                if breaker is not None:
+                    breaker.release()
+                raise
+            except Exception as e:
+                if breaker is not None:
+                    self._record_outcome(breaker, False)
+                if isinstance(e, asyncio.TimeoutError):
+                    self.call_metrics.incr("llm_deadlines_missed")
+                kind = classify_error(e)
+                if kind == FATAL:
+                    self.call_metrics.incr("llm_fatal_errors")
+                    if breaker is None:
+                        raise
+                    # Another model may accept what this one rejected
+                    failed_models.add(model)
+                    last_error = e
+                    continue
+                hint = retry_after_seconds(e)
+                delay = backoff_delay(attempt, self.config.retry_base_delay, self.config.retry_max_delay, hint)
+                if attempt >= self.config.llm_max_retries or (
+                        expires is not None and time.monotonic() + delay >= expires):
+                    self.call_metrics.incr("llm_give_ups")
+                    raise
+                if hint is not None and self.rate_limiter is not None:
+                    # The quota is shared, so everyone waits out the hint
+                    self.rate_limiter.pause(delay)
+                self.call_metrics.incr("llm_retries")
+                self.call_metrics.incr(f"llm_retries_{kind}")
+                self.call_metrics.observe("llm_backoff_seconds", delay)
+                print(f"  [{self.name}: {kind} error, retrying in {delay:.1f}s ({attempt + 1}/{self.config.llm_max_retries})]")
+                await asyncio.sleep(delay)
+                attempt += 1
+            else:
+                if breaker is not None:
+                    # Only the backend's own time counts as slow; waiting on local throttling does not
+                    self._record_outcome(breaker, True, backend_seconds)
+                if served is not None:
+                    served["model"] = model
+                return text
+
+    def _record_outcome(self, breaker, ok: bool, latency: Optional[float] = None) -> None:
+        transition = breaker.record(ok, latency)
+        if transition is not None:
+            self._record_transition(transition)
+
+    async def _timed_attempt(self, llm, messages, prompt: str, make_on_text, max_tokens: int,
+                             call_type: str, timeout: Optional[float] = None) -> Tuple[str, float]:
+        """One attempt given `timeout` seconds (None = no limit), hedged when enabled; records its latency.
+        
+        Returns the text and the seconds the answering backend call itself took.
+        """
+        started = time.perf_counter()
+        if self.config.hedge_requests:
+            call = self._hedged_attempt(llm, messages, prompt, make_on_text, max_tokens, call_type)
+        else:
+            call = self._attempt(llm, messages, prompt, make_on_text(True), max_tokens)
+        text, backend_seconds = await asyncio.wait_for(call, timeout)
+        latency = time.perf_counter() - started
+        self.latency_tracker.record(call_type, latency)
+        self.call_metrics.observe(f"llm_latency_{call_type}_seconds", latency)
+        return text, backend_seconds
+
+    async def _hedged_attempt(self, llm, messages, prompt: str, make_on_text, max_tokens: int,
+                              call_type: str) -> Tuple[str, float]:
+        """Send a duplicate request once the call outlives the recent latency percentile; first answer wins."""
+        hedge_after = self.latency_tracker.percentile(
+            call_type, self.config.hedge_percentile, self.config.hedge_min_samples
+        )
+        primary = asyncio.ensure_future(self._attempt(llm, messages, prompt, make_on_text(True), max_tokens))
+        if hedge_after is None:
+            return await primary
+        
+        tasks = [primary]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=hedge_after)
+            if done:
+                return primary.result()
+            
+            self.call_metrics.incr("llm_hedges_launched")
+            hedge = asyncio.ensure_future(self._attempt(llm, messages, prompt, make_on_text(False), max_tokens))
+            tasks.append(hedge)
+            pending, error = set(tasks), None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.call_metrics.incr("llm_hedges_won")
+                        return task.result()
+                    error = error or task.exception()
+            raise error
+        finally:
+            # The slower request (or both, if the deadline hit) is cancelled
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    async def _attempt(self, llm, messages, prompt: str, on_text: Optional[Callable[[str], Any]],
+                       max_tokens: int) -> Tuple[str, float]:
+        """One call under the rate limiter and the in-flight call cap.
+        
+        Returns the text and the seconds spent in the backend call, excluding queueing.
+        """
+        reserved = 0
+        if self.rate_limiter is not None:
+            # Reserve the worst case up front and hand back what the reply did not use
+            reserved = estimate_tokens(prompt) + max_tokens
+            waited = await self.rate_limiter.acquire(reserved)
+            if waited > 0:
+                self.call_metrics.observe("llm_throttled_seconds", waited)
+        
+        # Global cap on concurrent backend calls (None when unlimited)
+        call_slots = get_call_slots(self.config.max_inflight_calls)
+        if call_slots is None:
+            started = time.perf_counter()
+            text = await self._call_backend(llm, messages, on_text)
+        else:
+            async with call_slots:
+                started = time.perf_counter()
+                text = await self._call_backend(llm, messages, on_text)
+        backend_seconds = time.perf_counter() - started
+        
+        if self.rate_limiter is not None:
+            self.rate_limiter.refund(max_tokens - estimate_tokens(text))
+        return text, backend_seconds
+
+    async def _call_backend(self, llm, messages, on_text: Optional[Callable[[str], Any]]) -> str:
+        """Invoke the backend, streaming chunks to on_text when it is given.
+        
+        A truthy return from on_text stops the stream early.
+        """
+        if on_text is None:
+            response = await llm.ainvoke(messages)
+            return response.content
+        
+        text = ""
+        async for chunk in llm.astream(messages):
+            text += chunk.content
+            if on_text(text):
+                break
+        return text
+
+    def _stop_at_object_end(self, on_text: Optional[Callable[[str], Any]]) -> Callable[[str], bool]:
+        """Wrap on_text so the stream stops once the first JSON object is complete."""
+        scanner = JsonObjectScanner()
+        
+        def stop_when_closed(buffer: str) -> bool:
+            if on_text is not None:
+                on_text(buffer)
+            if scanner.feed(buffer):
+                if buffer[scanner.end:].strip():
+                    self.json_stats["early_stop"] += 1
+                return True
+            return False
+        return stop_when_closed
+
+    def _parse_json(self, response: str) -> Dict:
+        """Parse a JSON reply, repairing common defects locally. Raises ValueError if unrecoverable."""
+        try:
+            data, repairs = parse_json_object(response)
+        except ValueError:
+            self.json_stats["parse_failed"] += 1
+            raise
+        for repair in repairs:
+            self.json_stats[f"repair_{repair}"] += 1
+        return data
+
+    def _field_streamer(self, field: str, on_partial: Optional[Callable[[str], Any]]) -> Optional[Callable[[str], Any]]:
+        """Adapt on_partial(text) to an on_text callback that follows one JSON string field."""
+        if on_partial is None:
+            return None
+        last = [None]
+        
+        def on_text(buffer: str):
+            value = extract_partial_field(buffer, field)
+            if value and value != last[0]:
+                last[0] = value
+                on_partial(value)
+        return on_text
+
+    def _log_interaction(self, prompt: str, response: str, cached: bool = False):
+        """Log interaction to memory; cache hits are marked "cached" and not counted as LLM calls."""
+        prompt_tokens = estimate_tokens(prompt)
+        if prompt_tokens > self.config.max_context_length:
+            print(f"  [Warning: {self.name} prompt is ~{prompt_tokens} tokens, over max_context_length ({self.config.max_context_length})]")
         entry = {
             "timestamp": datetime.now().isoformat(),
             "agent": self.name,
             "prompt": prompt,
-            "response": response
+            "response": response,
+            "prompt_tokens": prompt_tokens,
+            "response_tokens": estimate_tokens(response),
+            "role": self.role
         }
-        self.logs.append(entry)
-
-    def _clean_json_response(self, response: str) -> str:
-        """Clean markdown formatting from JSON response."""
-        cleaned = response.strip()
-        if "```json" in cleaned:
-            cleaned = cleaned.split("```json")[1].split("```")[0]
-        elif "```" in cleaned:
-            cleaned = cleaned.split("```")[1].split("```")[0]
-        return cleaned.strip()
+        if cached:
+            entry["cached"] = True
+            self.cached_replies += 1
+        else:
+            self.llm_calls += 1
+        if self.prompt_log is not None:
+            self.prompt_log.append(entry)
+        else:
+            self.logs.append(entry)
@@ -1,134 +1,129 @@
-import json
-from typing import List, Dict, Tuple, Optional
+from typing import Any, Callable, List, Dict, Tuple, Optional
 from .base_agent import BaseAgent
 from ..config import StoryConfig
 from ..schemas import StoryState, CharacterProfile
+from ..world_model import WorldEvent, WorldModel
+from ..prompt_log import PromptLogStore
 from ..prompts.character_prompts import get_character_prompt
 
 class CharacterAgent(BaseAgent):
-    def __init__(self, name: str, config: StoryConfig):
-        super().__init__(name, config)
+    def __init__(self, name: str, config: StoryConfig, prompt_log: Optional[PromptLogStore] = None):
+        super().__init__(name, config, prompt_log)
+        self.role = f"Character ({name})"
 
     async def respond(self, story_state: StoryState, context: str) -> Tuple[str, Optional[Dict]]:
         """Generate a response based on the current story state and context.
         
         Returns:
             Tuple of (response_text, action_dict or None)
-            action_dict has keys: action_type, action_target, description, effects
+            action_dict has keys: action_type, action_target, description, event
         """
-        
+        draft = await self.draft_response(story_state, context)
+        return self.resolve_draft(draft, story_state)
+
+    def build_prompt(self, story_state: StoryState, context: str) -> str:
+        """Build the full LLM prompt for this character."""
         # Get character profile
         character_profile = story_state.character_profiles.get(self.name)
         
-        # Build prompt
-        prompt = get_character_prompt(
+        return get_character_prompt(
             character_name=self.name,
             character_profile=character_profile,
             context=context,
             config=self.config
         )
+
+    async def draft_response(self, story_state: StoryState, context: str,
+                             on_partial: Optional[Callable[[str], Any]] = None) -> Dict:
+        """Generate and parse a reply without touching the story state.
+        
+        Drafts have no side effects, so they can be generated speculatively and
+        discarded. Returns a dict with reasoning, action_type, action_target and response.
+        on_partial receives the in-progress "response" text when streaming is enabled.
+        """
+        prompt = self.build_prompt(story_state, context)
         
         try:
-            content = await self.generate_response(prompt)
+            content = await self.generate_response(
+                prompt, self._field_streamer("response", on_partial), json_reply=True,
+                call_type="character_respond"
+            )
             content = content.strip()
             
             # Try to parse JSON response
             try:
-                cleaned_response = self._clean_json_response(content)
-                response_data = json.loads(cleaned_response)
-                
-                action_type = response_data.get("action_type", "TALK")
-                reasoning = response_data.get("reasoning", "")
-                response_text = response_data.get("response", "")
+                response_data = self._parse_json(content)
                 
-                # Log reasoning
-                if reasoning:
-                    print(f"  [{self.name} thinks: {reasoning}]")
-                
-                if action_type != "TALK":
-                    # This is an action
-                    action_dict = {
-                        "action_type": action_type.lower(),
-                        "action_target": response_data.get("action_target"),
-                        "description": response_text,
-                        "effects": self._determine_action_effects(
-                            action_type, 
-                            response_data.get("action_target"),
-                            response_text,
-                            story_state
-                        )
-                    }
-                    return response_text, action_dict
-                else:
-                    # Regular dialogue
-                    return response_text, None
+                return {
+                    "reasoning": response_data.get("reasoning", ""),
+                    "action_type": str(response_data.get("action_type") or "TALK").strip().upper(),
+                    "action_target": response_data.get("action_target"),
+                    "response": response_data.get("response", "")
+                }
                     
-            except json.JSONDecodeError:
+            except ValueError:
                 # Fallback: treat as regular dialogue
                 print(f"  [Warning: Could not parse JSON from {self.name}, treating as dialogue]")
-                return content, None
+                return {"reasoning": "", "action_type": "TALK", "action_target": None, "response": content}
                 
         except Exception as e:
             print(f"Error in character response: {e}")
-            return "...", None
-    
-    def _determine_action_effects(self, action_type: str, target: Optional[str], 
-                                  description: str, story_state: StoryState) -> Dict:
-        """Determine the effects of an action on the story state."""
-        effects = {}
-        action_type = action_type.upper()
-        char_memory = story_state.character_profiles[self.name].memory
+            return {"reasoning": "", "action_type": "TALK", "action_target": None, "response": "..."}
+
+    def resolve_draft(self, draft: Dict, story_state: StoryState) -> Tuple[str, Optional[Dict]]:
+        """Turn a draft into dialogue or an action, with the WorldEvent the action will apply.
         
-        if action_type == "LEAVE":
-            # Character leaves the scene
-            characters_present = story_state.world_state.get("characters_present", [])
-            if self.name in characters_present:
-                updated_present = [c for c in characters_present if c != self.name]
-                effects["characters_present"] = updated_present
-                
-        elif action_type == "CALL":
-            # Character makes a phone call
-            effects[f"{self.name}_on_call"] = True
-            
-        elif action_type == "GIVE" and target:
+        Nothing is changed here; the caller applies the event when it commits the turn.
+        """
+        action_type = draft["action_type"]
+        response_text = draft["response"]
+        
+        # Log reasoning
+        if draft["reasoning"]:
+            print(f"  [{self.name} thinks: {draft['reasoning']}]")
+        
+        if action_type != "TALK":
+            # This is an action
+            action_dict = {
+                "action_type": action_type.lower(),
+                "action_target": draft["action_target"],
+                "description": response_text,
+                "event": self._action_event(
+                    action_type, 
+                    draft["action_target"],
+                    response_text,
+                    story_state.world
+                )
+            }
+            return response_text, action_dict
+        else:
+            # Regular dialogue
+            return response_text, None
+    
+    # Action type -> (world event kind, whether the action needs a target)
+    ACTION_EVENTS = {
+        "LEAVE": ("left", False),
+        "CALL": ("call_started", False),
+        "GIVE": ("item_given", True),
+        "SHOW": ("item_shown", True),
+        "THREATEN": ("threatened", False),
+        "TAKE": ("took", True),
+        "SEARCH": ("searched", False),
+        "MOVE": ("moved", False),
+        "GESTURE": ("gestured", False),
+    }
+    
+    def _action_event(self, action_type: str, target: Optional[str],
+                      description: str, world: WorldModel) -> Optional[WorldEvent]:
+        """The world change an action makes, or None (unknown type, missing target, or leaving when already gone)."""
+        kind, needs_target = self.ACTION_EVENTS.get(action_type.upper(), (None, False))
+        if kind is None or (needs_target and not target) or (kind == "left" and not world.is_present(self.name)):
+            return None
+        item = None
+        if kind in ("item_given", "item_shown"):
             # Try to find the relevant item from inventory based on the action description
-            given_item = self._find_relevant_item(char_memory.inventory, description)
-            if given_item:
-                # Remove from giver's inventory
-                char_memory.inventory = [i for i in char_memory.inventory if i != given_item]
-                # Add to target's inventory if they exist
-                if target in story_state.character_profiles:
-                    target_memory = story_state.character_profiles[target].memory
-                    target_memory.inventory.append(given_item)
-                    target_memory.observations.append(f"{self.name} gave me: {given_item}")
-                effects[f"item_transferred_{self.name}_to_{target}"] = given_item
-            else:
-                effects[f"item_given_to_{target}"] = True
-            
-        elif action_type == "SHOW" and target:
-            # Character shows an item — doesn't transfer it, but target now knows about it
-            shown_item = self._find_relevant_item(char_memory.inventory, description)
-            if shown_item and target in story_state.character_profiles:
-                target_memory = story_state.character_profiles[target].memory
-                target_memory.observations.append(f"{self.name} showed me: {shown_item}")
-            effects[f"item_shown_by_{self.name}"] = shown_item or description
-                
-        elif action_type == "THREATEN":
-            effects["tension_level"] = "high"
-            
-        elif action_type == "TAKE" and target:
-            effects[f"{self.name}_took_from_{target}"] = True
-            
-        elif action_type == "SEARCH":
-            effects[f"{self.name}_searching"] = True
-            
-        elif action_type == "MOVE":
-            effects[f"{self.name}_moved"] = True
-            
-        elif action_type == "GESTURE":
-            effects[f"{self.name}_gestured"] = True
-            
-        return effects
+            item = self._find_relevant_item(world.items_of(self.name), description)
+        return WorldEvent(kind=kind, actor=self.name, target=target or None, item=item)
     
     def _find_relevant_item(self, inventory: List[str], description: str) -> Optional[str]:
         """Find the most relevant inventory item based on an action description."""
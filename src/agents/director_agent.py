@@ -1,22 +1,49 @@
-import json
-from typing import List, Tuple, Optional
+from typing import Any, Callable, Dict, List, Tuple, Optional
 from .base_agent import BaseAgent
 from ..config import StoryConfig
 from ..schemas import StoryState
+from ..prompt_log import PromptLogStore
 from ..prompts.director_prompts import (
     DIRECTOR_SELECT_SPEAKER_PROMPT, 
     DIRECTOR_CONCLUSION_PROMPT,
-    DIRECTOR_FORCE_CONCLUDE_PROMPT
+    DIRECTOR_FORCE_CONCLUDE_PROMPT,
+    DIRECTOR_TURN_PROMPT
 )
 
 class DirectorAgent(BaseAgent):
-    def __init__(self, config: StoryConfig):
-        super().__init__("Director", config)
+    def __init__(self, config: StoryConfig, prompt_log: Optional[PromptLogStore] = None):
+        super().__init__("Director", config, prompt_log)
     
     async def select_next_speaker(self, story_state: StoryState, 
                                    available_characters: List[str],
-                                   previous_narrations: List[str] = None) -> str:
-        """Decide who speaks next."""
+                                   previous_narrations: List[str] = None,
+                                   on_partial: Optional[Callable[[str], Any]] = None) -> str:
+        """Decide who speaks next. on_partial receives the in-progress narration when streaming."""
+        prompt = DIRECTOR_SELECT_SPEAKER_PROMPT.format(
+            **self._selection_fields(story_state, available_characters, previous_narrations)
+        )
+        
+        response = await self.generate_response(
+            prompt, self._field_streamer("narration", on_partial), json_reply=True, call_type="director_select"
+        )
+        
+        try:
+            data = self._parse_json(response)
+            next_speaker = data.get("next_speaker")
+            narration = data.get("narration")
+            
+            if next_speaker in available_characters:
+                return next_speaker, narration
+            return available_characters[0], narration
+            
+        except Exception as e:
+            print(f"Error parsing director selection: {e}")
+            print(f"Raw response: {response}")
+            return available_characters[0], ""
+
+    def _selection_fields(self, story_state: StoryState, available_characters: List[str],
+                          previous_narrations: List[str] = None) -> Dict[str, str]:
+        """Format the scene context shared by the speaker-selection prompts."""
         # Format context
         if story_state.dialogue_history:
             recent_dialogue = "\n".join(
@@ -49,32 +76,63 @@ class DirectorAgent(BaseAgent):
         else:
             prev_narrations_text = "None yet."
         
-        prompt = DIRECTOR_SELECT_SPEAKER_PROMPT.format(
-            description=story_state.seed_story.get('description', ''),
-            recent_dialogue=recent_dialogue,
-            recent_actions=recent_actions,
-            available_characters=", ".join(available_characters),
-            max_consecutive=self.config.max_consecutive_same_character,
-            character_secrets=character_secrets_text,
-            previous_narrations=prev_narrations_text
+        return {
+            "description": story_state.seed_story.get('description', ''),
+            "recent_dialogue": recent_dialogue,
+            "recent_actions": recent_actions,
+            "available_characters": ", ".join(available_characters),
+            "max_consecutive": self.config.max_consecutive_same_character,
+            "character_secrets": character_secrets_text,
+            "previous_narrations": prev_narrations_text
+        }
+
+    async def direct_turn(self, story_state: StoryState, available_characters: List[str],
+                          previous_narrations: List[str] = None,
+                          on_partial: Optional[Callable[[str], Any]] = None) -> Tuple[bool, Optional[str], str, Optional[str]]:
+        """Check for conclusion and pick the next speaker in a single LLM call.
+        
+        on_partial receives the in-progress narration when streaming.
+        
+        Returns:
+            Tuple of (should_end, conclusion_narration, next_speaker, narration)
+        """
+        action_count = len(story_state.action_history)
+        
+        prompt = DIRECTOR_TURN_PROMPT.format(
+            **self._selection_fields(story_state, available_characters, previous_narrations),
+            action_count=action_count,
+            current_turn=story_state.current_turn,
+            max_turns=self.config.max_turns,
+            min_turns=self.config.min_turns,
+            min_actions=self.config.min_actions
         )
         
-        response = await self.generate_response(prompt)
+        response = await self.generate_response(
+            prompt, self._field_streamer("narration", on_partial), json_reply=True, call_type="director_turn"
+        )
         
         try:
-            cleaned_response = self._clean_json_response(response)
-            data = json.loads(cleaned_response)
-            next_speaker = data.get("next_speaker")
-            narration = data.get("narration")
-            
-            if next_speaker in available_characters:
-                return next_speaker, narration
-            return available_characters[0], narration
-            
+            data = self._parse_json(response)
         except Exception as e:
-            print(f"Error parsing director selection: {e}")
+            print(f"Error parsing director turn: {e}")
             print(f"Raw response: {response}")
-            return available_characters[0], ""
+            return False, None, available_characters[0], ""
+        
+        should_end = data.get("should_end", False)
+        if should_end and action_count < self.config.min_actions and story_state.current_turn < self.config.max_turns:
+            print(f"  [Director wanted to end, but only {action_count}/{self.config.min_actions} actions performed. Continuing...]")
+            should_end = False
+        if should_end and story_state.current_turn < self.config.min_turns:
+            print(f"  [Director wanted to end at turn {story_state.current_turn}, but min_turns is {self.config.min_turns}. Continuing...]")
+            should_end = False
+        
+        next_speaker = data.get("next_speaker")
+        if next_speaker not in available_characters:
+            next_speaker = available_characters[0]
+        
+        if should_end:
+            return True, data.get("conclusion_narration"), next_speaker, data.get("narration")
+        return False, None, next_speaker, data.get("narration")
 
     async def check_conclusion(self, story_state: StoryState) -> Tuple[bool, Optional[str]]:
         """Check if the story should end."""
@@ -89,11 +147,10 @@ class DirectorAgent(BaseAgent):
             min_actions=self.config.min_actions
         )
         
-        response = await self.generate_response(prompt)
+        response = await self.generate_response(prompt, json_reply=True, call_type="conclusion")
         
         try:
-            cleaned_response = self._clean_json_response(response)
-            data = json.loads(cleaned_response)
+            data = self._parse_json(response)
             should_end = data.get("should_end", False)
             
             if should_end and action_count < self.config.min_actions and story_state.current_turn < self.config.max_turns:
@@ -128,11 +185,10 @@ class DirectorAgent(BaseAgent):
             total_turns=story_state.current_turn
         )
         
-        response = await self.generate_response(prompt)
+        response = await self.generate_response(prompt, json_reply=True, call_type="force_conclude")
         
         try:
-            cleaned_response = self._clean_json_response(response)
-            data = json.loads(cleaned_response)
+            data = self._parse_json(response)
             return True, data.get("conclusion_narration", "The scene fades as the dust settles on Shahrah-e-Faisal.")
         except Exception as e:
             print(f"Error parsing forced conclusion: {e}")
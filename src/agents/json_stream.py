@@ -0,0 +1,180 @@
+import json
+import re
+from typing import Dict, List, Optional, Tuple
+
+_ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+_FENCE = re.compile(r"`+[A-Za-z]*")  # Whole or cut-off (early-stopped) code fences
+
+
+def extract_partial_field(buffer: str, field: str) -> Optional[str]:
+    """Return the (possibly unfinished) string value of `field` from in-progress JSON.
+    
+    Works on truncated model output such as '{"reasoning": "...", "response": "Bhai, I was'
+    and returns 'Bhai, I was'. Returns None until the field's opening quote has arrived.
+    """
+    match = re.search(r'"' + re.escape(field) + r'"\s*:\s*"', buffer)
+    if match is None:
+        return None
+    
+    chars = []
+    i = match.end()
+    while i < len(buffer):
+        ch = buffer[i]
+        if ch == '"':
+            break
+        if ch == "\\":
+            if i + 1 >= len(buffer):
+                break  # Escape sequence cut off mid-stream
+            code = buffer[i + 1]
+            if code == "u":
+                if i + 6 > len(buffer):
+                    break
+                try:
+                    chars.append(json.loads(f'"{buffer[i:i + 6]}"'))
+                except ValueError:
+                    chars.append(buffer[i:i + 6])
+                i += 6
+                continue
+            chars.append(_ESCAPES.get(code, code))
+            i += 2
+            continue
+        chars.append(ch)
+        i += 1
+    return "".join(chars)
+
+
+class JsonObjectScanner:
+    """Incrementally track the first top-level JSON object in a growing buffer.
+    
+    feed() only looks at text it has not seen before, so calling it once per
+    streamed chunk stays linear in the output length.
+    """
+
+    def __init__(self):
+        self.start: Optional[int] = None
+        self.end: Optional[int] = None  # Index just past the closing brace
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+
+    @property
+    def complete(self) -> bool:
+        return self.end is not None
+
+    def feed(self, buffer: str) -> bool:
+        """Scan new text in buffer; returns True once the object's closing brace has arrived."""
+        while self.end is None and self._pos < len(buffer):
+            ch = buffer[self._pos]
+            if self.start is None:
+                if ch == "{":
+                    self.start = self._pos
+                    self._depth = 1
+            elif self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif ch == "\\":
+                    self._escaped = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch in "{[":
+                self._depth += 1
+            elif ch in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self.end = self._pos + 1
+            self._pos += 1
+        return self.end is not None
+
+    def unclosed(self) -> str:
+        """Closing characters needed to finish a truncated object ('' if complete)."""
+        if self.start is None or self.end is not None:
+            return ""
+        return ('"' if self._in_string else "") + "}" * self._depth
+
+
+_VALUE_END = set('"}]0123456789el')  # Last character of a string, object, array, number, true/false/null
+_VALUE_START = set('"{[')
+
+
+def _repair_structure(text: str, repairs: List[str]) -> str:
+    """String-aware pass adding missing commas, dropping trailing commas and escaping raw newlines."""
+    out = []
+    in_string = False
+    escaped = False
+    last = ""  # Last significant character outside strings
+    for ch in text:
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+                last = '"'
+            elif ch in "\n\r\t":
+                out.append({"\n": "\\n", "\r": "\\r", "\t": "\\t"}[ch])
+                repairs.append("control_character")
+                continue
+            out.append(ch)
+            continue
+        
+        if ch.isspace():
+            out.append(ch)
+            continue
+        if ch in _VALUE_START and last in _VALUE_END:
+            out.append(",")
+            repairs.append("missing_comma")
+        elif ch in "}]" and last == ",":
+            # Remove the dangling comma (and keep any whitespace after it)
+            for i in range(len(out) - 1, -1, -1):
+                if out[i] == ",":
+                    del out[i]
+                    break
+            repairs.append("trailing_comma")
+        if ch == '"':
+            in_string = True
+        out.append(ch)
+        last = ch
+    return "".join(out)
+
+
+def parse_json_object(text: str) -> Tuple[Dict, List[str]]:
+    """Parse a model's JSON reply, repairing common defects locally instead of re-asking.
+    
+    Handles code fences, prose before or after the object, truncated output,
+    missing or trailing commas and raw newlines inside strings. Returns the
+    parsed object and the list of repairs applied (empty for clean JSON).
+    Raises ValueError if no object can be recovered.
+    """
+    stripped = text.strip()
+    try:
+        data = json.loads(stripped)
+        if isinstance(data, dict):
+            return data, []
+    except ValueError:
+        pass
+    
+    # Code fences wrap most normal replies, so removing them is not counted as a repair
+    repairs: List[str] = []
+    
+    scanner = JsonObjectScanner()
+    scanner.feed(stripped)
+    if scanner.start is None:
+        raise ValueError("No JSON object found in response")
+    candidate = stripped[scanner.start:scanner.end]
+    if not scanner.complete:
+        candidate = candidate.rstrip().rstrip(",") + scanner.unclosed()
+        repairs.append("truncated")
+    elif _FENCE.sub("", stripped[:scanner.start] + stripped[scanner.end:]).strip():
+        repairs.append("surrounding_prose")
+    
+    try:
+        data = json.loads(candidate)
+    except ValueError:
+        data = json.loads(_repair_structure(candidate, repairs))
+    if not isinstance(data, dict):
+        raise ValueError("Response is not a JSON object")
+    return data, repairs
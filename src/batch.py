@@ -0,0 +1,173 @@
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+current_dir = Path(__file__).parent
+project_root = current_dir.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from src.config import StoryConfig
+from src.main import load_scenario, run_story, resume_story
+from src.graph.checkpoints import get_checkpoint_store
+from src.llm.backends import client_pool_stats, prewarm_clients
+
+def collect_jobs(args) -> list:
+    """Expand CLI arguments into (run_id, seed_story, char_configs) jobs."""
+    jobs = []
+    for pair in args.pair or []:
+        seed_path, _, chars_path = pair.partition(":")
+        if not chars_path:
+            raise SystemExit(f"--pair expects SEED_STORY.json:CHARACTER_CONFIGS.json, got '{pair}'")
+        seed_story = json.loads(Path(seed_path).read_text())
+        char_configs = json.loads(Path(chars_path).read_text())
+        jobs.append((f"{Path(seed_path).parent.name}_{len(jobs):04d}", seed_story, char_configs))
+
+    for scenario in args.scenario or []:
+        scenario_dir = Path(scenario)
+        seed_story, char_configs = load_scenario(scenario_dir)
+        for _ in range(args.runs):
+            jobs.append((f"{scenario_dir.name}_{len(jobs):04d}", seed_story, char_configs))
+    return jobs
+
+async def run_batch(jobs: list, config: StoryConfig, output_dir: Path, concurrency: int,
+                    resume: bool = False) -> dict:
+    """Run stories concurrently, at most `concurrency` at a time, each into its own directory.
+    
+    With resume (and config.checkpoint_path), finished runs are skipped and interrupted
+    ones continue from their last checkpoint instead of starting over.
+    """
+    story_slots = asyncio.Semaphore(concurrency)
+    checkpoints = get_checkpoint_store(config.checkpoint_path)
+    results = {}
+    skipped = []
+
+    async def run_one(run_id, seed_story, char_configs):
+        if resume and checkpoints.is_completed(run_id):
+            skipped.append(run_id)
+            return
+        async with story_slots:
+            try:
+                if resume and checkpoints.run_inputs(run_id) is not None:
+                    result = await resume_story(run_id, config, output_dir / run_id)
+                else:
+                    result = await run_story(seed_story, char_configs, config, output_dir / run_id, run_id=run_id)
+                # Keep only the summary fields so memory stays flat across many stories
+                results[run_id] = {
+                    "total_turns": result["final_state"]["current_turn"],
+                    "llm_calls": result["llm_calls"],
+                    "cached_replies": result["cached_replies"],
+                    "elapsed": result["elapsed"]
+                }
+            except Exception as e:
+                print(f"Run {run_id} failed: {e}", file=sys.stderr)
+                results[run_id] = None
+
+    started = time.perf_counter()
+    await asyncio.gather(*(run_one(*job) for job in jobs))
+    elapsed = time.perf_counter() - started
+
+    completed = [r for r in results.values() if r is not None]
+    llm_calls = sum(r["llm_calls"] for r in completed)
+    return {
+        "stories": len(jobs),
+        "completed": len(completed),
+        "skipped": len(skipped),
+        "failed": len(jobs) - len(completed) - len(skipped),
+        "llm_calls": llm_calls,
+        "cached_replies": sum(r["cached_replies"] for r in completed),
+        "elapsed_seconds": round(elapsed, 3),
+        "stories_per_minute": round(len(completed) / elapsed * 60, 2) if elapsed else 0.0,
+        "calls_per_second": round(llm_calls / elapsed, 2) if elapsed else 0.0,
+        "runs": {
+            run_id: {
+                "total_turns": r["total_turns"],
+                "llm_calls": r["llm_calls"],
+                "cached_replies": r["cached_replies"],
+                "elapsed_seconds": round(r["elapsed"], 3)
+            } if r is not None else None
+            for run_id, r in sorted(results.items())
+        }
+    }
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run many stories concurrently.")
+    parser.add_argument("--scenario", action="append",
+                        help="Scenario directory containing seed_story.json and character_configs.json (repeatable)")
+    parser.add_argument("--runs", type=int, default=1,
+                        help="Number of runs per --scenario")
+    parser.add_argument("--pair", action="append",
+                        help="SEED_STORY.json:CHARACTER_CONFIGS.json pair (repeatable)")
+    parser.add_argument("--output-dir", default=str(project_root / "batch_output"))
+    parser.add_argument("--concurrency", type=int, default=8,
+                        help="Maximum stories running at once")
+    parser.add_argument("--max-inflight-calls", type=int, default=16,
+                        help="Maximum LLM calls in flight across all stories")
+    parser.add_argument("--rpm", type=int,
+                        help="Requests-per-minute quota shared by all stories")
+    parser.add_argument("--tpm", type=int,
+                        help="Tokens-per-minute quota shared by all stories")
+    parser.add_argument("--backend", choices=["gemini", "replay", "record"], default="gemini")
+    parser.add_argument("--cassette", default=str(project_root / "prompts_log.json"),
+                        help="Cassette the replay backend answers from")
+    parser.add_argument("--recording", default=str(project_root / "recordings.jsonl"),
+                        help="JSONL file the record backend appends every exchange to")
+    parser.add_argument("--replay-latency",
+                        help='Injected replay latency, e.g. "lognormal:-0.7,0.4"')
+    parser.add_argument("--checkpoint-db",
+                        help="SQLite file for per-node checkpoints of every run")
+    parser.add_argument("--resume", action="store_true",
+                        help="Skip runs already finished in --checkpoint-db and continue interrupted ones")
+    parser.add_argument("--prewarm", action="store_true",
+                        help="Create the shared LLM clients before the first story starts")
+    parser.add_argument("--no-legacy-output", action="store_true",
+                        help="Only write story_events.jsonl per run, not story_output.json")
+    parser.add_argument("--verbose", action="store_true",
+                        help="Show per-turn output (interleaved across stories)")
+    return parser.parse_args(argv)
+
+async def main(argv=None):
+    args = parse_args(argv)
+    jobs = collect_jobs(args)
+    if not jobs:
+        raise SystemExit("Nothing to run: pass --scenario and/or --pair")
+    if args.resume and not args.checkpoint_db:
+        raise SystemExit("--resume needs --checkpoint-db")
+
+    config = StoryConfig(
+        llm_backend=args.backend,
+        cassette_path=args.cassette,
+        recording_path=args.recording,
+        replay_latency=args.replay_latency,
+        max_inflight_calls=args.max_inflight_calls,
+        requests_per_minute=args.rpm,
+        tokens_per_minute=args.tpm,
+        write_legacy_output=not args.no_legacy_output,
+        checkpoint_path=args.checkpoint_db
+    )
+    output_dir = Path(args.output_dir)
+    prewarm_seconds = prewarm_clients(config) if args.prewarm else 0.0
+
+    print(f"Running {len(jobs)} stories (concurrency={args.concurrency}, "
+          f"max in-flight LLM calls={args.max_inflight_calls})", file=sys.stderr)
+    
+    # Per-turn prints from concurrent stories interleave, so they are off unless asked for
+    with contextlib.ExitStack() as quiet:
+        if not args.verbose:
+            quiet.enter_context(contextlib.redirect_stdout(quiet.enter_context(open(os.devnull, "w"))))
+        summary = await run_batch(jobs, config, output_dir, args.concurrency, resume=args.resume)
+    summary["client_pool"] = {**client_pool_stats(), "prewarm_seconds": round(prewarm_seconds, 4)}
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    (output_dir / "batch_summary.json").write_text(json.dumps(summary, indent=2))
+    print(f"Completed {summary['completed']}/{summary['stories']} stories in {summary['elapsed_seconds']}s "
+          f"({summary['stories_per_minute']} stories/min, {summary['calls_per_second']} calls/sec)", file=sys.stderr)
+    print(f"Summary saved to {output_dir / 'batch_summary.json'}", file=sys.stderr)
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,4 +1,5 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
 import os
 from dotenv import load_dotenv
 
@@ -21,4 +22,91 @@ class StoryConfig:
     
     num_characters: int = 4
     max_dialogue_length: int = 200
-    
+
+    # Conclusion check cadence once the story is allowed to end
+    conclusion_check_every: int = 1  # Ask the director every k turns
+    conclusion_check_after_action_only: bool = False  # Only ask right after an action turn
+
+    # Ask the director for the conclusion check and next speaker in one call
+    fused_director: bool = False
+    # Run next-turn speaker selection concurrently with the conclusion check (ignored when fused)
+    speculative_director: bool = False
+    # Draft replies for the k most likely next speakers while the director decides (0 = off)
+    speculative_characters: int = 0
+    speculative_token_budget: int = 0  # Estimated prompt+output tokens per turn for drafts (0 = unlimited)
+    # Offer the director only the k likeliest next speakers (and their secrets) by local scoring,
+    # so its prompt stops growing with the cast (0 = offer everyone)
+    director_candidates: int = 0
+    # Local next-speaker model trained from logged director picks (python -m src.graph.speaker_model train).
+    # The director is only asked when the model is less than speaker_model_threshold sure, or has not
+    # narrated for speaker_model_narration_every turns (None = the director picks every speaker)
+    # Bypassed on turns whose speaker a fused_director/speculative_director call already picked
+    speaker_model_path: Optional[str] = None
+    speaker_model_threshold: float = 0.8
+    speaker_model_narration_every: int = 3
+
+    # LLM backend: "gemini" (live), "replay" (answer from cassette_path offline)
+    # or "record" (live, appending every exchange to recording_path as JSONL)
+    llm_backend: str = "gemini"
+    cassette_path: str = "prompts_log.json"
+    recording_path: str = "recordings.jsonl"  # Must be .jsonl; replay it by passing it as cassette_path
+    replay_latency: Optional[str] = None  # e.g. "fixed:0.2", "uniform:0.1,0.6", "lognormal:-0.7,0.4"
+
+    # Stream tokens from the backend so partial narration/dialogue can be shown live
+    stream_responses: bool = False
+    # Stop generating once an agent's JSON reply object is closed (uses the streaming API)
+    stop_at_json_end: bool = True
+
+    # story_events.jsonl is written as the story runs; fsync every N events or T seconds
+    event_sink_batch_size: int = 16
+    event_sink_fsync_seconds: float = 1.0
+    write_legacy_output: bool = True  # Also write story_output.json when the run finishes
+
+    # SQLite file for per-node checkpoints; runs started with a run_id can then be resumed
+    checkpoint_path: Optional[str] = None
+
+    # Maximum LLM calls in flight at once across all agents and stories (None = unlimited)
+    max_inflight_calls: Optional[int] = None
+    # API quota shared by all agents and stories (None = unlimited)
+    requests_per_minute: Optional[int] = None
+    tokens_per_minute: Optional[int] = None
+    # Retries for rate-limited and transient failures (exponential backoff with full jitter)
+    llm_max_retries: int = 4
+    retry_base_delay: float = 1.0
+    retry_max_delay: float = 30.0
+    # Deadline in seconds by call type: director_select, director_turn, conclusion, force_conclude,
+    # character_respond (missing = no deadline). It covers every attempt and backoff of a call
+    call_deadlines: Dict[str, float] = field(default_factory=dict)
+    # Hedging: when a call outlives the recent hedge_percentile latency of its type, send a
+    # duplicate and keep whichever answers first
+    hedge_requests: bool = False
+    hedge_percentile: float = 0.95
+    hedge_min_samples: int = 20
+    # Models to fall back to, in order, when model_name's circuit breaker is open (empty = no breakers)
+    fallback_models: List[str] = field(default_factory=list)
+    # A model's breaker opens when, over its last breaker_window calls (at least breaker_min_calls),
+    # the share of failed calls (errors, or slower than breaker_latency_threshold seconds) reaches
+    # breaker_error_threshold; after breaker_cooldown seconds one probe call decides whether it closes
+    breaker_error_threshold: float = 0.5
+    breaker_latency_threshold: Optional[float] = None
+    breaker_window: int = 20
+    breaker_min_calls: int = 5
+    breaker_cooldown: float = 30.0
+
+    # Wall-clock budget in seconds for a turn (speaker selection + character reply; None = off).
+    # A director call running past turn_slo_director_share of it is replaced by a round-robin
+    # speaker, and a character reply running past the rest by a local GESTURE
+    turn_slo_seconds: Optional[float] = None
+    turn_slo_director_share: float = 0.5
+    # Let late character replies finish in the background and add them to the speaker's memory
+    fold_late_responses: bool = False
+
+    # Show each character the k older observations most relevant to the current scene
+    # (offline BM25 over their memory, within the token budget; 0 = off)
+    memory_retrieval_k: int = 0
+    memory_retrieval_budget_tokens: int = 200
+
+    # Response cache (disabled when cache_dir is None)
+    cache_dir: Optional[str] = None
+    cache_max_bytes: int = 64 * 1024 * 1024
+    cache_deterministic_only: bool = False  # Only cache temperature-0 calls
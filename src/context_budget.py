@@ -0,0 +1,95 @@
+import math
+import re
+from collections import deque
+from typing import Deque, List, Optional, Tuple
+
+# Gemma/Gemini SentencePiece vocabularies average about 4 bytes of UTF-8 per token
+# on English prose; Urdu/Roman-Urdu mixes come out slightly denser, which errs on
+# the side of over-counting.
+BYTES_PER_TOKEN = 4.0
+
+
+def estimate_tokens(text: str) -> int:
+    """Offline token count estimate, calibrated for the Gemma/Gemini tokenizer."""
+    if not text:
+        return 0
+    return math.ceil(len(text.encode("utf-8")) / BYTES_PER_TOKEN)
+
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s")
+
+
+def digest(line: str, max_words: int = 16) -> str:
+    """Compress a transcript line to its first sentence, capped at `max_words` words."""
+    first_sentence = _SENTENCE_END.split(line.strip(), maxsplit=1)[0]
+    words = first_sentence.split()
+    if len(words) > max_words:
+        return " ".join(words[:max_words]) + "…"
+    return first_sentence
+
+
+class RollingSummary:
+    """Incrementally maintained digest of lines that scrolled out of a verbatim window.
+    
+    Each folded line is compressed once; when the digest outgrows its token
+    budget the oldest entries are dropped and only counted.
+    """
+    
+    def __init__(self, budget_tokens: int):
+        self.budget_tokens = budget_tokens
+        self.entries: Deque[Tuple[str, int]] = deque()
+        self.tokens = 0
+        self.dropped = 0
+    
+    def fold(self, line: str) -> None:
+        entry = digest(line)
+        entry_tokens = estimate_tokens(entry) + 1
+        self.entries.append((entry, entry_tokens))
+        self.tokens += entry_tokens
+        while self.tokens > self.budget_tokens and self.entries:
+            _, old_tokens = self.entries.popleft()
+            self.tokens -= old_tokens
+            self.dropped += 1
+    
+    def render(self) -> str:
+        if not self.entries:
+            return ""
+        prefix = f"({self.dropped} earlier lines not shown) " if self.dropped else ""
+        return prefix + " / ".join(entry for entry, _ in self.entries)
+
+
+class BudgetedTranscript:
+    """The most recent lines verbatim, with older lines folded into a RollingSummary.
+    
+    The summary only changes when the window slides, so its cost is paid once
+    per evicted line rather than on every render.
+    """
+    
+    def __init__(self, window: int, summary_budget_tokens: int):
+        self.window = window
+        self.recent: Deque[Tuple[str, int]] = deque()
+        self.summary = RollingSummary(summary_budget_tokens)
+        self.version = 0
+    
+    def append(self, line: str) -> None:
+        if len(self.recent) == self.window:
+            self.summary.fold(self.recent.popleft()[0])
+        self.recent.append((line, estimate_tokens(line) + 1))
+        self.version += 1
+    
+    def recent_lines(self, max_tokens: Optional[int] = None) -> List[str]:
+        """Newest lines that fit in `max_tokens`, oldest first (all lines when unbounded)."""
+        if max_tokens is None:
+            return [line for line, _ in self.recent]
+        kept: List[str] = []
+        used = 0
+        for line, line_tokens in reversed(self.recent):
+            if used + line_tokens > max_tokens and kept:
+                break
+            kept.append(line)
+            used += line_tokens
+        kept.reverse()
+        return kept
+    
+    def summary_text(self) -> str:
+        return self.summary.render()
@@ -0,0 +1,255 @@
+from collections import defaultdict, deque
+from typing import Deque, Dict, Hashable, Tuple
+from .config import StoryConfig
+from .context_budget import BudgetedTranscript, estimate_tokens
+from .memory_index import MemoryIndex
+from .schemas import StoryState
+
+
+class ContextEngine:
+    """Incrementally maintained character contexts.
+    
+    Instead of re-walking the dialogue and action histories every turn, the
+    engine consumes only the entries added since its last sync and keeps
+    bounded ring buffers of recent dialogue, recent actions and each
+    character's own lines. Rendered fragments are memoized and rebuilt only
+    when their inputs change, so building a context costs the same at turn
+    1,000 as at turn 10.
+    
+    Dialogue that scrolls out of the verbatim window is folded into a rolling
+    summary, and contexts are trimmed to a token budget (by default
+    StoryConfig.max_context_length).
+    
+    With StoryConfig.memory_retrieval_k set, each character's memory also shows
+    the older observations most relevant to the current scene, retrieved from a
+    per-character BM25 index (see src/memory_index.py).
+    """
+    
+    DIALOGUE_WINDOW = 10
+    ACTION_WINDOW = 5
+    OWN_LINES_WINDOW = 5
+    OBSERVATIONS_WINDOW = 5
+    RETRIEVAL_QUERY_LINES = 4
+    DIRECTOR_DIALOGUE_WINDOW = 20
+    DIRECTOR_ACTION_WINDOW = 10
+    DIRECTOR_NOTES_WINDOW = 10
+    
+    def __init__(self, config: StoryConfig):
+        self.config = config
+        self._reset()
+    
+    def _reset(self) -> None:
+        self._dialogue_seen = 0
+        self._actions_seen = 0
+        summary_budget = self.config.max_context_length // 10
+        self._dialogue = BudgetedTranscript(self.DIALOGUE_WINDOW, summary_budget)
+        self._director_dialogue = BudgetedTranscript(self.DIRECTOR_DIALOGUE_WINDOW, summary_budget)
+        self._director_actions = BudgetedTranscript(self.DIRECTOR_ACTION_WINDOW, summary_budget)
+        self._actions: Deque[str] = deque(maxlen=self.ACTION_WINDOW)
+        self._own_dialogue: Dict[str, Deque[str]] = defaultdict(lambda: deque(maxlen=self.OWN_LINES_WINDOW))
+        self._own_actions: Dict[str, Deque[str]] = defaultdict(lambda: deque(maxlen=self.OWN_LINES_WINDOW))
+        self._own_versions: Dict[str, int] = defaultdict(int)
+        self._fragments: Dict[Hashable, Tuple[Hashable, str]] = {}
+        self._memory_indexes: Dict[str, MemoryIndex] = defaultdict(MemoryIndex)
+        self._memory_cursors: Dict[str, int] = defaultdict(int)  # ObservationLog position indexed up to
+    
+    def sync(self, state: StoryState) -> None:
+        """Consume dialogue and actions appended to `state` since the last sync."""
+        if len(state.dialogue_history) < self._dialogue_seen or len(state.action_history) < self._actions_seen:
+            # Histories shrank, so this is a different story: start over
+            self._reset()
+        
+        for turn in state.dialogue_history[self._dialogue_seen:]:
+            self._dialogue.append(f"{turn.speaker}: {turn.dialogue}")
+            self._director_dialogue.append(f"[{turn.turn_number}] {turn.speaker}: {turn.dialogue}")
+            self._own_dialogue[turn.speaker].append(f"[DIALOGUE] {turn.dialogue}")
+            self._own_versions[turn.speaker] += 1
+        self._dialogue_seen = len(state.dialogue_history)
+        
+        for action in state.action_history[self._actions_seen:]:
+            self._actions.append(f"[ACTION] {action.actor}: {action.description}")
+            self._director_actions.append(f"[{action.turn_number}] ACTION by {action.actor}: {action.description}")
+            self._own_actions[action.actor].append(f"[ACTION: {action.action_type.upper()}] {action.description}")
+            self._own_versions[action.actor] += 1
+        self._actions_seen = len(state.action_history)
+    
+    def _memoized(self, name: Hashable, inputs: Hashable, render) -> str:
+        """Return the cached fragment `name` unless its inputs changed since it was rendered."""
+        cached = self._fragments.get(name)
+        if cached is not None and cached[0] == inputs:
+            return cached[1]
+        text = render()
+        self._fragments[name] = (inputs, text)
+        return text
+    
+    def _own_lines_text(self, name: str) -> str:
+        def render():
+            # Own dialogue first, then own actions, keeping the last few overall
+            own_previous_lines = (list(self._own_dialogue[name]) + list(self._own_actions[name]))[-self.OWN_LINES_WINDOW:]
+            return "\n".join(own_previous_lines) if own_previous_lines else "None (this is your first turn)"
+        return self._memoized(("own_lines", name), self._own_versions[name], render)
+    
+    def _memory_text(self, state: StoryState, name: str) -> str:
+        char_memory = state.character_profiles[name].memory
+        inventory = state.world.items_of(name)
+        observation_count = state.observation_log.count(name)
+        inputs = (
+            tuple(inventory),
+            tuple(char_memory.goals),
+            len(char_memory.important_facts), observation_count,
+            tuple(char_memory.perceptions.items())
+        )
+        retrieving = self.config.memory_retrieval_k > 0
+        if retrieving:
+            # Retrieved observations follow the scene, not just the memory
+            inputs += (self._dialogue.version, self._actions_seen, len(state.story_narration))
+        
+        def render():
+            # Build detailed inventory list
+            inventory_text = "None"
+            if inventory:
+                inventory_items = "\n".join([f"  - {item}" for item in inventory])
+                inventory_text = f"\n{inventory_items}"
+            
+            # Build important facts (includes seeded secret)
+            facts_text = "None"
+            if char_memory.important_facts:
+                facts_text = "; ".join(char_memory.important_facts[-5:])
+            
+            recent_observations = state.observation_log.tail(name, self.OBSERVATIONS_WINDOW)
+            relevant_text = self._relevant_observations_text(state, name, observation_count) if retrieving else ""
+            
+            return f"""Inventory (items you physically have on you right now): {inventory_text}
+Goals: {', '.join(char_memory.goals) if char_memory.goals else 'None'}
+Important Facts You Know: {facts_text}
+Recent Observations: {'; '.join(recent_observations) if recent_observations else 'None'}{relevant_text}
+Perceptions of Others: {'; '.join([f'{k}: {v}' for k, v in char_memory.perceptions.items()]) if char_memory.perceptions else 'None yet'}"""
+        return self._memoized(("memory", name), inputs, render)
+    
+    def _relevant_observations_text(self, state: StoryState, name: str, observation_count: int) -> str:
+        """Older observations (beyond the recent window) most relevant to the latest lines."""
+        older = observation_count - self.OBSERVATIONS_WINDOW
+        if older <= 0:
+            return ""
+        log = state.observation_log
+        if self._memory_cursors[name] > len(log.entries):
+            # The log shrank, so this is a different story: index from scratch
+            self._memory_indexes[name] = MemoryIndex()
+            self._memory_cursors[name] = 0
+        index = self._memory_indexes[name]
+        new_observations, self._memory_cursors[name] = log.since(name, self._memory_cursors[name])
+        for text in new_observations:
+            index.add(text)
+        query_lines = self._dialogue.recent_lines()[-self.RETRIEVAL_QUERY_LINES:] + list(self._actions)[-2:]
+        if state.story_narration:
+            query_lines.append(state.story_narration[-1])
+        relevant = index.top(
+            "\n".join(query_lines),
+            self.config.memory_retrieval_k,
+            self.config.memory_retrieval_budget_tokens,
+            limit=older
+        )
+        return f"\nRelevant Earlier Observations: {'; '.join(relevant)}" if relevant else ""
+    
+    def _action_nudge(self, state: StoryState, name: str) -> str:
+        # Calculate if we need to nudge the character to perform actions
+        action_count = len(state.action_history)
+        remaining_turns = self.config.max_turns - state.current_turn
+        actions_needed = self.config.min_actions - action_count
+        
+        if actions_needed > 0 and remaining_turns <= actions_needed + 3:
+            inventory = state.world.items_of(name)
+            return f"""
+URGENT REQUIREMENT: At least {actions_needed} more non-verbal actions are needed
+(such as GIVE, LEAVE, CALL, THREATEN, SEARCH, TAKE, SHOW, GESTURE, MOVE).
+Only {remaining_turns} turns remain. You MUST perform a non-verbal action this turn instead of just talking.
+Pick an action that makes sense for you and the current situation.
+You have these items you could use: {', '.join(inventory) if inventory else 'nothing notable'}
+"""
+        return ""
+    
+    def character_context(self, state: StoryState, name: str, budget_tokens: int = None) -> str:
+        """Assemble the situation context shown to a character before they respond.
+        
+        When the context would exceed `budget_tokens` (default: max_context_length),
+        the oldest lines of the verbatim dialogue window are left out.
+        """
+        self.sync(state)
+        if budget_tokens is None:
+            budget_tokens = self.config.max_context_length
+        
+        summary_text = self._dialogue.summary_text()
+        remaining = budget_tokens - estimate_tokens(self._assemble_character_context(state, name, "", summary_text))
+        history_text = self._memoized(
+            "dialogue", (self._dialogue.version, remaining),
+            lambda: "\n".join(self._dialogue.recent_lines(max(remaining, 0)))
+        )
+        return self._assemble_character_context(
+            state, name, history_text if history_text else 'No dialogue yet', summary_text
+        )
+    
+    def _assemble_character_context(self, state: StoryState, name: str, history_text: str,
+                                    summary_text: str) -> str:
+        actions_text = self._memoized("actions", self._actions_seen, lambda: "\n".join(self._actions))
+        present = state.world.present_names()
+        earlier_dialogue = f"Earlier Dialogue (summarized):\n{summary_text}\n\n" if summary_text else ""
+        
+        return f"""
+Initial Event: {state.seed_story.get('description', 'Unknown event')}
+{self._action_nudge(state, name)}
+World State:
+Location: {state.world.location}
+Characters Present: {', '.join(present)}
+
+Your Memory:
+{self._memory_text(state, name)}
+
+Director Narration: {state.story_narration[-1] if state.story_narration else 'None'}
+
+Recent Actions:
+{actions_text if actions_text else 'No actions yet'}
+
+{earlier_dialogue}Recent Dialogue:
+{history_text}
+
+Your Previous Lines (DO NOT repeat any gestures, phrases, or mannerisms from these):
+{self._own_lines_text(name)}
+"""
+    
+    def director_context(self, state: StoryState, budget_tokens: int = None) -> str:
+        """Story-so-far context for the director, bounded by `budget_tokens`.
+        
+        Recent dialogue and actions are verbatim; older ones are summarized.
+        """
+        self.sync(state)
+        if budget_tokens is None:
+            budget_tokens = self.config.max_context_length
+        
+        action_summary = self._director_actions.summary_text()
+        dialogue_summary = self._director_dialogue.summary_text()
+        notes = state.director_notes[-self.DIRECTOR_NOTES_WINDOW:]
+        
+        def assemble(actions_text: str, history_text: str) -> str:
+            return f"""
+Story Title: {state.seed_story.get('title', 'Untitled')}
+Description: {state.seed_story.get('description', '')}
+
+World State: {state.world.describe()}
+
+Actions Performed ({len(state.action_history)} total):
+{f"Earlier (summarized): {action_summary}" + chr(10) if action_summary else ""}{actions_text if actions_text else 'No actions yet'}
+
+Dialogue History:
+{f"Earlier (summarized): {dialogue_summary}" + chr(10) if dialogue_summary else ""}{history_text}
+
+Director Notes:
+{chr(10).join(notes)}
+"""
+        
+        # Actions are scarcer and more important to the director, so they get their window first
+        remaining = budget_tokens - estimate_tokens(assemble("", ""))
+        action_lines = self._director_actions.recent_lines(max(remaining, 0))
+        actions_text = "\n".join(action_lines)
+        remaining -= estimate_tokens(actions_text)
+        history_text = "\n".join(self._director_dialogue.recent_lines(max(remaining, 0)))
+        return assemble(actions_text, history_text)
@@ -0,0 +1,119 @@
+import json
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+
+class EventSink:
+    """Append-only JSONL log of a story's events, written as nodes produce them.
+
+    The first line is a header record, each event is one line, and finalize()
+    appends a footer with the run metadata. Lines are buffered and fsynced in
+    batches, so a crash loses at most one batch and memory does not grow with
+    the length of the story.
+    """
+
+    def __init__(self, path: Path, batch_size: int = 16, fsync_seconds: float = 1.0):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.batch_size = batch_size
+        self.fsync_seconds = fsync_seconds
+        self.events_written = 0
+        self.syncs = 0
+        self._file = self.path.open("w", encoding="utf-8")
+        self._pending = []
+        self._last_sync = time.monotonic()
+
+    def write_header(self, title: Optional[str], seed_story: Dict) -> None:
+        self._append({
+            "type": "header",
+            "title": title,
+            "seed_story": seed_story,
+            "started_at": datetime.now().isoformat()
+        })
+        self.flush()
+
+    def write_event(self, event: Dict) -> None:
+        self._append(event)
+        self.events_written += 1
+        if len(self._pending) >= self.batch_size or time.monotonic() - self._last_sync >= self.fsync_seconds:
+            self.flush()
+
+    def _append(self, record: Dict) -> None:
+        self._pending.append(json.dumps(record, ensure_ascii=False, default=str))
+
+    def flush(self) -> None:
+        """Write buffered lines and fsync them to disk."""
+        if self._file.closed:
+            return
+        if self._pending:
+            self._file.write("\n".join(self._pending) + "\n")
+            self._pending = []
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.syncs += 1
+        self._last_sync = time.monotonic()
+
+    def close(self) -> None:
+        """Flush and close without a footer (e.g. after a failed run); the log stays readable."""
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def finalize(self, metadata: Dict, legacy_path: Optional[Path] = None) -> None:
+        """Append the metadata footer, close the log and optionally write story_output.json."""
+        self._append({"type": "footer", "metadata": metadata, "finished_at": datetime.now().isoformat()})
+        self.close()
+        if legacy_path is not None:
+            write_legacy_output(self.path, Path(legacy_path))
+
+
+def read_records(path: Path) -> Iterator[Dict]:
+    """Yield every record in an event log, skipping a torn final line left by a crash."""
+    with Path(path).open(encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+
+def indented_json(value, level: int) -> str:
+    """json.dumps(indent=2) output for a value sitting `level` levels deep."""
+    return json.dumps(value, indent=2, default=str).replace("\n", "\n" + "  " * level)
+
+
+def write_legacy_output(log_path: Path, output_path: Path) -> None:
+    """Convert an event log to the story_output.json shape, one event at a time.
+
+    The result matches json.dumps(output, indent=2) of the in-memory document
+    without ever holding all events in memory.
+    """
+    header, footer = {}, {}
+    # First pass picks up the header and footer; events are streamed in the second
+    for record in read_records(log_path):
+        if record.get("type") == "header":
+            header = record
+        elif record.get("type") == "footer":
+            footer = record
+
+    tmp_path = output_path.with_suffix(output_path.suffix + ".tmp")
+    with tmp_path.open("w", encoding="utf-8") as out:
+        out.write("{\n")
+        out.write(f'  "title": {indented_json(header.get("title"), 1)},\n')
+        out.write(f'  "seed_story": {indented_json(header.get("seed_story", {}), 1)},\n')
+        out.write('  "events": [')
+        first = True
+        for record in read_records(log_path):
+            if record.get("type") in ("header", "footer"):
+                continue
+            out.write("\n    " if first else ",\n    ")
+            out.write(indented_json(record, 2))
+            first = False
+        out.write("]" if first else "\n  ]")
+        out.write(f',\n  "metadata": {indented_json(footer.get("metadata", {}), 1)}\n}}')
+    os.replace(tmp_path, output_path)
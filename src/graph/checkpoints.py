@@ -0,0 +1,127 @@
+import json
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+class CheckpointStore:
+    """Durable per-node snapshots of story runs in a local SQLite database.
+
+    Each run records its inputs once (runs table) and a snapshot of the story
+    state plus agent/runtime counters after every completed graph node
+    (checkpoints table). Only the latest snapshot is needed to resume; older
+    ones are pruned as new ones are written. Append-only lists (the story's
+    histories and logs) are left out of the snapshots: each checkpoint stores
+    just the items added since the previous one (appended table), so the cost
+    of a checkpoint does not grow with the story.
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path))
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # Commits survive a process crash; only an OS crash can lose the last few
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS runs ("
+            " run_id TEXT PRIMARY KEY, inputs TEXT NOT NULL, created_at TEXT NOT NULL,"
+            " completed INTEGER NOT NULL DEFAULT 0)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS checkpoints ("
+            " run_id TEXT NOT NULL, seq INTEGER NOT NULL, node TEXT NOT NULL,"
+            " state TEXT NOT NULL, runtime TEXT NOT NULL, created_at TEXT NOT NULL,"
+            " PRIMARY KEY (run_id, seq))"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS appended ("
+            " run_id TEXT NOT NULL, seq INTEGER NOT NULL, items TEXT NOT NULL,"
+            " PRIMARY KEY (run_id, seq))"
+        )
+        self._conn.commit()
+
+    def start_run(self, run_id: str, inputs: Dict) -> None:
+        """Record a run's inputs, discarding any earlier run with the same id."""
+        with self._conn:
+            self._conn.execute("DELETE FROM checkpoints WHERE run_id = ?", (run_id,))
+            self._conn.execute("DELETE FROM appended WHERE run_id = ?", (run_id,))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO runs (run_id, inputs, created_at, completed) VALUES (?, ?, ?, 0)",
+                (run_id, json.dumps(inputs, default=str), datetime.now().isoformat())
+            )
+
+    def run_inputs(self, run_id: str) -> Optional[Dict]:
+        row = self._conn.execute("SELECT inputs FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def save(self, run_id: str, seq: int, node: str, state: Dict, runtime: Dict, completed: bool = False,
+             appended: Optional[Dict[str, List]] = None) -> None:
+        """Commit the snapshot taken after `node` finished (step `seq` of the run).
+
+        `appended` maps each append-only list left out of `state` to the items added since the last save.
+        """
+        with self._conn:
+            if appended:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO appended (run_id, seq, items) VALUES (?, ?, ?)",
+                    (run_id, seq, json.dumps(appended, default=str))
+                )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO checkpoints (run_id, seq, node, state, runtime, created_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (run_id, seq, node, json.dumps(state, default=str), json.dumps(runtime, default=str),
+                 datetime.now().isoformat())
+            )
+            self._conn.execute("DELETE FROM checkpoints WHERE run_id = ? AND seq < ?", (run_id, seq))
+            if completed:
+                self._conn.execute("UPDATE runs SET completed = 1 WHERE run_id = ?", (run_id,))
+
+    def latest(self, run_id: str) -> Optional[Dict]:
+        """The most recent snapshot for a run, or None if it never completed a node.
+
+        "appended" holds each append-only list in full, as saved up to that snapshot.
+        """
+        row = self._conn.execute(
+            "SELECT seq, node, state, runtime FROM checkpoints WHERE run_id = ? ORDER BY seq DESC LIMIT 1",
+            (run_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        appended = {}
+        for (chunk,) in self._conn.execute(
+            "SELECT items FROM appended WHERE run_id = ? AND seq <= ? ORDER BY seq", (run_id, row[0])
+        ):
+            for name, items in json.loads(chunk).items():
+                appended.setdefault(name, []).extend(items)
+        return {"seq": row[0], "node": row[1], "state": json.loads(row[2]), "runtime": json.loads(row[3]),
+                "appended": appended}
+
+    def is_completed(self, run_id: str) -> bool:
+        row = self._conn.execute("SELECT completed FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+        return bool(row and row[0])
+
+    def runs(self) -> List[Dict]:
+        return [
+            {"run_id": run_id, "created_at": created_at, "completed": bool(completed)}
+            for run_id, created_at, completed in self._conn.execute(
+                "SELECT run_id, created_at, completed FROM runs ORDER BY created_at"
+            )
+        ]
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+_stores: Dict[str, CheckpointStore] = {}
+
+
+def get_checkpoint_store(path: Optional[str]) -> Optional[CheckpointStore]:
+    """One connection per database file per process; None when checkpointing is off."""
+    if path is None:
+        return None
+    key = str(Path(path).resolve())
+    if key not in _stores:
+        _stores[key] = CheckpointStore(path)
+    return _stores[key]
@@ -0,0 +1,42 @@
+from typing import Tuple
+from ..config import StoryConfig
+from ..schemas import StoryState
+
+
+class ConclusionGate:
+    """Rule engine in front of the director's conclusion check.
+
+    Evaluates the StoryConfig constraints locally and only lets the LLM call
+    through when its answer could actually change control flow.
+    """
+
+    ASK = "ask"        # The director's answer matters: issue the LLM call
+    SKIP = "skip"      # The story cannot end this turn: continue without asking
+    FORCE = "force"    # Max turns reached: the story ends regardless
+
+    def __init__(self, config: StoryConfig):
+        self.config = config
+
+    def evaluate(self, state: StoryState) -> Tuple[str, str]:
+        """Return (decision, reason) for the state after the latest turn."""
+        turn = state.current_turn
+        if turn >= self.config.max_turns:
+            return self.FORCE, "max turns reached"
+        if turn < self.config.min_turns:
+            return self.SKIP, f"turn {turn} is before min_turns ({self.config.min_turns})"
+
+        # Ending is blocked until enough actions happen, so whatever the director says is discarded
+        actions_needed = self.config.min_actions - len(state.action_history)
+        if actions_needed > 0:
+            return self.SKIP, f"{actions_needed} more actions needed before the story can end"
+
+        every = max(1, self.config.conclusion_check_every)
+        if (turn - self.config.min_turns) % every != 0:
+            return self.SKIP, f"checking every {every} turns"
+
+        if self.config.conclusion_check_after_action_only:
+            last_action = state.action_history[-1] if state.action_history else None
+            if last_action is None or last_action.turn_number != turn:
+                return self.SKIP, "checking only after action turns"
+
+        return self.ASK, "director decides"
@@ -0,0 +1,52 @@
+from typing import Dict, List
+from ..config import StoryConfig
+from ..observation_log import ObservationLog
+from ..schemas import StoryState
+from .speaker_ranking import is_blocked_by_consecutive_rule, recent_turns
+
+# Profiles carry no mannerisms of their own, so degraded turns draw on these
+# and on the character's inventory.
+MANNERISMS = [
+    "glances at the others, weighing what to say",
+    "shifts on their feet and folds their arms",
+    "looks down the road at the stalled traffic",
+    "wipes the sweat from their brow",
+    "lets out a long breath and says nothing",
+]
+# Recent observations checked so a degraded turn does not repeat a gesture
+GESTURE_MEMORY = 20
+
+
+def round_robin_speaker(state: StoryState, available: List[str], config: StoryConfig) -> str:
+    """The character after the last speaker in cast order, skipping anyone the consecutive rule blocks."""
+    last = recent_turns(state, 1)
+    start = available.index(last[0][0]) + 1 if last and last[0][0] in available else 0
+    for offset in range(len(available)):
+        name = available[(start + offset) % len(available)]
+        if not is_blocked_by_consecutive_rule(state, name, config):
+            return name
+    return available[start % len(available)]
+
+
+def degraded_gesture(name: str, items: List[str], observations: ObservationLog) -> Dict:
+    """A draft (as from CharacterAgent.draft_response) for a locally generated GESTURE.
+
+    Handles an item from the character's inventory, or falls back to a generic
+    mannerism, preferring ones the character has not performed recently.
+    Only the last GESTURE_MEMORY observations are read, so the fallback costs
+    the same however long the story has run.
+    """
+    candidates = [f"{name} fidgets with the {item[0].lower() + item[1:]}." for item in items if item]
+    candidates += [f"{name} {mannerism}." for mannerism in MANNERISMS]
+    performed = set(observations.tail(name, GESTURE_MEMORY))
+    response = next(
+        (text for text in candidates if f"I performed action: {text}" not in performed),
+        candidates[observations.count(name) % len(candidates)]
+    )
+    return {
+        "reasoning": "",
+        "action_type": "GESTURE",
+        "action_target": None,
+        "response": response,
+        "degraded": True
+    }
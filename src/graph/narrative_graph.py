@@ -1,30 +1,96 @@
-from typing import Dict, List, Any
+import asyncio
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
 from langgraph.graph import StateGraph, END
 from ..config import StoryConfig
-from ..schemas import StoryState, DialogueTurn, Action
+from ..schemas import RECENT_EVENTS, StoryState, TrustedStoryState, DialogueTurn, Action, CharacterProfile
 from ..agents.character_agent import CharacterAgent
 from ..agents.director_agent import DirectorAgent
-from ..story_state import StoryStateManager
+from ..story_state import StoryStateManager, apply_world_event, start_scene
+from ..metrics import RunMetrics
+from ..observation_log import ObservationLog
+from ..world_model import WorldModel
+from ..context_engine import ContextEngine
+from ..context_budget import estimate_tokens
+from ..event_sink import EventSink
+from .checkpoints import get_checkpoint_store
+from .conclusion_gate import ConclusionGate
+from .degraded import degraded_gesture, round_robin_speaker
+from .speaker_model import LOCAL_PICK_AGENT, context_from_state, load_speaker_model
+from .speaker_ranking import director_candidates, is_blocked_by_consecutive_rule, rank_likely_speakers
+
+# Append-only lists in the state (dotted paths) that checkpoints store incrementally, not in every snapshot.
+# StoryState.events only keeps the latest events, so its full list is taken from the node updates instead.
+CHECKPOINT_LOGS = ("story_narration", "dialogue_history", "action_history", "director_notes",
+                   "world.events", "observation_log.entries", "observation_log.public")
+CHECKPOINT_EXCLUDE = {
+    "story_narration": True, "dialogue_history": True, "action_history": True, "director_notes": True,
+    "events": True, "world": {"events": True}, "observation_log": {"entries": True, "public": True}
+}
+
+
+def _log_at(state: StoryState, path: str) -> List:
+    value = state
+    for name in path.split("."):
+        value = getattr(value, name)
+    return value
+
+
+def _to_json(item: Any) -> Any:
+    return item.model_dump(mode="json") if hasattr(item, "model_dump") else item
+
 
 class NarrativeGraph:
     def __init__(self, config: StoryConfig, characters: List[CharacterAgent], 
-                 director: DirectorAgent):
+                 director: DirectorAgent, event_sink: Optional[EventSink] = None):
         self.config = config
         self.characters = {c.name: c for c in characters}
         self.director = director
-        self.graph = self._build_graph()
+        self.conclusion_gate = ConclusionGate(config)
+        self.speaker_model = load_speaker_model(config.speaker_model_path)
+        if self.speaker_model is not None and (config.fused_director or config.speculative_director):
+            print("Warning: the speaker model is only consulted on turns without a fused or speculative "
+                  "director pick; with fused_director/speculative_director on it is bypassed on most turns")
+        self.context_engine = ContextEngine(config)
+        self._template_tokens: Dict[str, int] = {}
+        self.metrics = RunMetrics()
+        # Speculative character drafts in flight for the current turn, and the one kept for the chosen speaker
+        self._speculative_drafts = {}
+        self._committed_draft = None
+        # Live event subscribers (see subscribe/stream) and the start of the turn being streamed
+        self._subscribers: List[asyncio.Queue] = []
+        self._turn_started: Optional[float] = None
+        # Start of the current turn for the turn SLO, and late character replies still being folded in
+        self._slo_turn_started: Optional[float] = None
+        self._slo_turn_degraded = False
+        self._late_drafts = set()
+        # Committed events are also appended here as they happen (see src/event_sink.py)
+        self.event_sink = event_sink
+        # Per-node snapshots for resume() (None when config.checkpoint_path is unset)
+        self.checkpoints = get_checkpoint_store(config.checkpoint_path)
+        self._graphs = {}
+        self.graph = self._compiled("director_select")
     
-    def _build_graph(self) -> StateGraph:
+    def _compiled(self, entry_point: str):
+        """The compiled graph starting at entry_point (resumed runs may start mid-turn)."""
+        if entry_point not in self._graphs:
+            self._graphs[entry_point] = self._build_graph(entry_point)
+        return self._graphs[entry_point]
+    
+    def _build_graph(self, entry_point: str = "director_select") -> StateGraph:
         workflow = StateGraph(StoryState)
         
-        # Add nodes
-        workflow.add_node("director_select", self._director_select_node)
-        workflow.add_node("character_respond", self._character_respond_node)
-        workflow.add_node("check_conclusion", self._check_conclusion_node)
-        workflow.add_node("conclude", self._conclude_node)
+        # Add nodes. Nodes read TrustedStoryState: channel values are already
+        # validated, so skip rebuilding and revalidating the full history each step.
+        workflow.add_node("director_select", self._director_select_node, input_schema=TrustedStoryState)
+        workflow.add_node("character_respond", self._character_respond_node, input_schema=TrustedStoryState)
+        workflow.add_node("check_conclusion", self._check_conclusion_node, input_schema=TrustedStoryState)
+        workflow.add_node("conclude", self._conclude_node, input_schema=TrustedStoryState)
         
         # Add edges
-        workflow.set_entry_point("director_select")
+        workflow.set_entry_point(entry_point)
         
         workflow.add_edge("director_select", "character_respond")
         workflow.add_edge("character_respond", "check_conclusion")
@@ -45,15 +111,56 @@ class NarrativeGraph:
     
     async def _director_select_node(self, state: StoryState) -> Dict:
         """Director selects the next speaker."""
+        # A fused or speculative director call may already have picked the speaker for this turn,
+        # in which case the turn's clock started before that call (unless the run resumed in between)
+        if not state.pending_selection or self._slo_turn_started is None:
+            self._start_turn_clock()
+        if state.pending_selection:
+            update = self._apply_selection(
+                state,
+                state.pending_selection["next_speaker"],
+                state.pending_selection.get("narration")
+            )
+            update["pending_selection"] = None
+            return update
+
         available = list(self.characters.keys())
+        local_pick = self._local_speaker(state, available)
+        if local_pick is not None:
+            return self._apply_selection(state, local_pick, None)
         
         # ===== Collect previous narrations for anti-repetition =====
         previous_narrations = state.story_narration[-5:] if state.story_narration else []
         
-        next_speaker, narration = await self.director.select_next_speaker(
-            state, available, previous_narrations
-        )
+        self._launch_speculative_drafts(state, available)
+        selecting = asyncio.ensure_future(self.director.select_next_speaker(
+            state, self._director_candidates(state, available), previous_narrations,
+            on_partial=self._partial_publisher("Director", "narration", state.current_turn, "director_ttft_seconds")
+        ))
+        try:
+            finished, selection = await self._await_within_slo(selecting, self._slo_budget(director=True))
+        except BaseException:
+            self._settle_speculative_drafts(None)
+            raise
+        if finished:
+            next_speaker, narration = selection
+        else:
+            next_speaker, narration = self._degraded_speaker(state, selecting), None
+        self._settle_speculative_drafts(next_speaker)
+        return self._apply_selection(state, next_speaker, narration)
+
+    def _degraded_speaker(self, state: StoryState, selecting: asyncio.Future) -> str:
+        """Drop a director call that ran over its turn SLO budget and pick the next speaker round-robin."""
+        # A stale choice is useless, so the call is cancelled rather than left to finish
+        selecting.cancel()
+        next_speaker = round_robin_speaker(state, list(self.characters.keys()), self.config)
+        self.metrics.incr("slo_degraded_director")
+        self._slo_turn_degraded = True
+        print(f"  [Turn SLO: director over budget, {next_speaker} speaks next (round-robin)]")
+        return next_speaker
 
+    def _apply_selection(self, state: StoryState, next_speaker: str, narration: str) -> Dict:
+        """Build the state update for a director's speaker choice and narration."""
         print("=" * 60)
         print(f"DIRECTOR NARRATION: {narration}")
         print(f"NEXT SPEAKER: {next_speaker}")
@@ -72,11 +179,118 @@ class NarrativeGraph:
             
         return {
             "next_speaker": next_speaker,
-            "director_notes": state.director_notes + [f"Selected: {next_speaker}"],
-            "story_narration": state.story_narration + [narration] if narration else state.story_narration,
-            "events": state.events + events_update
+            "director_notes": [f"Selected: {next_speaker}"],
+            "story_narration": [narration] if narration else [],
+            "events": self._emit(events_update)
         }
     
+    def _local_speaker(self, state: StoryState, available: List[str]) -> Optional[str]:
+        """The speaker model's pick when it is confident and no narration is due, else None (ask the director)."""
+        if self.speaker_model is None:
+            return None
+        if self._turns_since_narration(state) >= self.config.speaker_model_narration_every:
+            self.metrics.incr("speaker_model_narration_due")
+            return None
+        blocked = [name for name in available if is_blocked_by_consecutive_rule(state, name, self.config)]
+        name, confidence = self.speaker_model.predict(context_from_state(state, available), exclude=blocked)
+        if confidence < self.config.speaker_model_threshold:
+            self.metrics.incr("speaker_model_unsure")
+            return None
+        self.metrics.incr("director_calls_skipped")
+        print(f"  [Speaker model picked {name} ({confidence:.2f}); director call skipped]")
+        self._log_local_pick(state, name, confidence)
+        return name
+
+    def _log_local_pick(self, state: StoryState, name: str, confidence: float) -> None:
+        """Add the speaker model's pick to the prompt log, so training on this run's log sees who took the turn."""
+        entry = {
+            "timestamp": datetime.now().isoformat(),
+            "agent": LOCAL_PICK_AGENT,
+            "next_speaker": name,
+            "confidence": round(confidence, 4),
+            "turn": state.current_turn + 1
+        }
+        if self.director.prompt_log is not None:
+            self.director.prompt_log.append(entry)
+        else:
+            self.director.logs.append(entry)
+
+    def _turns_since_narration(self, state: StoryState) -> float:
+        """Turns since the director last narrated (inf when no narration is among the recent events)."""
+        for event in reversed(state.events):
+            if event.get("type") == "narration":
+                return state.current_turn - event.get("turn", 0)
+        return float("inf")
+
+    def _director_candidates(self, state: StoryState, available: List[str]) -> List[str]:
+        """The speakers the director chooses between (see config.director_candidates)."""
+        candidates = director_candidates(state, available, self.config)
+        if len(candidates) < len(available):
+            self.metrics.incr("director_candidates_filtered")
+        return candidates
+
+    def _launch_speculative_drafts(self, state: StoryState, available: List[str]) -> None:
+        """Start drafting replies for the most likely next speakers while the director decides.
+        
+        Drafts see the previous director narration, since the new one is not written yet.
+        """
+        self._speculative_drafts = {}
+        if self.config.speculative_characters <= 0:
+            return
+        
+        budget = self.config.speculative_token_budget
+        spent = 0
+        for name in rank_likely_speakers(state, available, self.config)[:self.config.speculative_characters]:
+            character = self.characters[name]
+            context = self._build_character_context(state, name)
+            cost = estimate_tokens(character.build_prompt(state, context)) + self.config.max_dialogue_length
+            if budget and spent + cost > budget:
+                break
+            spent += cost
+            self._speculative_drafts[name] = asyncio.create_task(self._timed_draft(character, state, context))
+            self.metrics.incr("speculative_drafts_launched")
+
+    async def _timed_draft(self, character: CharacterAgent, state: StoryState, context: str):
+        started = time.perf_counter()
+        draft = await character.draft_response(state, context)
+        return draft, started, time.perf_counter()
+
+    def _settle_speculative_drafts(self, next_speaker: str) -> None:
+        """Keep the draft for the director's pick and cancel the rest."""
+        if not self._speculative_drafts:
+            return
+        for name, task in self._speculative_drafts.items():
+            if name == next_speaker:
+                self._committed_draft = (name, task, time.perf_counter())
+            else:
+                task.cancel()
+                self.metrics.incr("speculative_drafts_cancelled")
+        self.metrics.incr("speculative_draft_hits" if next_speaker in self._speculative_drafts else "speculative_draft_misses")
+        self._speculative_drafts = {}
+
+    async def _take_speculative_draft(self, state: StoryState, speaker: str):
+        """Return the committed speculative draft for `speaker`, if one was started."""
+        if self._committed_draft is None or self._committed_draft[0] != speaker:
+            return None
+        _, task, director_done = self._committed_draft
+        self._committed_draft = None
+        draft, started, finished = await task
+        # Without speculation the call would only have started once the director finished
+        self.metrics.observe("speculative_time_saved_seconds", min(finished, director_done) - started)
+        return draft
+
+    def _build_character_context(self, state: StoryState, next_speaker: str) -> str:
+        """Assemble the situation context shown to a character before they respond."""
+        return self.context_engine.character_context(
+            state, next_speaker, budget_tokens=self._context_budget(state, next_speaker)
+        )
+
+    def _context_budget(self, state: StoryState, name: str) -> int:
+        """Tokens left for a character's context once their fixed prompt template is counted."""
+        if name not in self._template_tokens:
+            self._template_tokens[name] = estimate_tokens(self.characters[name].build_prompt(state, ""))
+        return self.config.max_context_length - self._template_tokens[name]
+    
     async def _character_respond_node(self, state: StoryState) -> Dict:
         """Selected character generates dialogue or performs action."""
         next_speaker = state.next_speaker
@@ -86,89 +300,18 @@ class NarrativeGraph:
             next_speaker = list(self.characters.keys())[0] 
             
         character = self.characters[next_speaker]
+        observations = state.observation_log
         
-        # Taking last 10 turns
-        recent_turns = state.dialogue_history[-10:]
-        history_text = "\n".join([
-            f"{turn.speaker}: {turn.dialogue}"
-            for turn in recent_turns
-        ])
-        
-        # Include recent actions
-        recent_actions = state.action_history[-5:]
-        actions_text = "\n".join([
-            f"[ACTION] {action.actor}: {action.description}"
-            for action in recent_actions
-        ])
-        
-        # ===== Collect this character's own previous lines for anti-repetition =====
-        own_previous_lines = []
-        for turn in state.dialogue_history:
-            if turn.speaker == next_speaker:
-                own_previous_lines.append(f"[DIALOGUE] {turn.dialogue}")
-        for action in state.action_history:
-            if action.actor == next_speaker:
-                own_previous_lines.append(f"[ACTION: {action.action_type.upper()}] {action.description}")
-        
-        own_previous_lines = own_previous_lines[-5:]
-        own_lines_text = "\n".join(own_previous_lines) if own_previous_lines else "None (this is your first turn)"
-        
-        char_profile = state.character_profiles[next_speaker]
-        char_memory = char_profile.memory
-        
-        # Calculate if we need to nudge the character to perform actions
-        action_count = len(state.action_history)
-        remaining_turns = self.config.max_turns - state.current_turn
-        actions_needed = self.config.min_actions - action_count
-        
-        action_nudge = ""
-        if actions_needed > 0 and remaining_turns <= actions_needed + 3:
-            action_nudge = f"""
-URGENT REQUIREMENT: At least {actions_needed} more non-verbal actions are needed
-(such as GIVE, LEAVE, CALL, THREATEN, SEARCH, TAKE, SHOW, GESTURE, MOVE).
-Only {remaining_turns} turns remain. You MUST perform a non-verbal action this turn instead of just talking.
-Pick an action that makes sense for you and the current situation.
-You have these items you could use: {', '.join(char_memory.inventory) if char_memory.inventory else 'nothing notable'}
-"""
-        
-        # Build detailed inventory list
-        inventory_text = "None"
-        if char_memory.inventory:
-            inventory_items = "\n".join([f"  - {item}" for item in char_memory.inventory])
-            inventory_text = f"\n{inventory_items}"
-        
-        # Build important facts (includes seeded secret)
-        facts_text = "None"
-        if char_memory.important_facts:
-            facts_text = "; ".join(char_memory.important_facts[-5:])
-        
-        context = f"""
-Initial Event: {state.seed_story.get('description', 'Unknown event')}
-{action_nudge}
-World State:
-Location: {state.world_state.get('location', 'Unknown')}
-Characters Present: {', '.join(state.world_state.get('characters_present', []))}
-
-Your Memory:
-Inventory (items you physically have on you right now): {inventory_text}
-Goals: {', '.join(char_memory.goals) if char_memory.goals else 'None'}
-Important Facts You Know: {facts_text}
-Recent Observations: {'; '.join(char_memory.observations[-5:]) if char_memory.observations else 'None'}
-Perceptions of Others: {'; '.join([f'{k}: {v}' for k, v in char_memory.perceptions.items()]) if char_memory.perceptions else 'None yet'}
-
-Director Narration: {state.story_narration[-1] if state.story_narration else 'None'}
-
-Recent Actions:
-{actions_text if actions_text else 'No actions yet'}
-
-Recent Dialogue:
-{history_text if history_text else 'No dialogue yet'}
-
-Your Previous Lines (DO NOT repeat any gestures, phrases, or mannerisms from these):
-{own_lines_text}
-"""
-        
-        response, action_dict = await character.respond(state, context)
+        drafting = asyncio.ensure_future(self._draft_reply(state, next_speaker))
+        finished, draft = await self._await_within_slo(drafting, self._slo_budget(director=False))
+        if not finished:
+            draft = degraded_gesture(next_speaker, state.world.items_of(next_speaker), observations)
+            self.metrics.incr("slo_degraded_character")
+            self._slo_turn_degraded = True
+            print(f"  [Turn SLO: {next_speaker}'s reply over budget, committing a gesture]")
+            self._fold_late_draft(drafting, next_speaker, observations)
+        response, action_dict = character.resolve_draft(draft, state)
+        self._record_turn_slo()
 
         new_turn = state.current_turn + 1
         events_update = []
@@ -183,6 +326,10 @@ Your Previous Lines (DO NOT repeat any gestures, phrases, or mannerisms from the
                 print(f"Target: {action_dict['action_target']}")
             print("=" * 60 + "\n")
             
+            event = action_dict.get('event')
+            if event is not None:
+                event.turn = new_turn
+            
             # Create action object
             action_obj = Action(
                 turn_number=new_turn,
@@ -190,7 +337,7 @@ Your Previous Lines (DO NOT repeat any gestures, phrases, or mannerisms from the
                 action_type=action_dict['action_type'],
                 target=action_dict.get('action_target'),
                 description=response,
-                effects=action_dict.get('effects', {})
+                effects=event.model_dump(exclude_none=True) if event is not None else {}
             )
             action_history_update.append(action_obj)
             
@@ -202,19 +349,21 @@ Your Previous Lines (DO NOT repeat any gestures, phrases, or mannerisms from the
                 "content": response,
                 "turn": new_turn
             })
-            
-            # Update world state with effects
-            world_state_update = {**state.world_state, **action_dict.get('effects', {})}
+            if draft.get("degraded"):
+                events_update[-1]["metadata"] = {"degraded": True}
             
             # Update character memory
-            char_memory.observations.append(f"I performed action: {response}")
+            observations.note(next_speaker, f"I performed action: {response}")
             
-            return {
-                "action_history": state.action_history + action_history_update,
+            update = {
+                "action_history": action_history_update,
                 "current_turn": new_turn,
-                "events": state.events + events_update,
-                "world_state": world_state_update
+                "events": self._emit(events_update)
             }
+            # Apply the action to a snapshot of the world, so earlier states keep theirs
+            if event is not None:
+                update["world"] = apply_world_event(state, event)
+            return update
         else:
             # Regular dialogue
             print("=" * 60)
@@ -237,22 +386,101 @@ Your Previous Lines (DO NOT repeat any gestures, phrases, or mannerisms from the
             })
             
             # Update character memory
-            char_memory.observations.append(f"I said: {response}")
+            observations.note(next_speaker, f"I said: {response}")
             
             return {
-                "dialogue_history": state.dialogue_history + [new_turn_obj],
+                "dialogue_history": [new_turn_obj],
                 "current_turn": new_turn,
-                "events": state.events + events_update
+                "events": self._emit(events_update)
             }
     
+    async def _draft_reply(self, state: StoryState, speaker: str) -> Dict:
+        """The speaker's draft: the speculative one if it was started, else a fresh (streamed) call."""
+        draft = await self._take_speculative_draft(state, speaker)
+        if draft is not None:
+            return draft
+        context = self._build_character_context(state, speaker)
+        return await self.characters[speaker].draft_response(
+            state, context,
+            on_partial=self._partial_publisher(speaker, "response", state.current_turn + 1, "character_ttft_seconds")
+        )
+
+    def _start_turn_clock(self) -> None:
+        """Start timing a turn for turn_ttft_seconds and the turn SLO."""
+        self._turn_started = self._slo_turn_started = time.perf_counter()
+        self._slo_turn_degraded = False
+
+    def _slo_budget(self, director: bool) -> Optional[float]:
+        """Seconds the current call may take under config.turn_slo_seconds (None when the SLO is off).
+        
+        The director gets its share of the turn; the character gets whatever is left.
+        """
+        slo = self.config.turn_slo_seconds
+        if slo is None:
+            return None
+        if self._slo_turn_started is None:
+            # Resumed mid-turn: the turn's clock starts now
+            self._slo_turn_started = time.perf_counter()
+        if director:
+            slo *= self.config.turn_slo_director_share
+        return slo - (time.perf_counter() - self._slo_turn_started)
+
+    async def _await_within_slo(self, task: asyncio.Future, budget: Optional[float]):
+        """Wait up to `budget` seconds for task. Returns (finished, result); an overrun task keeps running."""
+        if budget is None:
+            return True, await task
+        try:
+            done, _ = await asyncio.wait([task], timeout=max(0.0, budget))
+        except BaseException:
+            task.cancel()
+            raise
+        if not done:
+            return False, None
+        return True, task.result()
+
+    def _fold_late_draft(self, task: asyncio.Future, speaker: str, observations: ObservationLog) -> None:
+        """Let an overrun reply finish and note it in the speaker's memory (config.fold_late_responses)."""
+        if not self.config.fold_late_responses:
+            task.cancel()
+            return
+        self._late_drafts.add(task)
+        
+        def fold(done: asyncio.Future) -> None:
+            self._late_drafts.discard(done)
+            if done.cancelled() or done.exception() is not None or not done.result()["response"]:
+                return
+            observations.note(speaker, f"I wanted to say, but the moment passed: {done.result()['response']}")
+            self.metrics.incr("slo_late_responses_folded")
+        task.add_done_callback(fold)
+
+    def _record_turn_slo(self) -> None:
+        """Count whether the turn met the SLO with real responses, was degraded, or ran over."""
+        if self.config.turn_slo_seconds is None or self._slo_turn_started is None:
+            return
+        elapsed = time.perf_counter() - self._slo_turn_started
+        self._slo_turn_started = None
+        self.metrics.observe("turn_seconds", elapsed)
+        self.metrics.incr("slo_turns")
+        if self._slo_turn_degraded:
+            self.metrics.incr("slo_turns_degraded")
+        elif elapsed <= self.config.turn_slo_seconds:
+            self.metrics.incr("slo_turns_met")
+        else:
+            self.metrics.incr("slo_turns_missed")
+
     async def _check_conclusion_node(self, state: StoryState) -> Dict:
-        """Check if story should end."""
+        """Check if story should end"""
         action_count = len(state.action_history)
+        decision, gate_reason = self.conclusion_gate.evaluate(state)
 
-        if state.current_turn < self.config.min_turns:
+        if decision == ConclusionGate.SKIP:
+            if state.current_turn >= self.config.min_turns:
+                # Before the gate, this turn would have paid for a discarded director call
+                print(f"  [Skipping conclusion check: {gate_reason}]")
+                self.metrics.incr("conclusion_checks_skipped")
             return {"is_concluded": False}
 
-        if state.current_turn >= self.config.max_turns:
+        if decision == ConclusionGate.FORCE:
             print(f"\n[HARD STOP] Reached max turns ({self.config.max_turns}). Requesting Director conclusion.")
             if action_count < self.config.min_actions:
                 print(f"  WARNING: Only {action_count}/{self.config.min_actions} actions were performed.")
@@ -271,17 +499,73 @@ Your Previous Lines (DO NOT repeat any gestures, phrases, or mannerisms from the
             return {
                 "is_concluded": True,
                 "conclusion_reason": forced_conclusion or "Story reached its natural end.",
-                "events": state.events + events_update
+                "events": self._emit(events_update)
             }
 
-        should_end, reason = await self.director.check_conclusion(state)
+        self.metrics.incr("conclusion_checks_issued")
+        started = time.perf_counter()
+        available = self._director_candidates(state, list(self.characters.keys()))
+        previous_narrations = state.story_narration[-5:] if state.story_narration else []
+        pending_selection = None
+        speculative_selection = None
+        on_partial = None
+        if self.config.fused_director or self.config.speculative_director:
+            # The next turn's speaker is picked below, so that turn's clock starts now
+            # and its narration streams from here
+            self._start_turn_clock()
+            on_partial = self._partial_publisher(
+                "Director", "narration", state.current_turn, "director_ttft_seconds"
+            )
+        if self.config.fused_director:
+            directing = asyncio.ensure_future(self.director.direct_turn(
+                state, available, previous_narrations, on_partial=on_partial
+            ))
+            finished, direction = await self._await_within_slo(directing, self._slo_budget(director=True))
+            if finished:
+                should_end, reason, next_speaker, narration = direction
+            else:
+                # Without the director's verdict the story goes on
+                should_end, reason = False, None
+                next_speaker, narration = self._degraded_speaker(state, directing), None
+            pending_selection = {"next_speaker": next_speaker, "narration": narration}
+        else:
+            if self.config.speculative_director:
+                # Next-turn selection reads the same post-turn state, so run it alongside the check
+                speculative_selection = asyncio.create_task(
+                    self.director.select_next_speaker(state, available, previous_narrations, on_partial=on_partial)
+                )
+                self.metrics.incr("speculative_selections_launched")
+            try:
+                should_end, reason = await self.director.check_conclusion(state)
+            except BaseException:
+                if speculative_selection is not None:
+                    speculative_selection.cancel()
+                raise
 
-        if should_end:
-            if action_count < self.config.min_actions:
-                remaining = self.config.max_turns - state.current_turn
-                print(f"  [Blocking conclusion: only {action_count}/{self.config.min_actions} actions. {remaining} turns remaining.]")
-                return {"is_concluded": False}
+        if should_end and action_count < self.config.min_actions:
+            remaining = self.config.max_turns - state.current_turn
+            print(f"  [Blocking conclusion: only {action_count}/{self.config.min_actions} actions. {remaining} turns remaining.]")
+            should_end = False
+
+        if speculative_selection is not None:
+            if should_end:
+                speculative_selection.cancel()
+                self.metrics.incr("speculative_selections_wasted")
+            else:
+                finished, selection = await self._await_within_slo(
+                    speculative_selection, self._slo_budget(director=True)
+                )
+                if finished:
+                    next_speaker, narration = selection
+                    self.metrics.incr("speculative_selections_used")
+                else:
+                    next_speaker, narration = self._degraded_speaker(state, speculative_selection), None
+                pending_selection = {"next_speaker": next_speaker, "narration": narration}
+        self.metrics.observe("director_check_seconds", time.perf_counter() - started)
 
+        if should_end:
+            # No next turn after all
+            self._turn_started = self._slo_turn_started = None
             events_update = []
             if reason:
                 events_update.append({
@@ -294,11 +578,57 @@ Your Previous Lines (DO NOT repeat any gestures, phrases, or mannerisms from the
             return {
                 "is_concluded": True,
                 "conclusion_reason": str(reason),
-                "events": state.events + events_update
+                "events": self._emit(events_update)
             }
 
-        return {"is_concluded": False}
+        return {"is_concluded": False, "pending_selection": pending_selection}
     
+    def subscribe(self) -> asyncio.Queue:
+        """Register a queue that receives live events while the story runs.
+        
+        Items are {"type": "partial", "speaker", "field", "content", "turn"} while
+        text streams in (requires config.stream_responses), and the committed
+        narration/dialogue/action events as they are added to the state.
+        """
+        queue = asyncio.Queue()
+        self._subscribers.append(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        if queue in self._subscribers:
+            self._subscribers.remove(queue)
+
+    def _publish(self, event: Dict) -> None:
+        if self._turn_started is not None and event.get("content"):
+            # Time from the start of the turn until the first word could be shown
+            self.metrics.observe("turn_ttft_seconds", time.perf_counter() - self._turn_started)
+            self._turn_started = None
+        for queue in self._subscribers:
+            queue.put_nowait(event)
+
+    def _emit(self, events: List[Dict]) -> List[Dict]:
+        """Publish committed events to subscribers and the event sink, and return them for the state update."""
+        for event in events:
+            if self.event_sink is not None:
+                self.event_sink.write_event(event)
+            self._publish(event)
+        return events
+
+    def _partial_publisher(self, speaker: str, field: str, turn: int,
+                           ttft_metric: str) -> Optional[Callable[[str], None]]:
+        """Build an on_partial callback that publishes streamed text and records time-to-first-token."""
+        if not self.config.stream_responses:
+            return None
+        started = time.perf_counter()
+        first = [True]
+        
+        def on_partial(text: str) -> None:
+            if first[0]:
+                first[0] = False
+                self.metrics.observe(ttft_metric, time.perf_counter() - started)
+            self._publish({"type": "partial", "speaker": speaker, "field": field, "content": text, "turn": turn})
+        return on_partial
+
     async def _conclude_node(self, state: StoryState) -> Dict:
         """Finalize story."""
         return {"is_concluded": True}
@@ -307,22 +637,190 @@ Your Previous Lines (DO NOT repeat any gestures, phrases, or mannerisms from the
         if state.is_concluded:
             return "conclude"
         return "continue"
-    
-    async def run(self, seed_story: Dict, character_profiles: Dict[str, Any] = None) -> StoryState:
-        """Execute the narrative game loop"""
+
+    async def run(self, seed_story: Dict, character_profiles: Dict[str, Any] = None,
+                  run_id: Optional[str] = None) -> StoryState:
+        """Execute the narrative game loop.
+        
+        With checkpointing enabled and a run_id, the state is saved after every
+        node so the run can be continued with resume(run_id).
+        """
         initial_state = StoryState(
             seed_story=seed_story,
             character_profiles=character_profiles or {},
             dialogue_history=[],
             director_notes=[],
-            world_state={
-                "location": "Shahrah-e-Faisal near Karachi Airport",
-                "time": "late afternoon",
-                "traffic_cleared": False,
-                "accident_resolved": False,
-                "characters_present": list(character_profiles.keys()) if character_profiles else []
-            }
+            world=WorldModel(location="Shahrah-e-Faisal near Karachi Airport", time="late afternoon")
         )
+        start_scene(initial_state)
+        
+        if self.checkpoints is not None and run_id is not None:
+            self.checkpoints.start_run(run_id, {
+                "seed_story": seed_story,
+                "character_profiles": {
+                    name: profile.model_dump(mode="json") if isinstance(profile, CharacterProfile) else profile
+                    for name, profile in (character_profiles or {}).items()
+                }
+            })
+        return await self._execute(initial_state, "director_select", run_id)
+
+    async def resume(self, run_id: str) -> StoryState:
+        """Continue a checkpointed run from the node after the last one it completed.
+        
+        Restores the story state (including character memories), the run metrics and
+        the agents' call counters and logs, so completed turns are never re-run.
+        """
+        if self.checkpoints is None:
+            raise ValueError("Checkpointing is off: set config.checkpoint_path to resume runs")
+        inputs = self.checkpoints.run_inputs(run_id)
+        if inputs is None:
+            raise ValueError(f"No checkpointed run with id '{run_id}'")
+        
+        checkpoint = self.checkpoints.latest(run_id)
+        if checkpoint is None:
+            # Failed before the first node finished: start over from the recorded inputs
+            profiles = {name: CharacterProfile(**data) for name, data in inputs["character_profiles"].items()}
+            return await self.run(inputs["seed_story"], profiles, run_id=run_id)
+        
+        data = checkpoint["state"]
+        appended = checkpoint["appended"]
+        for path in CHECKPOINT_LOGS:
+            if path in appended:
+                *parents, name = path.split(".")
+                target = data
+                for parent in parents:
+                    target = target.setdefault(parent, {})
+                target[name] = appended[path]
+        events = appended.get("events", data.get("events", []))
+        data["events"] = events[-RECENT_EVENTS:]
+        state = StoryState.model_validate(data)
+        # Runtime snapshots are stored as deltas, oldest first
+        for runtime in appended.get("runtime") or [checkpoint["runtime"]]:
+            self._restore_runtime(runtime)
+        if self.event_sink is not None:
+            for event in events:
+                self.event_sink.write_event(event)
+        
+        entry_point = self._next_node(checkpoint["node"], state)
+        print(f"[Resuming run {run_id} after '{checkpoint['node']}' at turn {state.current_turn}]")
+        if entry_point is None:
+            return dict(state)
+        return await self._execute(state, entry_point, run_id, checkpoint["seq"])
+
+    @staticmethod
+    def _next_node(node: str, state: StoryState) -> Optional[str]:
+        if node == "director_select":
+            return "character_respond"
+        if node == "character_respond":
+            return "check_conclusion"
+        if node == "check_conclusion":
+            return "conclude" if state.is_concluded else "director_select"
+        return None
+
+    async def _execute(self, state: StoryState, entry_point: str, run_id: Optional[str], seq: int = 0):
+        graph = self._compiled(entry_point)
+        if self.checkpoints is None or run_id is None:
+            final_state = await graph.ainvoke(state)
+        else:
+            # Items of each append-only list already in a checkpoint (none yet for a fresh run)
+            saved = {path: 0 if seq == 0 else len(_log_at(state, path)) for path in CHECKPOINT_LOGS}
+            runtime_saved = None if seq == 0 else self._runtime_sizes()
+            final_state, node, new_events = None, None, []
+            async for mode, chunk in graph.astream(state, stream_mode=["updates", "values"]):
+                if mode == "updates":
+                    node = next(iter(chunk))
+                    new_events = (chunk[node] or {}).get("events", [])
+                elif node is not None:
+                    # State after `node`: commit it before the next node starts. The snapshot
+                    # leaves out the append-only lists; only their new items are stored.
+                    seq += 1
+                    final_state = chunk
+                    current = TrustedStoryState(**chunk)
+                    appended = {"runtime": [self._runtime_snapshot(runtime_saved)]}
+                    runtime_saved = self._runtime_sizes()
+                    if new_events:
+                        appended["events"] = new_events
+                    for path in CHECKPOINT_LOGS:
+                        items = _log_at(current, path)
+                        if len(items) > saved[path]:
+                            appended[path] = [_to_json(item) for item in items[saved[path]:]]
+                            saved[path] = len(items)
+                    self.checkpoints.save(
+                        run_id, seq, node,
+                        current.model_dump(mode="json", exclude=CHECKPOINT_EXCLUDE),
+                        {},  # Stored as a delta in `appended`
+                        completed=(node == "conclude"),
+                        appended=appended
+                    )
+        
+        # Replies still running past the end of the story have nothing left to fold into
+        for task in list(self._late_drafts):
+            task.cancel()
+        
+        for agent in [self.director, *self.characters.values()]:
+            for name, count in agent.json_stats.items():
+                self.metrics.incr(f"json_{name}", count)
+            self.metrics.merge(agent.call_metrics)
+        return final_state
+
+    def _runtime_snapshot(self, since: Optional[Dict] = None) -> Dict:
+        """Non-state progress that a resumed run must carry over.
+        
+        With `since` (an earlier _runtime_sizes()), metric samples and agent logs
+        hold only what was added after it; restoring such snapshots in order
+        rebuilds the whole runtime.
+        """
+        since = since or {"metrics": None, "agents": {}}
+        snapshot = {"metrics": self.metrics.snapshot(since["metrics"]), "agents": {}}
+        for agent in [self.director, *self.characters.values()]:
+            agent_since = since["agents"].get(agent.name, {"call_metrics": None, "logs": 0})
+            snapshot["agents"][agent.name] = {
+                "llm_calls": agent.llm_calls,
+                "cached_replies": agent.cached_replies,
+                "json_stats": dict(agent.json_stats),
+                "call_metrics": agent.call_metrics.snapshot(agent_since["call_metrics"]),
+                "logs": agent.logs[agent_since["logs"]:]
+            }
+        return snapshot
+
+    def _runtime_sizes(self) -> Dict:
+        """How far the append-only parts of the runtime have grown (see _runtime_snapshot)."""
+        return {
+            "metrics": self.metrics.sizes(),
+            "agents": {
+                agent.name: {"call_metrics": agent.call_metrics.sizes(), "logs": len(agent.logs)}
+                for agent in [self.director, *self.characters.values()]
+            }
+        }
+
+    def _restore_runtime(self, runtime: Dict) -> None:
+        self.metrics.restore(runtime["metrics"])
+        for agent in [self.director, *self.characters.values()]:
+            saved = runtime["agents"].get(agent.name)
+            if saved is None:
+                continue
+            agent.llm_calls = saved["llm_calls"]
+            agent.cached_replies = saved.get("cached_replies", 0)
+            agent.json_stats = Counter(saved["json_stats"])
+            agent.call_metrics.restore(saved["call_metrics"])
+            agent.logs.extend(saved["logs"])
+
+    async def stream(self, seed_story: Dict, character_profiles: Dict[str, Any] = None) -> AsyncIterator[Dict]:
+        """Run the story, yielding live events (see subscribe) as they happen.
         
-        final_state = await self.graph.ainvoke(initial_state)
-        return final_state
\ No newline at end of file
+        The last item is {"type": "final", "state": final_state}.
+        """
+        queue = self.subscribe()
+        task = asyncio.create_task(self.run(seed_story, character_profiles))
+        task.add_done_callback(lambda _: queue.put_nowait(None))
+        try:
+            while True:
+                event = await queue.get()
+                if event is None:
+                    break
+                yield event
+            yield {"type": "final", "state": await task}
+        finally:
+            self.unsubscribe(queue)
+            if not task.done():
+                task.cancel()
\ No newline at end of file
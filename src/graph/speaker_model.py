@@ -0,0 +1,312 @@
+"""Local next-speaker model trained from the director's logged picks.
+
+    python -m src.graph.speaker_model train prompts_log.json --out speaker_model.json
+    python -m src.graph.speaker_model eval prompts_log.json --model speaker_model.json --threshold 0.8
+"""
+import argparse
+import json
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..agents.json_stream import parse_json_object
+from ..llm.replay import load_entries
+from ..schemas import StoryState
+from .speaker_ranking import _named, recent_turns
+
+# The tails of the history the director's selection prompt shows (see DirectorAgent._selection_fields),
+# so features computed from a live state match those recovered from a logged prompt
+DIALOGUE_WINDOW = 5
+ACTION_WINDOW = 3
+# Agent name of the prompt log entries recording speakers this model picked (no prompt or response)
+LOCAL_PICK_AGENT = "SpeakerModel"
+
+FEATURES = (
+    "took_last_turn",
+    "took_turn_before_last",
+    "turn_share",
+    "named_last",
+    "named_earlier",
+    "named_in_actions",
+    "silent_so_far",
+    "opening_cast_order",
+)
+
+
+@dataclass
+class SelectionContext:
+    """What the director saw when picking: recent (speaker, line) and (actor, description) pairs,
+    plus who took the recent turns (dialogue or action), all oldest first."""
+    dialogue: List[Tuple[str, str]]
+    actions: List[Tuple[str, str]]
+    available: List[str]
+    turns: List[str]
+
+
+def context_from_state(state: StoryState, available: List[str]) -> SelectionContext:
+    return SelectionContext(
+        dialogue=[(t.speaker, t.dialogue) for t in state.dialogue_history[-DIALOGUE_WINDOW:]],
+        actions=[(a.actor, a.description) for a in state.action_history[-ACTION_WINDOW:]],
+        available=list(available),
+        turns=[speaker for speaker, _, _ in recent_turns(state, DIALOGUE_WINDOW)]
+    )
+
+
+def _section(prompt: str, heading: str) -> Optional[str]:
+    start = prompt.find(f"{heading}:\n")
+    if start < 0:
+        return None
+    start += len(heading) + 2
+    end = prompt.find("\n\n", start)
+    return prompt[start:] if end < 0 else prompt[start:end]
+
+
+def _split_lines(text: str, names: List[str], prefix: str = "") -> List[Tuple[str, str]]:
+    """Split "Name: text" lines; lines that start with no known name continue the previous one."""
+    by_length = sorted(names, key=len, reverse=True)
+    pairs = []
+    for line in text.splitlines():
+        line = line[len(prefix):] if prefix and line.startswith(prefix) else line
+        speaker = next((name for name in by_length if line.startswith(f"{name}: ")), None)
+        if speaker is not None:
+            pairs.append((speaker, line[len(speaker) + 2:]))
+        elif pairs:
+            pairs[-1] = (pairs[-1][0], f"{pairs[-1][1]}\n{line}")
+    return pairs
+
+
+def context_from_prompt(prompt: str, turns: List[str]) -> Optional[SelectionContext]:
+    """Recover the selection context from a logged director selection prompt (None if it is not one).
+    
+    The prompt does not say whether the last turn was dialogue or an action, so
+    the caller passes who took the recent turns.
+    """
+    dialogue, actions, people = (_section(prompt, heading) for heading in
+                                 ("Recent Dialogue", "Recent Actions", "Available People"))
+    if dialogue is None or actions is None or people is None:
+        return None
+    available = [name.strip() for name in people.split(",") if name.strip()]
+    return SelectionContext(
+        dialogue=_split_lines(dialogue, available),
+        actions=_split_lines(actions, available, prefix="[ACTION] "),
+        available=available,
+        turns=turns[-DIALOGUE_WINDOW:]
+    )
+
+
+def features(context: SelectionContext) -> np.ndarray:
+    """One row of FEATURES per available character."""
+    by_last_word = defaultdict(list)
+    for name in context.available:
+        by_last_word[name.split()[-1].lower()].append(name)
+    speakers = [speaker for speaker, _ in context.dialogue]
+    turns = context.turns
+    named_last = _named(context.dialogue[-1][1], by_last_word) if context.dialogue else set()
+    named_earlier = set()
+    for _, text in context.dialogue[:-1]:
+        named_earlier |= _named(text, by_last_word)
+    named_by_actor = [(actor, _named(text, by_last_word)) for actor, text in context.actions]
+    active = set(speakers) | {actor for actor, _ in context.actions} | set(turns)
+
+    rows = np.zeros((len(context.available), len(FEATURES)))
+    for i, name in enumerate(context.available):
+        rows[i] = (
+            turns[-1:] == [name],
+            turns[-2:-1] == [name],
+            turns.count(name) / DIALOGUE_WINDOW,
+            name in named_last and speakers[-1] != name,
+            name in named_earlier,
+            any(name in named and actor != name for actor, named in named_by_actor),
+            name not in active,
+            0.0 if context.dialogue else 1.0 - i / len(context.available),
+        )
+    return rows
+
+
+def _softmax(scores: np.ndarray) -> np.ndarray:
+    exp = np.exp(scores - scores.max())
+    return exp / exp.sum()
+
+
+class SpeakerModel:
+    """Conditional logit over the available characters: P(name) = softmax(features(name) . weights).
+
+    Small enough to score a cast of hundreds in well under a millisecond.
+    """
+
+    def __init__(self, weights: Sequence[float], trained_on: int = 0):
+        self.weights = np.asarray(weights, dtype=np.float64)
+        self.trained_on = trained_on
+
+    def probabilities(self, context: SelectionContext, exclude: Iterable[str] = ()) -> np.ndarray:
+        scores = features(context) @ self.weights
+        excluded = set(exclude)
+        mask = np.array([name in excluded for name in context.available])
+        if mask.all():
+            mask[:] = False
+        scores[mask] = -np.inf
+        return _softmax(scores)
+
+    def predict(self, context: SelectionContext, exclude: Iterable[str] = ()) -> Tuple[str, float]:
+        """The likeliest next speaker and the model's probability for it."""
+        probabilities = self.probabilities(context, exclude)
+        best = int(np.argmax(probabilities))
+        return context.available[best], float(probabilities[best])
+
+    @classmethod
+    def fit(cls, examples: List[Tuple[SelectionContext, str]], l2: float = 0.01,
+            steps: int = 500, learning_rate: float = 0.5) -> "SpeakerModel":
+        """Fit by full-batch gradient descent on the L2-regularized log-likelihood.
+
+        All examples' candidate rows are stacked in one matrix, and the softmax
+        over each example's candidates is taken with reduceat over its segment.
+        """
+        blocks = [features(context) for context, _ in examples]
+        x = np.vstack(blocks)
+        starts = np.cumsum([0] + [len(block) for block in blocks[:-1]])
+        sizes = np.array([len(block) for block in blocks])
+        chosen = starts + np.array([context.available.index(label) for context, label in examples])
+
+        weights = np.zeros(len(FEATURES))
+        for _ in range(steps):
+            scores = x @ weights
+            scores -= np.repeat(np.maximum.reduceat(scores, starts), sizes)
+            exp = np.exp(scores)
+            residual = exp / np.repeat(np.add.reduceat(exp, starts), sizes)
+            residual[chosen] -= 1.0  # Gradient of the log-likelihood: predicted minus observed
+            gradient = x.T @ residual / len(examples) + l2 * weights
+            weights -= learning_rate * gradient
+        return cls(weights, trained_on=len(examples))
+
+    def save(self, path: str) -> None:
+        Path(path).write_text(json.dumps({
+            "features": list(FEATURES),
+            "weights": [round(float(w), 6) for w in self.weights],
+            "trained_on": self.trained_on
+        }, indent=2))
+
+    @classmethod
+    def load(cls, path: str) -> "SpeakerModel":
+        data = json.loads(Path(path).read_text())
+        if data.get("features") != list(FEATURES):
+            raise ValueError(f"{path} was trained on different features; retrain it")
+        return cls(data["weights"], data.get("trained_on", 0))
+
+
+def load_speaker_model(path: Optional[str]) -> Optional[SpeakerModel]:
+    """The model at `path`, or None (always ask the director) when unset or unreadable."""
+    if not path:
+        return None
+    try:
+        return SpeakerModel.load(path)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Warning: could not load speaker model from {path} ({e}); the director picks every speaker")
+        return None
+
+
+def examples_from_logs(paths: Iterable[str]) -> List[Tuple[SelectionContext, str]]:
+    """(context, director's pick) for every logged director call that named a next speaker.
+    
+    The chosen character always takes the following turn, so each run's earlier
+    picks give who took the recent turns; picks the model made itself are
+    logged as LOCAL_PICK_AGENT entries and only fill in those turns (they are
+    not the director's choices, so never labels). A prompt with no dialogue or
+    actions starts a new run.
+    """
+    examples = []
+    for path in paths:
+        turns = []
+        for entry in load_entries(path):
+            if entry.get("agent") == LOCAL_PICK_AGENT:
+                if entry.get("next_speaker"):
+                    turns = turns + [entry["next_speaker"]]
+                continue
+            if entry.get("agent") != "Director" or not entry.get("response"):
+                continue
+            context = context_from_prompt(entry["prompt"], turns)
+            if context is None:
+                continue
+            if not context.dialogue and not context.actions:
+                context.turns = turns = []
+            try:
+                data, _ = parse_json_object(entry["response"])
+            except ValueError:
+                continue
+            if data.get("next_speaker") in context.available:
+                examples.append((context, data["next_speaker"]))
+                turns = turns + [data["next_speaker"]]
+    return examples
+
+
+def evaluate(model: SpeakerModel, examples: List[Tuple[SelectionContext, str]], threshold: float) -> Dict:
+    """Agreement with the director overall, and on the picks confident enough to skip its call."""
+    agreed = confident = confident_agreed = 0
+    for context, label in examples:
+        name, probability = model.predict(context)
+        agreed += name == label
+        if probability >= threshold:
+            confident += 1
+            confident_agreed += name == label
+    total = len(examples)
+    return {
+        "examples": total,
+        "agreement": round(agreed / total, 3) if total else None,
+        "skipped_calls": confident,
+        "skip_rate": round(confident / total, 3) if total else None,
+        "agreement_when_skipped": round(confident_agreed / confident, 3) if confident else None,
+    }
+
+
+def cross_validate(examples: List[Tuple[SelectionContext, str]], threshold: float, folds: int) -> Dict:
+    """Evaluate on each of `folds` interleaved held-out slices with a model fit on the rest."""
+    folds = max(2, min(folds, len(examples)))
+    held_out_results = []
+    for fold in range(folds):
+        train = [e for i, e in enumerate(examples) if i % folds != fold]
+        test = [e for i, e in enumerate(examples) if i % folds == fold]
+        held_out_results.append((evaluate(SpeakerModel.fit(train), test, threshold), len(test)))
+    total = sum(n for _, n in held_out_results)
+    skipped = sum(r["skipped_calls"] for r, _ in held_out_results)
+    return {
+        "examples": total,
+        "agreement": round(sum(r["agreement"] * n for r, n in held_out_results) / total, 3),
+        "skipped_calls": skipped,
+        "skip_rate": round(skipped / total, 3),
+        "agreement_when_skipped": round(sum(
+            r["agreement_when_skipped"] * r["skipped_calls"] for r, _ in held_out_results if r["skipped_calls"]
+        ) / skipped, 3) if skipped else None,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Train or evaluate the local next-speaker model.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    train = commands.add_parser("train", help="fit on logged director picks and save the weights")
+    train.add_argument("logs", nargs="+", help="prompts_log.json files, .jsonl cassettes or prompt log directories")
+    train.add_argument("--out", default="speaker_model.json")
+    train.add_argument("--folds", type=int, default=5, help="cross-validation folds for the held-out report")
+    train.add_argument("--threshold", type=float, default=0.8)
+    evaluate_parser = commands.add_parser("eval", help="agreement of a saved model with logged director picks")
+    evaluate_parser.add_argument("logs", nargs="+")
+    evaluate_parser.add_argument("--model", default="speaker_model.json")
+    evaluate_parser.add_argument("--threshold", type=float, default=0.8)
+    args = parser.parse_args(argv)
+
+    examples = examples_from_logs(args.logs)
+    if not examples:
+        parser.error("no director speaker picks found in the given logs")
+    if args.command == "train":
+        print(f"Held-out ({args.folds}-fold): {json.dumps(cross_validate(examples, args.threshold, args.folds))}")
+        model = SpeakerModel.fit(examples)
+        model.save(args.out)
+        print(f"Training set: {json.dumps(evaluate(model, examples, args.threshold))}")
+        print(f"Saved {args.out}: " + ", ".join(f"{f}={w:.2f}" for f, w in zip(FEATURES, model.weights)))
+    else:
+        print(json.dumps(evaluate(SpeakerModel.load(args.model), examples, args.threshold)))
+
+
+if __name__ == "__main__":
+    main()
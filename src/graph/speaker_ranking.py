@@ -0,0 +1,119 @@
+import re
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+from ..config import StoryConfig
+from ..schemas import StoryState
+
+
+def recent_turns(state: StoryState, window: int) -> List[Tuple[str, str, str]]:
+    """Last `window` turns as (speaker, text, target) tuples in turn order.
+    
+    Dialogue and actions are kept in separate histories; this merges their tails
+    by turn number. Target is empty for dialogue.
+    """
+    merged = [(t.turn_number, t.speaker, t.dialogue, "") for t in state.dialogue_history[-window:]]
+    merged += [(a.turn_number, a.actor, a.description, a.target or "") for a in state.action_history[-window:]]
+    merged.sort(key=lambda turn: turn[0])
+    return [(speaker, text, target) for _, speaker, text, target in merged[-window:]]
+
+
+def is_blocked_by_consecutive_rule(state: StoryState, name: str, config: StoryConfig) -> bool:
+    """True when `name` already took the last max_consecutive_same_character turns."""
+    limit = config.max_consecutive_same_character
+    last = recent_turns(state, limit)
+    return len(last) >= limit and all(speaker == name for speaker, _, _ in last)
+
+
+_WORD = re.compile(r"[a-z]+")
+
+
+def _named(text: str, by_last_word: Dict[str, List[str]]) -> Set[str]:
+    """Characters addressed in `text` by their last name word ("Raza", "Jameel"), which a full name also contains.
+    
+    Looks up the words of the text rather than searching for every name, so the
+    cost does not depend on the size of the cast.
+    """
+    return {name for word in set(_WORD.findall(text.lower())) for name in by_last_word.get(word, ())}
+
+
+def _blocked_speaker(turns: List[Tuple[str, str, str]], config: StoryConfig) -> Optional[str]:
+    """The one character the consecutive rule blocks, given the recent turns (newest last)."""
+    limit = config.max_consecutive_same_character
+    last = turns[-limit:]
+    if len(last) >= limit and all(speaker == last[0][0] for speaker, _, _ in last):
+        return last[0][0]
+    return None
+
+
+def pending_item_targets(state: StoryState, window: int = 6) -> List[str]:
+    """Targets of recent GIVE/SHOW actions who have not taken a turn since, newest first."""
+    last_turn = {}
+    for turn in state.dialogue_history[-window:]:
+        last_turn[turn.speaker] = max(last_turn.get(turn.speaker, -1), turn.turn_number)
+    for action in state.action_history[-window:]:
+        last_turn[action.actor] = max(last_turn.get(action.actor, -1), action.turn_number)
+    
+    pending = []
+    for action in reversed(state.action_history[-window:]):
+        target = action.target
+        if (action.action_type.lower() in ("give", "show") and target and target not in pending
+                and last_turn.get(target, -1) < action.turn_number):
+            pending.append(target)
+    return pending
+
+
+def score_speakers(state: StoryState, available: List[str], config: StoryConfig,
+                   window: int = 6, mention_window: int = 3) -> List[Tuple[str, float]]:
+    """Score how likely the director is to pick each character next, highest first.
+    
+    Uses recent participation (back-and-forth favours the previous speaker's
+    partner), who was named or targeted in the last few lines (newest counts
+    most), GIVE/SHOW targets who have not responded yet, and the
+    max_consecutive_same_character rule. Apart from the final sort, the cost
+    does not grow with the cast, so it stays cheap for casts of a few hundred.
+    """
+    turns = recent_turns(state, window)
+    scores = {name: 0.0 for name in available}
+    
+    for distance, (speaker, _, _) in enumerate(reversed(turns)):
+        if speaker in scores:
+            # Whoever just spoke rarely goes again; their conversation partner usually does
+            scores[speaker] += (0.3 if distance == 0 else 1.0) * (0.8 ** distance)
+    
+    by_last_word = defaultdict(list)
+    for name in available:
+        by_last_word[name.split()[-1].lower()].append(name)
+    for distance, (speaker, text, target) in enumerate(reversed(turns[-mention_window:])):
+        weight = 0.6 ** distance
+        targeted = _named(target, by_last_word) if target else set()
+        for name in targeted | _named(text, by_last_word):
+            if name != speaker:
+                scores[name] += (1.5 if name in targeted else 1.0) * weight
+    
+    for target in pending_item_targets(state, window):
+        if target in scores:
+            # Someone just handed or showed them something: they are expected to react
+            scores[target] += 1.0
+    
+    blocked = _blocked_speaker(turns, config)
+    if blocked in scores:
+        scores[blocked] = float("-inf")
+    
+    order = {name: i for i, name in enumerate(available)}
+    return sorted(scores.items(), key=lambda item: (-item[1], order[item[0]]))
+
+
+def rank_likely_speakers(state: StoryState, available: List[str], config: StoryConfig) -> List[str]:
+    """Characters ordered by likelihood of being picked next, excluding rule-blocked ones."""
+    return [name for name, score in score_speakers(state, available, config) if score != float("-inf")]
+
+
+def director_candidates(state: StoryState, available: List[str], config: StoryConfig) -> List[str]:
+    """The characters to offer the director: the top config.director_candidates by local score.
+    
+    Everyone is offered when the option is off or the cast is already that small.
+    """
+    k = config.director_candidates
+    if k <= 0 or len(available) <= k:
+        return available
+    return rank_likely_speakers(state, available, config)[:k] or available[:k]
@@ -0,0 +1,82 @@
+from collections.abc import Sequence
+from itertools import islice
+from typing import Any, Generic, Iterable, Iterator, List, TypeVar, get_args
+from pydantic_core import core_schema
+
+T = TypeVar("T")
+
+
+class History(Sequence, Generic[T]):
+    """Append-only list whose `+` is amortised O(new items) and never changes the original.
+
+    A History is a view of the first `len()` items of a backing list that
+    several views share. Appending to the newest view extends that backing list
+    in place and returns a longer view; older views still end where they did,
+    so snapshots taken before the append keep their contents. Appending to an
+    older view (a branch) copies its items first, like a plain list would.
+
+    Used for the story's append-only state channels (see schemas.append_items)
+    and WorldModel.events. Validates from and serializes to a plain list.
+    """
+
+    __slots__ = ("_items", "_length")
+
+    def __init__(self, items: Iterable[T] = ()):
+        self._items: List[T] = list(items)
+        self._length = len(self._items)
+
+    @classmethod
+    def _view(cls, items: List[T]) -> "History[T]":
+        view = cls.__new__(cls)
+        view._items = items
+        view._length = len(items)
+        return view
+
+    def __add__(self, new: Iterable[T]) -> "History[T]":
+        new = list(new)
+        if not new:
+            return self
+        if self._length == len(self._items):
+            # The newest view: nothing shares the items past its end, so extend in place
+            items = self._items
+        else:
+            items = self._items[:self._length]
+        items.extend(new)
+        return self._view(items)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._items[slice(*index.indices(self._length))]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("History index out of range")
+        return self._items[index]
+
+    def __iter__(self) -> Iterator[T]:
+        return islice(self._items, self._length)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (History, list)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"History({list(self)!r})"
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source: Any, handler) -> core_schema.CoreSchema:
+        item_type = (get_args(source) or (Any,))[0]
+        items_schema = handler.generate_schema(List[item_type])
+        from_list = core_schema.no_info_after_validator_function(cls, items_schema)
+        return core_schema.json_or_python_schema(
+            json_schema=from_list,
+            # Histories already in the state were validated when their items were added
+            python_schema=core_schema.union_schema([core_schema.is_instance_schema(cls), from_list]),
+            serialization=core_schema.wrap_serializer_function_ser_schema(
+                lambda value, serialize: serialize(list(value)), schema=items_schema
+            )
+        )
@@ -0,0 +1,87 @@
+import time
+from typing import Dict, Optional, Tuple
+
+from langchain_google_genai import ChatGoogleGenerativeAI
+from .replay import LatencyModel, RecordingChatModel, ReplayChatModel, get_cassette
+
+# Process-wide pool of live clients keyed by generation parameters. Agents (and
+# concurrent stories) borrow from it, so they share one client and its HTTP
+# connection pool instead of each constructing their own.
+_clients: Dict[Tuple[str, float, int], ChatGoogleGenerativeAI] = {}
+_pool_stats = {"clients_created": 0, "borrows": 0, "client_init_seconds": 0.0}
+
+
+def get_chat_client(model_name: str, temperature: float, max_output_tokens: int) -> ChatGoogleGenerativeAI:
+    """Borrow the shared live client for these generation parameters, creating it on first use."""
+    key = (model_name, float(temperature), int(max_output_tokens))
+    client = _clients.get(key)
+    if client is None:
+        started = time.perf_counter()
+        client = ChatGoogleGenerativeAI(
+            model=model_name,
+            temperature=temperature,
+            max_output_tokens=max_output_tokens,
+            # BaseAgent retries with backoff under the shared rate limiter
+            max_retries=0
+        )
+        _pool_stats["client_init_seconds"] += time.perf_counter() - started
+        _pool_stats["clients_created"] += 1
+        _clients[key] = client
+    _pool_stats["borrows"] += 1
+    return client
+
+
+def prewarm_clients(config, overrides=()) -> float:
+    """Create the pooled clients a run will need before it starts; returns the seconds spent.
+
+    `overrides` lists extra (temperature, max_output_tokens) pairs used for per-call overrides.
+    Clients for config.fallback_models are created too.
+    """
+    if config.llm_backend == "replay":
+        return 0.0
+    started = time.perf_counter()
+    for model_name in [config.model_name, *config.fallback_models]:
+        for temperature, max_output_tokens in [(config.temperature, config.max_tokens_per_prompt), *overrides]:
+            key = (model_name, float(temperature), int(max_output_tokens))
+            if key not in _clients:
+                get_chat_client(model_name, temperature, max_output_tokens)
+                _pool_stats["borrows"] -= 1  # Prewarming is not a borrow
+    return time.perf_counter() - started
+
+
+def client_pool_stats() -> Dict:
+    return {
+        "clients": len(_clients),
+        "clients_created": _pool_stats["clients_created"],
+        "borrows": _pool_stats["borrows"],
+        "client_init_seconds": round(_pool_stats["client_init_seconds"], 4),
+    }
+
+
+def create_llm(config, agent_name: str, temperature: Optional[float] = None,
+               max_output_tokens: Optional[int] = None, model_name: Optional[str] = None):
+    """Build the chat model an agent talks to, according to ``config.llm_backend``.
+
+    "gemini" calls the live API, "replay" answers from ``config.cassette_path``
+    without network access, and "record" calls the live API while appending
+    every exchange to ``config.recording_path``. Live clients come from the
+    shared pool; model_name/temperature/max_output_tokens override the config
+    defaults (replay ignores the model, answering by agent and prompt).
+    """
+    if config.llm_backend == "replay":
+        return ReplayChatModel(
+            get_cassette(config.cassette_path),
+            agent_name,
+            latency=LatencyModel.parse(config.replay_latency)
+        )
+
+    if config.llm_backend not in ("gemini", "record"):
+        raise ValueError(f"Unknown llm_backend: {config.llm_backend}")
+    llm = get_chat_client(
+        config.model_name if model_name is None else model_name,
+        config.temperature if temperature is None else temperature,
+        config.max_tokens_per_prompt if max_output_tokens is None else max_output_tokens
+    )
+    if config.llm_backend == "record":
+        return RecordingChatModel(llm, config.recording_path, agent_name)
+    return llm
@@ -0,0 +1,176 @@
+import asyncio
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+
+class ResponseCache:
+    """On-disk, content-addressed cache of LLM responses with LRU eviction.
+
+    Entries live in ``<cache_dir>/<hash[:2]>/<hash>.json``. Access order is kept
+    in memory and mirrored to file mtimes, so the LRU order survives restarts.
+    Identical prompts that are in flight at the same time are coalesced onto a
+    single backend call.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = 64 * 1024 * 1024,
+                 deterministic_only: bool = False):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.deterministic_only = deterministic_only
+
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+        # key -> entry size in bytes, least recently used first
+        self._index: "OrderedDict[str, int]" = OrderedDict()
+        self._total_bytes = 0
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._load_index()
+
+    @staticmethod
+    def make_key(model_name: str, temperature: float, max_output_tokens: int, prompt: str) -> str:
+        """Content address of a request."""
+        payload = json.dumps([model_name, temperature, max_output_tokens, prompt], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def is_cacheable(self, temperature: float) -> bool:
+        """With the deterministic-only policy, sampled (temperature > 0) calls bypass the cache."""
+        return not self.deterministic_only or temperature == 0
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for ``key`` and mark it recently used."""
+        if key not in self._index:
+            return None
+        path = self._path(key)
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+            os.utime(path)
+        except (OSError, ValueError):
+            self._drop(key)
+            return None
+        self._index.move_to_end(key)
+        return entry.get("response")
+
+    def put(self, key: str, response: str, **meta) -> None:
+        """Store a response, evicting least recently used entries past ``max_bytes``."""
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = json.dumps({"key": key, **meta, "response": response}, ensure_ascii=False)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(data, encoding="utf-8")
+        os.replace(tmp_path, path)
+
+        size = path.stat().st_size
+        self._total_bytes += size - self._index.get(key, 0)
+        self._index[key] = size
+        self._index.move_to_end(key)
+        self._evict()
+
+    async def get_or_generate(self, key: str, generate: Callable[[], Awaitable[str]],
+                              store: Optional[Callable[[str], None]] = None,
+                              **meta) -> Tuple[str, bool]:
+        """Return ``(response, from_cache)``, calling ``generate`` at most once per key in flight.
+
+        A fresh response is stored under ``key`` with ``meta``, or handed to
+        ``store`` instead when the caller files it under another key.
+        """
+        cached = self.get(key)
+        if cached is not None:
+            self.hits += 1
+            return cached, True
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.coalesced += 1
+            result = await asyncio.shield(pending)
+            if result is not None:
+                return result, True
+            # The leading call failed; try on our own rather than sharing its error
+            return await generate(), False
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        response = None
+        try:
+            response = await generate()
+            if response:
+                try:
+                    if store is None:
+                        self.put(key, response, **meta)
+                    else:
+                        store(response)
+                except OSError as e:
+                    # The response is still good; it just won't be cached
+                    print(f"Warning: could not write response cache entry {key[:12]}: {e}")
+        finally:
+            # Always release coalesced waiters (None sends them to generate on their own)
+            self._inflight.pop(key, None)
+            if not future.done():
+                future.set_result(response or None)
+        return response, False
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "entries": len(self._index),
+            "bytes": self._total_bytes,
+        }
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def _load_index(self) -> None:
+        entries = []
+        for path in self.cache_dir.glob("*/*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, path.stem, stat.st_size))
+        for _, key, size in sorted(entries):
+            self._index[key] = size
+            self._total_bytes += size
+        self._evict()
+
+    def _drop(self, key: str) -> None:
+        self._total_bytes -= self._index.pop(key, 0)
+        try:
+            self._path(key).unlink()
+        except OSError:
+            pass
+
+    def _evict(self) -> None:
+        while self._total_bytes > self.max_bytes and len(self._index) > 1:
+            oldest = next(iter(self._index))
+            self._drop(oldest)
+            self.evictions += 1
+
+
+_caches: Dict[str, ResponseCache] = {}
+
+
+def get_response_cache(config) -> Optional[ResponseCache]:
+    """Return the process-wide cache for ``config.cache_dir``, or None when caching is off."""
+    if not config.cache_dir:
+        return None
+    cache_dir = str(Path(config.cache_dir).resolve())
+    if cache_dir not in _caches:
+        _caches[cache_dir] = ResponseCache(
+            cache_dir,
+            max_bytes=config.cache_max_bytes,
+            deterministic_only=config.cache_deterministic_only,
+        )
+    return _caches[cache_dir]
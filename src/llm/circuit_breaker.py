@@ -0,0 +1,100 @@
+import time
+from collections import deque
+from typing import Dict, Optional, Tuple
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Per-model breaker over a sliding window of recent call outcomes.
+
+    A call fails if it raised, or took longer than latency_threshold seconds.
+    The breaker opens once at least min_calls outcomes are in the window and the
+    failure rate reaches error_threshold; calls then skip the model. After
+    cooldown seconds it goes half-open and lets a single probe through: success
+    closes it again (with a fresh window), failure re-opens it.
+
+    Methods that change state return a transition record, else None.
+    """
+
+    def __init__(self, model: str, error_threshold: float = 0.5, latency_threshold: Optional[float] = None,
+                 window: int = 20, min_calls: int = 5, cooldown: float = 30.0):
+        self.model = model
+        self.error_threshold = error_threshold
+        self.latency_threshold = latency_threshold
+        self.min_calls = min_calls
+        self.cooldown = cooldown
+        self.state = CLOSED
+        self._outcomes = deque(maxlen=window)  # True = failed
+        self._opened_at = 0.0
+        self._probing = False
+
+    def allow(self) -> Tuple[bool, Optional[Dict]]:
+        """Whether a call may use this model now, and the transition this caused (if any)."""
+        if self.state == CLOSED:
+            return True, None
+        if self.state == OPEN:
+            if time.monotonic() - self._opened_at < self.cooldown:
+                return False, None
+            transition = self._move(HALF_OPEN, "cooldown elapsed")
+            self._probing = True
+            return True, transition
+        # Half-open: only one probe at a time
+        if self._probing:
+            return False, None
+        self._probing = True
+        return True, None
+
+    def record(self, ok: bool, latency: Optional[float] = None) -> Optional[Dict]:
+        """Record the outcome of a call that allow() let through."""
+        slow = ok and self.latency_threshold is not None and latency is not None and latency > self.latency_threshold
+        failed = not ok or slow
+        reason = "slow probe" if slow else "probe failed"
+        if self.state == HALF_OPEN:
+            self._probing = False
+            if failed:
+                return self._move(OPEN, reason)
+            self._outcomes.clear()
+            return self._move(CLOSED, "probe succeeded")
+
+        self._outcomes.append(failed)
+        if self.state == CLOSED and len(self._outcomes) >= self.min_calls:
+            rate = sum(self._outcomes) / len(self._outcomes)
+            if rate >= self.error_threshold:
+                return self._move(OPEN, f"failure rate {rate:.2f} over last {len(self._outcomes)} calls")
+        return None
+
+    def release(self) -> None:
+        """A call that allow() let through was cancelled without an outcome."""
+        if self.state == HALF_OPEN:
+            self._probing = False
+
+    def _move(self, state: str, reason: str) -> Dict:
+        transition = {"model": self.model, "from": self.state, "to": state, "reason": reason, "at": time.time()}
+        self.state = state
+        if state == OPEN:
+            self._opened_at = time.monotonic()
+        return transition
+
+
+# Breakers are per model and process-wide: every agent and story sees the same health
+_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def get_breaker(model: str, config) -> CircuitBreaker:
+    if model not in _breakers:
+        _breakers[model] = CircuitBreaker(
+            model,
+            error_threshold=config.breaker_error_threshold,
+            latency_threshold=config.breaker_latency_threshold,
+            window=config.breaker_window,
+            min_calls=config.breaker_min_calls,
+            cooldown=config.breaker_cooldown
+        )
+    return _breakers[model]
+
+
+def breaker_states() -> Dict[str, str]:
+    return {model: breaker.state for model, breaker in sorted(_breakers.items())}
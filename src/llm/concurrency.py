@@ -0,0 +1,22 @@
+import asyncio
+import weakref
+from typing import Dict, Optional
+
+# Per event loop: a semaphore is bound to the loop it is first used on, so a
+# later asyncio.run() in the same process needs its own
+_call_slots: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[int, asyncio.Semaphore]]" = \
+    weakref.WeakKeyDictionary()
+
+
+def get_call_slots(limit: Optional[int]) -> Optional[asyncio.Semaphore]:
+    """Semaphore capping in-flight LLM calls across all agents and stories on the running loop.
+
+    Agents configured with the same limit share one semaphore; None means unlimited.
+    Must be called from a coroutine.
+    """
+    if not limit:
+        return None
+    slots = _call_slots.setdefault(asyncio.get_running_loop(), {})
+    if limit not in slots:
+        slots[limit] = asyncio.Semaphore(limit)
+    return slots[limit]
@@ -0,0 +1,31 @@
+from collections import defaultdict, deque
+from typing import Deque, Dict, Optional
+
+
+class LatencyTracker:
+    """Sliding window of recent call latencies per call type, shared across agents and stories."""
+
+    def __init__(self, window: int = 500):
+        self.window = window
+        self._samples: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=self.window))
+
+    def record(self, call_type: str, seconds: float) -> None:
+        self._samples[call_type].append(seconds)
+
+    def clear(self) -> None:
+        self._samples.clear()
+
+    def percentile(self, call_type: str, q: float, min_samples: int = 1) -> Optional[float]:
+        """The q-quantile (0-1) of recent latencies, or None until min_samples calls were seen."""
+        samples = self._samples.get(call_type)
+        if not samples or len(samples) < max(1, min_samples):
+            return None
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+_tracker = LatencyTracker()
+
+
+def get_latency_tracker() -> LatencyTracker:
+    return _tracker
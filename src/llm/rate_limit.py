@@ -0,0 +1,79 @@
+import time
+import asyncio
+from typing import Dict, Optional, Tuple
+
+
+class TokenBucket:
+    """Continuously refilling budget of `per_minute` units.
+
+    reserve() deducts immediately (the balance may go negative) and returns how
+    long the caller must wait for its share, so concurrent callers queue up in
+    arrival order without a lock.
+    """
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.available = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.available = min(self.capacity, self.available + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, amount: float) -> float:
+        self._refill()
+        self.available -= min(amount, self.capacity)
+        return max(0.0, -self.available / self.rate)
+
+    def refund(self, amount: float) -> None:
+        self._refill()
+        self.available = min(self.capacity, self.available + amount)
+
+
+class RateLimiter:
+    """Requests-per-minute and tokens-per-minute quota shared by every agent and story.
+
+    A rate-limit response from the API pauses all callers until its retry-after
+    hint has passed, not just the one that was rejected.
+    """
+
+    def __init__(self, requests_per_minute: Optional[int], tokens_per_minute: Optional[int]):
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self._paused_until = 0.0
+
+    async def acquire(self, tokens: int) -> float:
+        """Wait for one request slot and `tokens` of token budget; returns the seconds waited."""
+        started = time.monotonic()
+        wait = max(0.0, self._paused_until - started)
+        if self.requests is not None:
+            wait = max(wait, self.requests.reserve(1))
+        if self.tokens is not None:
+            wait = max(wait, self.tokens.reserve(tokens))
+        if wait <= 0:
+            return 0.0
+        await asyncio.sleep(wait)
+        return time.monotonic() - started
+
+    def refund(self, tokens: int) -> None:
+        """Return token budget reserved for output that was never generated."""
+        if self.tokens is not None and tokens > 0:
+            self.tokens.refund(tokens)
+
+    def pause(self, seconds: float) -> None:
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+
+_limiters: Dict[Tuple[Optional[int], Optional[int]], RateLimiter] = {}
+
+
+def get_rate_limiter(requests_per_minute: Optional[int], tokens_per_minute: Optional[int]) -> Optional[RateLimiter]:
+    """Process-wide limiter for a quota; None when neither limit is set."""
+    if not requests_per_minute and not tokens_per_minute:
+        return None
+    key = (requests_per_minute, tokens_per_minute)
+    if key not in _limiters:
+        _limiters[key] = RateLimiter(requests_per_minute, tokens_per_minute)
+    return _limiters[key]
@@ -0,0 +1,187 @@
+import asyncio
+import hashlib
+import json
+import random
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+from langchain_core.messages import AIMessage, AIMessageChunk
+
+
+def prompt_hash(prompt: str) -> str:
+    return hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+
+
+def _prompt_text(messages) -> str:
+    """Extract the prompt text from the message list BaseAgent sends."""
+    last = messages[-1]
+    if isinstance(last, tuple):
+        return last[1]
+    return getattr(last, "content", str(last))
+
+
+class Cassette:
+    """Recorded prompt/response pairs, as written to prompts_log.json or a JSONL file.
+
+    Responses are indexed both by prompt hash (exact replay) and by agent name
+    in recording order (fallback when the prompt has drifted).
+    """
+
+    def __init__(self, entries: List[Dict]):
+        self.by_hash: Dict[str, List[str]] = {}
+        self.by_agent: Dict[str, List[str]] = {}
+        for entry in entries:
+            response = entry.get("response")
+            if response is None:
+                continue
+            self.by_hash.setdefault(prompt_hash(entry["prompt"]), []).append(response)
+            self.by_agent.setdefault(entry["agent"], []).append(response)
+        if not self.by_agent:
+            raise ValueError("Cassette contains no recorded responses")
+
+    @classmethod
+    def load(cls, path: str) -> "Cassette":
+        return cls(load_entries(path))
+
+
+def load_entries(path: str) -> List[Dict]:
+    """Read logged calls from a JSON list (prompts_log.json), one entry per line (.jsonl) or a prompt log store directory."""
+    if Path(path).is_dir():
+        from ..prompt_log import PromptLogStore
+        return list(PromptLogStore(path).iter_entries())
+    text = Path(path).read_text(encoding="utf-8")
+    if text.lstrip().startswith("["):
+        return json.loads(text)
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+
+class LatencyModel:
+    """Injected per-call delay, parsed from "fixed:S", "uniform:LO,HI" or "lognormal:MU,SIGMA" (seconds)."""
+
+    def __init__(self, kind: str, params: List[float], seed: Optional[int] = None):
+        if kind not in ("fixed", "uniform", "lognormal"):
+            raise ValueError(f"Unknown latency distribution: {kind}")
+        self.kind = kind
+        self.params = params
+        self.rng = random.Random(seed)
+
+    @classmethod
+    def parse(cls, spec: Optional[str], seed: Optional[int] = None) -> Optional["LatencyModel"]:
+        if not spec:
+            return None
+        kind, _, args = spec.partition(":")
+        params = [float(a) for a in args.split(",") if a.strip()]
+        return cls(kind.strip(), params, seed)
+
+    def sample(self) -> float:
+        if self.kind == "fixed":
+            return self.params[0]
+        if self.kind == "uniform":
+            return self.rng.uniform(self.params[0], self.params[1])
+        return self.rng.lognormvariate(self.params[0], self.params[1])
+
+
+STREAM_CHUNK_CHARS = 16
+
+
+class ReplayChatModel:
+    """Drop-in replacement for the chat model that answers from a cassette.
+
+    Exact prompt matches are served first; otherwise the agent's recorded
+    responses are replayed in order, wrapping around when exhausted.
+    """
+
+    def __init__(self, cassette: Cassette, agent_name: str,
+                 latency: Optional[LatencyModel] = None):
+        self.cassette = cassette
+        self.agent_name = agent_name
+        self.latency = latency
+        self._hash_cursors: Dict[str, int] = {}
+        self._sequence_cursor = 0
+        self.exact_hits = 0
+        self.sequence_hits = 0
+
+    def next_response(self, prompt: str) -> str:
+        key = prompt_hash(prompt)
+        recorded = self.cassette.by_hash.get(key)
+        if recorded:
+            cursor = self._hash_cursors.get(key, 0)
+            self._hash_cursors[key] = cursor + 1
+            self.exact_hits += 1
+            return recorded[cursor % len(recorded)]
+
+        sequence = self.cassette.by_agent.get(self.agent_name)
+        if not sequence:
+            raise LookupError(f"No recorded responses for agent '{self.agent_name}'")
+        response = sequence[self._sequence_cursor % len(sequence)]
+        self._sequence_cursor += 1
+        self.sequence_hits += 1
+        return response
+
+    async def ainvoke(self, messages, **kwargs) -> AIMessage:
+        response = self.next_response(_prompt_text(messages))
+        if self.latency is not None:
+            await asyncio.sleep(self.latency.sample())
+        return AIMessage(content=response)
+
+    async def astream(self, messages, **kwargs):
+        """Yield the recorded response in small chunks; the sampled latency is time-to-first-chunk."""
+        response = self.next_response(_prompt_text(messages))
+        if self.latency is not None:
+            await asyncio.sleep(self.latency.sample())
+        for start in range(0, len(response), STREAM_CHUNK_CHARS):
+            yield AIMessageChunk(content=response[start:start + STREAM_CHUNK_CHARS])
+            await asyncio.sleep(0)
+
+
+class RecordingChatModel:
+    """Wraps a live chat model and appends every exchange to a JSONL cassette."""
+
+    def __init__(self, llm, cassette_path: str, agent_name: str):
+        # Appending JSONL lines to a JSON-array cassette such as prompts_log.json would corrupt it
+        if Path(cassette_path).suffix != ".jsonl":
+            raise ValueError(f"Recording cassette must be a .jsonl file, got {cassette_path}")
+        self.llm = llm
+        self.cassette_path = Path(cassette_path)
+        self.agent_name = agent_name
+
+    async def ainvoke(self, messages, **kwargs):
+        response = await self.llm.ainvoke(messages, **kwargs)
+        entry = {
+            "timestamp": datetime.now().isoformat(),
+            "agent": self.agent_name,
+            "prompt": _prompt_text(messages),
+            "response": response.content
+        }
+        self._append(entry)
+        return response
+
+    async def astream(self, messages, **kwargs):
+        text = ""
+        try:
+            async for chunk in self.llm.astream(messages, **kwargs):
+                text += chunk.content
+                yield chunk
+        finally:
+            # Record whatever arrived, even if the consumer stopped the stream early
+            self._append({
+                "timestamp": datetime.now().isoformat(),
+                "agent": self.agent_name,
+                "prompt": _prompt_text(messages),
+                "response": text
+            })
+
+    def _append(self, entry: Dict):
+        with self.cassette_path.open("a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+
+_cassettes: Dict[str, Cassette] = {}
+
+
+def get_cassette(path: str) -> Cassette:
+    """Load a cassette once per process; replaying agents share the parsed index."""
+    key = str(Path(path).resolve())
+    if key not in _cassettes:
+        _cassettes[key] = Cassette.load(path)
+    return _cassettes[key]
@@ -0,0 +1,81 @@
+import asyncio
+import random
+import re
+from typing import Optional
+
+RATE_LIMITED = "rate_limited"  # 429 / RESOURCE_EXHAUSTED: back off, honouring retry-after
+TRANSIENT = "transient"        # 5xx, timeouts, dropped connections: back off and retry
+FATAL = "fatal"                # Bad request, auth, unknown model: retrying cannot help
+
+_TRANSIENT_CODES = {408, 500, 502, 503, 504}
+_TRANSIENT_NAMES = ("Timeout", "ConnectError", "ConnectionError", "RemoteProtocolError", "ReadError",
+                    "ServerError", "ServiceUnavailable")
+_RETRY_AFTER_PATTERN = re.compile(r"retry(?:[ _-]?after|Delay| in)[\"':= ]*(\d+(?:\.\d+)?)\s*s", re.IGNORECASE)
+
+
+def _error_chain(error: BaseException):
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        yield error
+        error = error.__cause__ or error.__context__
+
+
+def _status_code(error: BaseException) -> Optional[int]:
+    for attr in ("code", "status_code", "status"):
+        value = getattr(error, attr, None)
+        if isinstance(value, int):
+            return value
+    response = getattr(error, "response", None)
+    value = getattr(response, "status_code", None)
+    return value if isinstance(value, int) else None
+
+
+def classify_error(error: BaseException) -> str:
+    """Sort an LLM call failure into RATE_LIMITED, TRANSIENT or FATAL."""
+    for err in _error_chain(error):
+        code = _status_code(err)
+        if code == 429:
+            return RATE_LIMITED
+        if code in _TRANSIENT_CODES:
+            return TRANSIENT
+        if isinstance(err, (asyncio.TimeoutError, ConnectionError)):
+            return TRANSIENT
+        if type(err).__name__ == "GoogleRateLimitError":
+            return RATE_LIMITED
+        if any(name in type(err).__name__ for name in _TRANSIENT_NAMES):
+            return TRANSIENT
+
+    message = str(error)
+    if re.search(r"\b429\b", message) or "RESOURCE_EXHAUSTED" in message or "rate limit" in message.lower():
+        return RATE_LIMITED
+    if any(marker in message for marker in ("UNAVAILABLE", "INTERNAL", "DEADLINE_EXCEEDED")):
+        return TRANSIENT
+    return FATAL
+
+
+def retry_after_seconds(error: BaseException) -> Optional[float]:
+    """The server's retry-after hint, from a Retry-After header or a retryDelay in the message."""
+    for err in _error_chain(error):
+        response = getattr(err, "response", None)
+        headers = getattr(response, "headers", None)
+        if headers is not None:
+            value = headers.get("retry-after") or headers.get("Retry-After")
+            try:
+                if value is not None:
+                    return float(value)
+            except ValueError:
+                pass
+        match = _RETRY_AFTER_PATTERN.search(str(err))
+        if match:
+            return float(match.group(1))
+    return None
+
+
+def backoff_delay(attempt: int, base: float, cap: float, retry_after: Optional[float] = None,
+                  rng: random.Random = random) -> float:
+    """Exponential backoff with full jitter, never shorter than the server's hint."""
+    delay = rng.uniform(0, min(cap, base * (2 ** attempt)))
+    if retry_after is not None:
+        delay = max(delay, retry_after)
+    return delay
@@ -1,8 +1,12 @@
+import argparse
 import asyncio
 import json
 import sys
 import os
+import time
+import uuid
 from pathlib import Path
+from typing import Optional
 
 current_dir = Path(__file__).parent
 project_root = current_dir.parent
@@ -13,38 +17,175 @@ from src.config import StoryConfig
 from src.agents.character_agent import CharacterAgent
 from src.agents.director_agent import DirectorAgent
 from src.graph.narrative_graph import NarrativeGraph
+from src.graph.checkpoints import get_checkpoint_store
+from src.llm.circuit_breaker import breaker_states
 from src.story_state import StoryStateManager
+from src.event_sink import EventSink, read_records
+from src.prompt_log import PromptLogStore
 
-async def main():
-    # Load seed story from examples
-    # Assuming examples is in project root
-    examples_dir = project_root / "examples" / "rickshaw_accident"
+def load_scenario(scenario_dir: Path):
+    """Load the seed story and character configs from a scenario directory."""
+    seed_story = json.loads((scenario_dir / "seed_story.json").read_text())
+    char_configs = json.loads((scenario_dir / "character_configs.json").read_text())
+    return seed_story, char_configs
+
+async def run_story(seed_story: dict, char_configs: dict, config: StoryConfig,
+                    output_dir: Path, run_id: Optional[str] = None) -> dict:
+    """Run one story end to end and write its story output and prompt log to output_dir.
+    
+    Events are appended to story_events.jsonl as they happen; story_output.json is
+    generated from that log at the end when config.write_legacy_output is set.
+    With config.checkpoint_path set, the run is checkpointed under run_id (generated
+    if not given) and can be continued with resume_story().
+    Returns the final state together with the number of LLM calls made and the
+    wall-clock time taken.
+    """
+    if config.checkpoint_path is not None and run_id is None:
+        run_id = uuid.uuid4().hex[:12]
     
-    seed_story = json.loads((examples_dir / "seed_story.json").read_text())
+    # Initialize StoryStateManager to prepare initial state properly
+    story_manager = StoryStateManager(seed_story, char_configs["characters"], config)
     
-    # Load character configs
-    char_configs = json.loads((examples_dir / "character_configs.json").read_text())
+    return await _execute_story(
+        seed_story,
+        [char["name"] for char in char_configs["characters"]],
+        config,
+        output_dir,
+        run_id,
+        # Run the game with the prepared character states
+        lambda story_graph: story_graph.run(
+            seed_story=seed_story, 
+            character_profiles=story_manager.state.character_profiles,
+            run_id=run_id
+        ),
+        fresh=True
+    )
+
+async def resume_story(run_id: str, config: StoryConfig, output_dir: Path) -> dict:
+    """Continue a checkpointed run from its last completed node, writing into output_dir."""
+    checkpoints = get_checkpoint_store(config.checkpoint_path)
+    inputs = checkpoints.run_inputs(run_id) if checkpoints is not None else None
+    if inputs is None:
+        raise ValueError(f"No checkpointed run with id '{run_id}' in {config.checkpoint_path}")
     
-    # Initialize config
-    config = StoryConfig()
+    return await _execute_story(
+        inputs["seed_story"],
+        list(inputs["character_profiles"].keys()),
+        config,
+        output_dir,
+        run_id,
+        lambda story_graph: story_graph.resume(run_id),
+        # Keep the calls logged before the interruption
+        fresh=False
+    )
+
+async def _execute_story(seed_story: dict, character_names: list, config: StoryConfig,
+                         output_dir: Path, run_id: Optional[str], start, fresh: bool) -> dict:
+    started = time.perf_counter()
+    
+    # Every LLM call is spilled to a deduplicated on-disk log as it happens
+    prompt_log = PromptLogStore(output_dir / "prompt_log", fresh=fresh)
     
     # Create character agents
     characters = [
         CharacterAgent(
-            name=char["name"],
-            config=config
+            name=name,
+            config=config,
+            prompt_log=prompt_log
         )
-        for char in char_configs["characters"]
+        for name in character_names
     ]
     
     # Create director
-    director = DirectorAgent(config)
+    director = DirectorAgent(config, prompt_log=prompt_log)
     
-    # Initialize StoryStateManager to prepare initial state properly
-    story_manager = StoryStateManager(seed_story, char_configs["characters"], config)
+    # Events stream to disk as the story runs, so a crash keeps everything up to that point
+    output_dir.mkdir(parents=True, exist_ok=True)
+    events_path = output_dir / "story_events.jsonl"
+    event_sink = EventSink(events_path, config.event_sink_batch_size, config.event_sink_fsync_seconds)
+    event_sink.write_header(seed_story.get("title"), seed_story)
     
     # Build and run narrative graph
-    story_graph = NarrativeGraph(config, characters, director)
+    story_graph = NarrativeGraph(config, characters, director, event_sink=event_sink)
+    
+    try:
+        final_state = await start(story_graph)
+    except BaseException:
+        event_sink.close()
+        prompt_log.close()
+        raise
+    elapsed = time.perf_counter() - started
+
+    # Write the metadata footer (and story_output.json from the event log)
+    metadata = {
+        "total_turns": final_state["current_turn"],
+        "total_actions": len(final_state.get("action_history", [])),
+        "conclusion_reason": final_state.get("conclusion_reason"),
+        "characters": character_names,
+        "metrics": story_graph.metrics.to_dict()
+    }
+    if director.cache is not None:
+        metadata["cache"] = director.cache.stats()
+    if config.turn_slo_seconds is not None:
+        counters = metadata["metrics"]["counters"]
+        turns = counters.get("slo_turns", 0)
+        metadata["slo"] = {
+            "turn_slo_seconds": config.turn_slo_seconds,
+            "turns": turns,
+            "met": counters.get("slo_turns_met", 0),
+            "degraded": counters.get("slo_turns_degraded", 0),
+            "missed": counters.get("slo_turns_missed", 0),
+            "attainment": round(counters.get("slo_turns_met", 0) / turns, 4) if turns else None
+        }
+    if config.fallback_models:
+        chain = [config.model_name, *config.fallback_models]
+        counters = metadata["metrics"]["counters"]
+        metadata["models"] = {
+            "chain": chain,
+            "calls": {model: counters.get(f"llm_model_calls_{model}", 0) for model in chain},
+            "breaker_states": {model: state for model, state in breaker_states().items() if model in chain}
+        }
+    
+    output_path = output_dir / "story_output.json" if config.write_legacy_output else None
+    event_sink.finalize(metadata, legacy_path=output_path)
+
+    # Save prompts: merge the per-agent logs by timestamp and expand the prompts
+    prompts_path = output_dir / "prompts_log.json"
+    logged = prompt_log.export_json(prompts_path)
+    prompt_log.close()
+
+    return {
+        "run_id": run_id,
+        "final_state": final_state,
+        "output_path": output_path,
+        "events_path": events_path,
+        "prompts_path": prompts_path,
+        "llm_calls": logged["llm_calls"],
+        "cached_replies": logged["cached_replies"],
+        "elapsed": elapsed,
+        "cache_stats": director.cache.stats() if director.cache is not None else None
+    }
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run the rickshaw accident story.")
+    parser.add_argument("--checkpoint-db",
+                        help="SQLite file for per-node checkpoints (enables --resume)")
+    parser.add_argument("--resume", metavar="RUN_ID",
+                        help="Continue an interrupted run from its last checkpoint")
+    return parser.parse_args(argv)
+
+async def main(argv=None):
+    args = parse_args(argv)
+    
+    # Load seed story from examples
+    # Assuming examples is in project root
+    examples_dir = project_root / "examples" / "rickshaw_accident"
+    seed_story, char_configs = load_scenario(examples_dir)
+    
+    # Initialize config
+    config = StoryConfig(checkpoint_path=args.checkpoint_db)
+    if args.resume and config.checkpoint_path is None:
+        raise SystemExit("--resume needs --checkpoint-db")
     
     print("=" * 70)
     print("STARTING MULTI-AGENT NARRATIVE SYSTEM")
@@ -56,18 +197,19 @@ async def main():
     print(f"Required Actions: 5 minimum")
     print("=" * 70 + "\n")
     
-    # Run the game with the prepared character states
-    final_state = await story_graph.run(
-        seed_story=seed_story, 
-        character_profiles=story_manager.state.character_profiles
-    )
+    if args.resume:
+        result = await resume_story(args.resume, config, project_root)
+    else:
+        result = await run_story(seed_story, char_configs, config, project_root)
+    final_state = result["final_state"]
     
     # Print results
     print("\n" + "=" * 70)
     print("STORY TRANSCRIPT")
     print("=" * 70 + "\n")
     
-    for event in final_state["events"]:
+    # The state only keeps the latest events; the full story is in the event log
+    for event in read_records(result["events_path"]):
         event_type = event.get("type")
         turn = event.get("turn")
         
@@ -90,43 +232,12 @@ async def main():
     print(f"Conclusion: {final_state.get('conclusion_reason')}")
     print("=" * 70 + "\n")
 
-    # Save to JSON
-    output_path = project_root / "story_output.json"
-    output_data = {
-        "title": seed_story.get("title"),
-        "seed_story": seed_story,
-        "events": final_state.get("events", []),
-        "metadata": {
-            "total_turns": final_state["current_turn"],
-            "total_actions": len(final_state.get("action_history", [])),
-            "conclusion_reason": final_state.get("conclusion_reason"),
-            "characters": [c["name"] for c in char_configs["characters"]]
-        }
-    }
-    
-    output_path.write_text(json.dumps(output_data, indent=2, default=str))
-    print(f"Story saved to {output_path}")
-
-    # Save prompts
-    all_logs = []
-    
-    # Director logs
-    for log in director.logs:
-        log["role"] = "Director"
-        all_logs.append(log)
-        
-    # Character logs
-    for char in characters:
-        for log in char.logs:
-            log["role"] = f"Character ({char.name})"
-            all_logs.append(log)
-            
-    # Sort by timestamp
-    all_logs.sort(key=lambda x: x["timestamp"])
-    
-    prompts_path = project_root / "prompts_log.json"
-    prompts_path.write_text(json.dumps(all_logs, indent=2, default=str))
-    print(f"Prompts saved to {prompts_path}")
+    if result["cache_stats"] is not None:
+        print(f"Response cache: {result['cache_stats']}")
+    print(f"Story saved to {result['output_path']}")
+    print(f"Prompts saved to {result['prompts_path']}")
+    if result["run_id"] is not None:
+        print(f"Run id: {result['run_id']} (checkpoints in {config.checkpoint_path})")
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -0,0 +1,79 @@
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+
+class RunMetrics:
+    """Counters, timings and notable events collected over a single story run."""
+
+    def __init__(self):
+        self.counters: Dict[str, int] = defaultdict(int)
+        self.timings: Dict[str, List[float]] = defaultdict(list)
+        self.events: Dict[str, List[Dict]] = defaultdict(list)
+
+    def incr(self, name: str, amount: int = 1) -> None:
+        self.counters[name] += amount
+
+    def observe(self, name: str, seconds: float) -> None:
+        self.timings[name].append(seconds)
+
+    def record(self, name: str, event: Dict) -> None:
+        self.events[name].append(event)
+
+    def merge(self, other: "RunMetrics") -> None:
+        """Add another collector's counters, timings and events into this one."""
+        for name, value in other.counters.items():
+            self.counters[name] += value
+        for name, values in other.timings.items():
+            self.timings[name].extend(values)
+        for name, events in other.events.items():
+            self.events[name].extend(events)
+
+    def sizes(self) -> Dict[str, Dict[str, int]]:
+        """How many timings and events have been collected so far, per name."""
+        return {
+            "timings": {name: len(values) for name, values in self.timings.items()},
+            "events": {name: len(events) for name, events in self.events.items()}
+        }
+
+    def snapshot(self, since: Optional[Dict[str, Dict[str, int]]] = None) -> Dict:
+        """Raw state as plain JSON data (restored with restore()).
+
+        With `since` (an earlier sizes()), timings and events hold only what was
+        added after it; restoring such snapshots in order rebuilds the whole run.
+        """
+        since = since or {"timings": {}, "events": {}}
+        return {
+            "counters": dict(self.counters),
+            "timings": {name: values[since["timings"].get(name, 0):] for name, values in self.timings.items()
+                        if len(values) > since["timings"].get(name, 0)},
+            "events": {name: events[since["events"].get(name, 0):] for name, events in self.events.items()
+                       if len(events) > since["events"].get(name, 0)}
+        }
+
+    def restore(self, snapshot: Dict) -> None:
+        self.counters.update(snapshot["counters"])
+        for name, values in snapshot["timings"].items():
+            self.timings[name].extend(values)
+        for name, events in snapshot.get("events", {}).items():
+            self.events[name].extend(events)
+
+    def to_dict(self) -> Dict:
+        timings = {}
+        for name, values in sorted(self.timings.items()):
+            ordered = sorted(values)
+            timings[name] = {
+                "count": len(ordered),
+                "total": round(sum(ordered), 4),
+                "mean": round(sum(ordered) / len(ordered), 4),
+                "p50": round(ordered[len(ordered) // 2], 4),
+                "p95": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 4),
+                "p99": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))], 4),
+                "max": round(ordered[-1], 4),
+            }
+        result = {"counters": dict(sorted(self.counters.items())), "timings": timings}
+        if self.events:
+            result["events"] = {
+                name: sorted(events, key=lambda event: event.get("at", 0))
+                for name, events in sorted(self.events.items())
+            }
+        return result
@@ -0,0 +1,124 @@
+import heapq
+from bisect import bisect_left
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from pydantic import BaseModel, Field
+
+
+class Observation(BaseModel):
+    text: str  # As seen by others, e.g. "Saleem performed action: ..."
+    actor: Optional[str] = None
+    own_text: Optional[str] = None  # As seen by the actor, e.g. "I performed action: ..."
+
+
+class ObservationLog(BaseModel):
+    """Append-only log of everything characters observe, shared by the whole cast.
+
+    Instead of copying each observation into every witness's memory, an entry
+    is stored once with its visibility:
+      - public: seen by whoever is present in the scene when it is recorded.
+        Presence is kept as enter/leave positions in the log per character, so
+        recording costs the same with 4 characters or 400.
+      - private: seen only by the listed audience (e.g. a GIVE/SHOW notice to
+        its target, or a character's own lines).
+
+    A character's view (memory "observations") is derived lazily from the
+    public positions inside their presence intervals merged with their private
+    entries. Consumers that follow a view incrementally keep a cursor (a log
+    position) and ask for what is new with since().
+    """
+
+    entries: List[Observation] = Field(default_factory=list)
+    public: List[int] = Field(default_factory=list)  # Positions of public entries, increasing
+    private: Dict[str, List[int]] = Field(default_factory=dict)  # Per character, increasing
+    # Per character: [enter, leave, enter, ...] log positions; an odd length means present now
+    presence: Dict[str, List[int]] = Field(default_factory=dict)
+
+    def enter(self, name: str) -> None:
+        """`name` (re)joins the scene and sees public entries from now on."""
+        intervals = self.presence.setdefault(name, [])
+        if len(intervals) % 2 == 0:
+            intervals.append(len(self.entries))
+
+    def leave(self, name: str) -> None:
+        intervals = self.presence.get(name)
+        if intervals and len(intervals) % 2 == 1:
+            intervals.append(len(self.entries))
+
+    def is_present(self, name: str) -> bool:
+        return len(self.presence.get(name, ())) % 2 == 1
+
+    def record(self, text: str, actor: Optional[str] = None, own_text: Optional[str] = None,
+               audience: Optional[Iterable[str]] = None) -> None:
+        """Append an observation: public when audience is None, otherwise private to audience.
+
+        own_text is what the actor sees instead of text (the actor always sees their own entries).
+        """
+        position = len(self.entries)
+        self.entries.append(Observation(text=text, actor=actor, own_text=own_text))
+        if audience is None:
+            self.public.append(position)
+            if actor is not None and not self.is_present(actor):
+                self.private.setdefault(actor, []).append(position)
+            return
+        viewers = set(audience)
+        if actor is not None:
+            viewers.add(actor)
+        for name in viewers:
+            self.private.setdefault(name, []).append(position)
+
+    def note(self, name: str, text: str) -> None:
+        """A private observation only `name` sees."""
+        self.record(text, audience=(name,))
+
+    def _public_slices(self, name: str, start: int = 0) -> List[Tuple[int, int]]:
+        """Index ranges into self.public of the public entries `name` saw at or after `start`."""
+        intervals = self.presence.get(name, [])
+        slices = []
+        for i in range(0, len(intervals), 2):
+            enter = max(intervals[i], start)
+            leave = intervals[i + 1] if i + 1 < len(intervals) else len(self.entries)
+            if enter < leave:
+                lo = bisect_left(self.public, enter)
+                hi = bisect_left(self.public, leave, lo)
+                if lo < hi:
+                    slices.append((lo, hi))
+        return slices
+
+    def _positions(self, name: str, start: int = 0) -> Iterator[int]:
+        """Log positions visible to `name` from `start` on, in order."""
+        private = self.private.get(name, [])
+        streams = [private[bisect_left(private, start):]]
+        streams += [self.public[lo:hi] for lo, hi in self._public_slices(name, start)]
+        # Private copies of public entries (actor not present) are never also in a public slice
+        return heapq.merge(*streams)
+
+    def render(self, position: int, viewer: str) -> str:
+        entry = self.entries[position]
+        if entry.own_text is not None and entry.actor == viewer:
+            return entry.own_text
+        return entry.text
+
+    def count(self, name: str) -> int:
+        """How many observations `name` has (without building the view)."""
+        return len(self.private.get(name, ())) + sum(hi - lo for lo, hi in self._public_slices(name))
+
+    def view(self, name: str) -> List[str]:
+        return [self.render(position, name) for position in self._positions(name)]
+
+    def since(self, name: str, cursor: int = 0) -> Tuple[List[str], int]:
+        """Observations of `name` recorded at or after log position `cursor`, and the next cursor."""
+        return [self.render(position, name) for position in self._positions(name, cursor)], len(self.entries)
+
+    def tail(self, name: str, n: int) -> List[str]:
+        """The last n observations of `name`, oldest first."""
+        if n <= 0:
+            return []
+        candidates = list(self.private.get(name, [])[-n:])
+        taken = 0
+        for lo, hi in reversed(self._public_slices(name)):
+            if taken >= n:
+                break
+            chunk = self.public[max(lo, hi - (n - taken)):hi]
+            candidates.extend(chunk)
+            taken += len(chunk)
+        return [self.render(position, name) for position in sorted(candidates)[-n:]]
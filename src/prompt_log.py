@@ -0,0 +1,162 @@
+import hashlib
+import heapq
+import json
+import os
+import re
+import shutil
+from pathlib import Path
+from typing import Dict, Iterator
+
+from .event_sink import indented_json
+
+# Prompts are split into blocks on blank lines; instruction boilerplate from the
+# prompt templates comes out as identical blocks and is stored only once.
+BLOCK_SEPARATOR = "\n\n"
+
+
+def block_hash(block: str) -> str:
+    return hashlib.sha1(block.encode("utf-8")).hexdigest()[:16]
+
+
+class PromptLogStore:
+    """Content-addressed, disk-backed prompt log shared by all agents in a run.
+
+    Layout under `directory`:
+      blobs.jsonl          {"hash", "text"} for every distinct prompt block, written once
+      entries/NNN-agent.jsonl   one line per call, the prompt replaced by its block hashes
+
+    Entries go to disk as they are logged, so nothing accumulates in memory.
+    Each agent's file is already in time order, so iter_entries() produces the
+    merged log with a k-way merge, and rebuilds each prompt exactly by joining
+    its blocks.
+    """
+
+    def __init__(self, directory: Path, fresh: bool = False):
+        self.directory = Path(directory)
+        self.entries_dir = self.directory / "entries"
+        self.blobs_path = self.directory / "blobs.jsonl"
+        if fresh and self.directory.exists():
+            shutil.rmtree(self.directory)
+        self.entries_dir.mkdir(parents=True, exist_ok=True)
+
+        self._known_blocks = set()
+        if self.blobs_path.exists():
+            for blob in self._read_jsonl(self.blobs_path):
+                self._known_blocks.add(blob["hash"])
+        self._agent_paths: Dict[str, Path] = {
+            self._read_agent_name(path): path for path in sorted(self.entries_dir.glob("*.jsonl"))
+        }
+        self._blob_file = None
+        self._agent_files = {}
+        self.entries_written = 0
+        self.prompt_bytes = 0
+        self.stored_bytes = 0
+
+    def append(self, entry: Dict) -> None:
+        """Spill one log entry to disk, storing any new prompt blocks.
+        
+        Entries without a prompt (a speaker picked without an LLM call) are stored as they are.
+        """
+        prompt = entry.get("prompt", "")
+        hashes = []
+        for block in prompt.split(BLOCK_SEPARATOR) if prompt else ():
+            digest = block_hash(block)
+            if digest not in self._known_blocks:
+                self._known_blocks.add(digest)
+                self._write_line(self._blobs(), {"hash": digest, "text": block})
+                self.stored_bytes += len(block.encode("utf-8"))
+            hashes.append(digest)
+        self.prompt_bytes += len(prompt.encode("utf-8"))
+
+        # Keep the original key order, with the prompt swapped for its block list
+        record = {("prompt_blocks" if key == "prompt" else key): (hashes if key == "prompt" else value)
+                  for key, value in entry.items()}
+        self._write_line(self._entries(entry["agent"]), record)
+        self.entries_written += 1
+
+    def _blobs(self):
+        if self._blob_file is None:
+            self._blob_file = self.blobs_path.open("a", encoding="utf-8")
+        return self._blob_file
+
+    def _entries(self, agent: str):
+        handle = self._agent_files.get(agent)
+        if handle is None:
+            path = self._agent_paths.get(agent)
+            if path is None:
+                slug = re.sub(r"[^A-Za-z0-9]+", "_", agent).strip("_").lower() or "agent"
+                path = self.entries_dir / f"{len(self._agent_paths):03d}-{slug}.jsonl"
+                self._agent_paths[agent] = path
+            handle = self._agent_files[agent] = path.open("a", encoding="utf-8")
+        return handle
+
+    def _write_line(self, handle, record: Dict) -> None:
+        handle.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+        handle.flush()
+
+    def close(self) -> None:
+        for handle in [self._blob_file, *self._agent_files.values()]:
+            if handle is not None:
+                handle.close()
+        self._blob_file = None
+        self._agent_files = {}
+
+    @staticmethod
+    def _read_jsonl(path: Path) -> Iterator[Dict]:
+        with path.open(encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        continue  # Torn last line after a crash
+
+    def _read_agent_name(self, path: Path) -> str:
+        for record in self._read_jsonl(path):
+            return record["agent"]
+        return path.stem
+
+    def load_blocks(self) -> Dict[str, str]:
+        """Map of block hash -> block text (one copy of each distinct block)."""
+        return {blob["hash"]: blob["text"] for blob in self._read_jsonl(self.blobs_path)} if self.blobs_path.exists() else {}
+
+    def iter_entries(self) -> Iterator[Dict]:
+        """Yield every entry in timestamp order with its full prompt reconstructed."""
+        for handle in self._agent_files.values():
+            handle.flush()
+        blocks = self.load_blocks()
+        streams = [self._read_jsonl(path) for path in self._agent_paths.values()]
+        for record in heapq.merge(*streams, key=lambda r: r["timestamp"]):
+            yield {("prompt" if key == "prompt_blocks" else key):
+                   (BLOCK_SEPARATOR.join(blocks[h] for h in value) if key == "prompt_blocks" else value)
+                   for key, value in record.items()}
+
+    def export_json(self, path: Path) -> Dict[str, int]:
+        """Write the merged log as prompts_log.json, entry by entry.
+        
+        Returns how many entries were LLM calls and how many were served from
+        the response cache (marked "cached"); entries without a prompt are neither.
+        """
+        path = Path(path)
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        count = cached = calls = 0
+        with tmp_path.open("w", encoding="utf-8") as out:
+            out.write("[")
+            for entry in self.iter_entries():
+                out.write("\n  " if count == 0 else ",\n  ")
+                out.write(indented_json(entry, 1))
+                count += 1
+                if "prompt" in entry:
+                    cached += bool(entry.get("cached"))
+                    calls += not entry.get("cached")
+            out.write("]" if count == 0 else "\n]")
+        os.replace(tmp_path, path)
+        return {"llm_calls": calls, "cached_replies": cached}
+
+    def stats(self) -> Dict:
+        return {
+            "entries": self.entries_written,
+            "distinct_blocks": len(self._known_blocks),
+            "prompt_bytes": self.prompt_bytes,
+            "stored_prompt_bytes": self.stored_bytes,
+        }
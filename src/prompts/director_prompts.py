@@ -130,4 +130,34 @@ Respond with JSON:
 {{
     "conclusion_narration": "Your cinematic closing narration (3-5 sentences)"
 }}
-"""
\ No newline at end of file
+"""
+
+# Fused turn prompt: speaker selection and the conclusion check in a single round-trip.
+# Reuses the speaker-selection guidance verbatim and swaps in a combined response format.
+DIRECTOR_TURN_PROMPT = DIRECTOR_SELECT_SPEAKER_PROMPT.split("Respond with JSON ONLY:")[0] + """SHOULD THE SCENE WRAP UP?
+Actions Performed: {action_count}
+Current Turn: {current_turn}/{max_turns}
+Minimum Turns: {min_turns}
+Minimum Actions Required: {min_actions}
+
+DO NOT wrap up if:
+- The current turn is less than {min_turns}
+- Fewer than {min_actions} actions have been performed (currently: {action_count})
+
+You SHOULD wrap up if:
+1. The main conflict has been resolved or reached a natural endpoint
+2. People have reached a compromise, agreement, or final standoff
+3. Someone has made a decisive exit
+4. Continuing would feel repetitive or forced
+
+If the scene continues, pick the next person and narrate as described above.
+If it wraps up, write the closing narration instead.
+
+Respond with JSON ONLY:
+{{
+    "should_end": true/false,
+    "conclusion_narration": "final narration that wraps up the scene cinematically (if ending, otherwise empty)",
+    "next_speaker": "Person's Name (if continuing)",
+    "narration": "brief narration of what's physically happening (if continuing, NEW imagery only)"
+}}
+"""
@@ -1,6 +1,9 @@
-from typing import List, Dict, Any, Optional
+from typing import Annotated, List, Dict, Any, Optional
 from datetime import datetime
 from pydantic import BaseModel, Field
+from .history import History
+from .observation_log import ObservationLog
+from .world_model import WorldModel
 
 class DialogueTurn(BaseModel):
     turn_number: int
@@ -17,13 +20,11 @@ class Action(BaseModel):
     target: Optional[str] = None  # Target of the action (object, location, person)
     description: str  # Narrative description of the action
     timestamp: datetime = Field(default_factory=datetime.now)
-    effects: Dict[str, Any] = Field(default_factory=dict)  # State changes caused by action
+    effects: Dict[str, Any] = Field(default_factory=dict)  # The WorldEvent the action applied, if any
 
 class CharacterMemory(BaseModel):
     """Memory buffer for a character."""
     character_name: str
-    observations: List[str] = Field(default_factory=list)  # What they've observed
-    inventory: List[str] = Field(default_factory=list)  # Items they possess
     goals: List[str] = Field(default_factory=list)  # Current goals
     perceptions: Dict[str, str] = Field(default_factory=dict)  # Perceptions of other characters
     important_facts: List[str] = Field(default_factory=list)  # Key facts to remember
@@ -41,22 +42,70 @@ class CharacterProfile(BaseModel):
         if self.memory is None:
             self.memory = CharacterMemory(
                 character_name=self.name,
-                inventory=self.initial_inventory.copy(),
                 goals=self.initial_goals.copy(),
                 # Seed the secret as an important fact only this character knows
                 important_facts=[f"SECRET: {self.secret}"] if self.secret else []
             )
 
+def append_items(existing: History, new: List) -> History:
+    """Graph channel reducer: nodes return only the new items, which are appended to the history.
+    
+    Appending costs the new items only, at turn 10 or turn 10,000: the newest
+    History extends its backing list in place, and the History the previous
+    state held still ends where it did (see src/history.py), so earlier
+    snapshots and histories a node still holds keep their contents.
+    """
+    if not isinstance(existing, History):
+        existing = History(existing)
+    return existing + new
+
+# StoryState.events keeps only this many of the latest events
+RECENT_EVENTS = 32
+
+def append_recent(existing: List, new: List) -> List:
+    """Graph channel reducer that appends to a new list keeping only the last RECENT_EVENTS items.
+    
+    Every event is streamed to the EventSink (story_events.jsonl) as it is
+    emitted, so the state holds just the tail that prompts and pacing read:
+    force_conclude's last 10 events and the turns since the last narration.
+    The copy is bounded by RECENT_EVENTS, so it costs the same at any turn.
+    """
+    if not new:
+        return existing
+    return (existing + new)[-RECENT_EVENTS:]
+
 class StoryState(BaseModel):
     seed_story: Dict[str, Any]
     current_turn: int = 0
-    story_narration: List[str] = []
-    dialogue_history: List[DialogueTurn] = Field(default_factory=list)
-    action_history: List[Action] = Field(default_factory=list)  # Track all actions
-    events: List[Dict[str, Any]] = Field(default_factory=list)
+    # Append-only channels: graph nodes return deltas, not the full list
+    story_narration: Annotated[History[str], append_items] = Field(default_factory=History)
+    dialogue_history: Annotated[History[DialogueTurn], append_items] = Field(default_factory=History)
+    action_history: Annotated[History[Action], append_items] = Field(default_factory=History)  # Track all actions
+    events: Annotated[List[Dict[str, Any]], append_recent] = Field(default_factory=list)  # Latest only; see EventSink
     character_profiles: Dict[str, CharacterProfile] = Field(default_factory=dict)
-    director_notes: List[str] = Field(default_factory=list)
+    director_notes: Annotated[History[str], append_items] = Field(default_factory=History)
     next_speaker: Optional[str] = None
+    pending_selection: Optional[Dict[str, Any]] = None  # Speaker/narration already chosen for the next turn
     is_concluded: bool = False
     conclusion_reason: Optional[str] = None
-    world_state: Dict[str, Any] = Field(default_factory=dict)  # Global world state (locations, objects, etc.)
\ No newline at end of file
+    # Presence, item ownership, tension and calls, changed only by applying WorldEvents (see WorldModel)
+    world: WorldModel = Field(default_factory=WorldModel)
+    # What each character has observed, stored once with visibility rules (see ObservationLog).
+    # Deliberately shared and mutable: nodes record observations in place, so every state
+    # snapshot sees the whole log (use counts/positions from the log to look back)
+    observation_log: ObservationLog = Field(default_factory=ObservationLog)
+
+class TrustedStoryState(StoryState):
+    """StoryState built without validation, like model_construct().
+    
+    Used as the graph nodes' input schema: LangGraph rebuilds the state object
+    from its channels before every node, and those values were validated when
+    they entered the graph, so revalidating the whole history each step is
+    wasted work that grows with story length.
+    """
+    def __init__(self, **data):
+        constructed = StoryState.model_construct(**data)
+        object.__setattr__(self, "__dict__", constructed.__dict__)
+        object.__setattr__(self, "__pydantic_fields_set__", constructed.__pydantic_fields_set__)
+        object.__setattr__(self, "__pydantic_extra__", constructed.__pydantic_extra__)
+        object.__setattr__(self, "__pydantic_private__", constructed.__pydantic_private__)
@@ -1,11 +1,41 @@
 from typing import List, Dict, Tuple, Optional
 from datetime import datetime
-from .schemas import StoryState, CharacterProfile, DialogueTurn, Action, CharacterMemory
+from .schemas import StoryState, CharacterProfile, DialogueTurn, Action, CharacterMemory, append_items
 from .config import StoryConfig
+from .context_engine import ContextEngine
+from .world_model import WorldEvent, WorldModel
+
+
+def start_scene(state: StoryState) -> None:
+    """Put the cast into the world with their starting items; they observe the scene from now on."""
+    for name, profile in state.character_profiles.items():
+        state.world.join(name, profile.initial_inventory)
+        state.observation_log.enter(name)
+
+
+def apply_world_event(state: StoryState, event: WorldEvent) -> WorldModel:
+    """Apply an action's event to what the cast can observe; returns the world after it.
+    
+    The event is applied to a snapshot, so state.world (and any state that
+    holds it) still shows the world before the action.
+    """
+    world = state.world.snapshot()
+    world.apply(event)
+    if event.actor in state.character_profiles:
+        if event.kind == "left":
+            state.observation_log.leave(event.actor)
+        elif event.kind == "entered":
+            state.observation_log.enter(event.actor)
+    notice = event.notice()
+    if notice is not None and notice[0] in state.character_profiles:
+        state.observation_log.note(*notice)
+    return world
+
 
 class StoryStateManager:
     def __init__(self, seed_story: Dict, characters: List[Dict], config: StoryConfig):
         self.config = config
+        self.context_engine = ContextEngine(config)
         self.state = StoryState(
             seed_story=seed_story,
             character_profiles={
@@ -18,14 +48,9 @@ class StoryStateManager:
                     initial_goals=char.get("initial_goals", [])
                 ) for char in characters
             },
-            world_state={
-                "location": "Shahrah-e-Faisal near Karachi Airport",
-                "time": "late afternoon",
-                "traffic_cleared": False,
-                "accident_resolved": False,
-                "characters_present": [char["name"] for char in characters]
-            }
+            world=WorldModel(location="Shahrah-e-Faisal near Karachi Airport", time="late afternoon")
         )
+        start_scene(self.state)
     
     def add_turn(self, speaker: str, dialogue: str, metadata: Dict = None) -> None:
         """Add a dialogue turn and increment turn count."""
@@ -35,41 +60,36 @@ class StoryStateManager:
             dialogue=dialogue,
             metadata=metadata or {}
         )
-        self.state.dialogue_history.append(turn)
+        self.state.dialogue_history = append_items(self.state.dialogue_history, [turn])
         self.state.current_turn += 1
         
         # Update character memory with their own dialogue
         if speaker in self.state.character_profiles:
-            char_memory = self.state.character_profiles[speaker].memory
-            char_memory.observations.append(f"I said: {dialogue}")
+            self.state.observation_log.note(speaker, f"I said: {dialogue}")
     
     def add_action(self, actor: str, action_type: str, target: Optional[str], 
-                   description: str, effects: Dict = None) -> None:
-        """Add an action and update story state."""
+                   description: str, event: Optional[WorldEvent] = None) -> None:
+        """Add an action and apply its world event, if any."""
         action = Action(
             turn_number=self.state.current_turn,
             actor=actor,
             action_type=action_type,
             target=target,
             description=description,
-            effects=effects or {}
+            effects=event.model_dump(exclude_none=True) if event is not None else {}
         )
-        self.state.action_history.append(action)
+        self.state.action_history = append_items(self.state.action_history, [action])
         
-        # Apply effects to world state
-        if effects:
-            self.state.world_state.update(effects)
-        
-        # Update actor's memory
-        if actor in self.state.character_profiles:
-            char_memory = self.state.character_profiles[actor].memory
-            char_memory.observations.append(f"I performed action: {description}")
+        # Everyone present observes the action; the actor remembers doing it.
+        # Recorded once in the shared log rather than copied into each memory.
+        self.state.observation_log.record(
+            f"{actor} performed action: {description}",
+            actor=actor,
+            own_text=f"I performed action: {description}"
+        )
         
-        # Update other characters' memory (they observe the action)
-        for char_name in self.state.character_profiles:
-            if char_name != actor and char_name in self.state.world_state.get("characters_present", []):
-                char_memory = self.state.character_profiles[char_name].memory
-                char_memory.observations.append(f"{actor} performed action: {description}")
+        if event is not None:
+            self.state.world = apply_world_event(self.state, event)
     
     def update_character_memory(self, character_name: str, observation: str = None,
                                fact: str = None, perception: Dict[str, str] = None) -> None:
@@ -80,7 +100,7 @@ class StoryStateManager:
         memory = self.state.character_profiles[character_name].memory
         
         if observation:
-            memory.observations.append(observation)
+            self.state.observation_log.note(character_name, observation)
         if fact:
             memory.important_facts.append(fact)
         if perception:
@@ -92,75 +112,11 @@ class StoryStateManager:
             print(f"WARNING: Character '{character_name}' not found in character profiles")
             return ""
         
-        char_profile = self.state.character_profiles[character_name]
-        char_memory = char_profile.memory
-        
-        # Get recent dialogue (last 10 turns)
-        recent_turns = self.state.dialogue_history[-10:]
-        history_text = "\n".join([
-            f"{turn.speaker}: {turn.dialogue}"
-            for turn in recent_turns
-        ])
-        
-        # Get recent actions (last 5)
-        recent_actions = self.state.action_history[-5:]
-        actions_text = "\n".join([
-            f"[ACTION] {action.actor}: {action.description}"
-            for action in recent_actions
-        ])
-        
-        # Build memory summary
-        memory_text = f"""
-Your Inventory: {', '.join(char_memory.inventory) if char_memory.inventory else 'None'}
-Your Goals: {', '.join(char_memory.goals) if char_memory.goals else 'None'}
-Key Facts You Remember: {'; '.join(char_memory.important_facts[-5:]) if char_memory.important_facts else 'None'}
-Your Recent Observations: {'; '.join(char_memory.observations[-5:]) if char_memory.observations else 'None'}
-"""
-        
-        return f"""
-Initial Event: {self.state.seed_story.get('description', 'Unknown event')}
-
-World State:
-Location: {self.state.world_state.get('location', 'Unknown')}
-Characters Present: {', '.join(self.state.world_state.get('characters_present', []))}
-
-Your Memory:
-{memory_text}
-
-Recent Actions:
-{actions_text if actions_text else 'No actions yet'}
-
-Recent Dialogue:
-{history_text if history_text else 'No dialogue yet'}
-"""
+        return self.context_engine.character_context(self.state, character_name)
         
     def get_context_for_director(self) -> str:
-        """Return full story context for director decisions."""
-        history_text = "\n".join([
-            f"[{turn.turn_number}] {turn.speaker}: {turn.dialogue}"
-            for turn in self.state.dialogue_history
-        ])
-        
-        actions_text = "\n".join([
-            f"[{action.turn_number}] ACTION by {action.actor}: {action.description}"
-            for action in self.state.action_history
-        ])
-        
-        return f"""
-Story Title: {self.state.seed_story.get('title', 'Untitled')}
-Description: {self.state.seed_story.get('description', '')}
-
-World State: {self.state.world_state}
-
-Actions Performed ({len(self.state.action_history)} total):
-{actions_text if actions_text else 'No actions yet'}
-
-Dialogue History:
-{history_text}
-
-Director Notes:
-{chr(10).join(self.state.director_notes)}
-"""
+        """Return story context for director decisions, bounded by max_context_length."""
+        return self.context_engine.director_context(self.state)
 
     def should_end_story(self) -> Tuple[bool, str]:
         """Check if story should conclude based on turn limits."""
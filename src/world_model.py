@@ -0,0 +1,186 @@
+from typing import Callable, Dict, List, Optional, Set, Tuple
+from pydantic import BaseModel, Field
+from .history import History
+
+
+class WorldEvent(BaseModel):
+    """One change to the world, as recorded in WorldModel.events."""
+    kind: str  # A key of HANDLERS, e.g. "left", "item_given"
+    actor: str
+    target: Optional[str] = None
+    item: Optional[str] = None
+    turn: int = 0
+
+    def notice(self) -> Optional[Tuple[str, str]]:
+        """(character, private observation) the target of a GIVE/SHOW gets, if any."""
+        if self.item is None or self.target is None:
+            return None
+        if self.kind == "item_given":
+            return self.target, f"{self.actor} gave me: {self.item}"
+        if self.kind == "item_shown":
+            return self.target, f"{self.actor} showed me: {self.item}"
+        return None
+
+
+# Components a snapshot shares with the live model until one of them is written
+_SHARED = ("present", "holdings", "on_call", "last_action", "holders")
+
+
+class WorldModel(BaseModel):
+    """The scene's world state, changed only by applying WorldEvents.
+
+    Every event is appended to `events` and folded into indexes, so the usual
+    questions are dictionary lookups: who is present, who holds an item, what
+    someone is holding, who is on a call, what someone last did. Applying an
+    event costs the same at turn 10 or turn 10,000, and the model never grows
+    by more than the event itself.
+
+    snapshot() is O(1): the copy shares every component with the live model,
+    and whichever side writes a component next copies just that component
+    (values are replaced, never mutated in place, so the shallow copy is enough).
+    The event log is a History, so both sides share it and appending to one
+    leaves the other's log as it was.
+    """
+
+    location: str = "Unknown"
+    time: str = ""
+    traffic_cleared: bool = False
+    accident_resolved: bool = False
+    tension: str = "normal"
+    present: Dict[str, int] = Field(default_factory=dict)  # Name -> turn they (re)entered, in scene order
+    holdings: Dict[str, List[str]] = Field(default_factory=dict)  # Every cast member -> items held
+    on_call: Dict[str, int] = Field(default_factory=dict)  # Name -> turn the call started
+    last_action: Dict[str, str] = Field(default_factory=dict)  # Name -> kind of their latest event
+    events: History[WorldEvent] = Field(default_factory=History)
+    revision: int = 0  # Events applied; a snapshot keeps the revision it was taken at
+    # Derived, not saved. Plain fields rather than private attributes, which are slow to read.
+    holders: Dict[str, Tuple[str, ...]] = Field(default_factory=dict, exclude=True)  # Item -> who holds one
+    shared: Set[str] = Field(default_factory=set, exclude=True)  # Components a snapshot still shares
+
+    def model_post_init(self, context) -> None:
+        holders = {}
+        for name, items in self.holdings.items():
+            for item in items:
+                if name not in holders.get(item, ()):
+                    holders[item] = holders.get(item, ()) + (name,)
+        self.holders = holders
+
+    def _writable(self, component: str) -> Dict:
+        """The component, copied first if a snapshot still shares it."""
+        value = getattr(self, component)
+        if component in self.shared:
+            value = dict(value)
+            setattr(self, component, value)
+            self.shared.discard(component)
+        return value
+
+    def join(self, name: str, items: List[str] = (), turn: int = 0) -> None:
+        """Add a cast member to the scene with what they start out holding."""
+        self._writable("holdings").setdefault(name, [])
+        for item in items:
+            self._add_item(name, item)
+        self._writable("present").setdefault(name, turn)
+
+    def apply(self, event: WorldEvent) -> None:
+        HANDLERS[event.kind](self, event)
+        if event.actor in self.holdings:
+            self._writable("last_action")[event.actor] = event.kind
+        self.events = self.events + [event]
+        self.revision += 1
+
+    def snapshot(self) -> "WorldModel":
+        """An independent copy of the current state, including the event log."""
+        # A shallow copy built without validation, like TrustedStoryState
+        copy = WorldModel.__new__(WorldModel)
+        object.__setattr__(copy, "__dict__", {**self.__dict__, "shared": set(_SHARED)})
+        object.__setattr__(copy, "__pydantic_fields_set__", set(self.__pydantic_fields_set__))
+        object.__setattr__(copy, "__pydantic_extra__", None)
+        object.__setattr__(copy, "__pydantic_private__", None)
+        self.shared = set(_SHARED)
+        return copy
+
+    # Queries
+    def is_present(self, name: str) -> bool:
+        return name in self.present
+
+    def present_names(self) -> List[str]:
+        return list(self.present)
+
+    def items_of(self, name: str) -> List[str]:
+        return self.holdings.get(name, [])
+
+    def holders_of(self, item: str) -> Tuple[str, ...]:
+        return self.holders.get(item, ())
+
+    def is_on_call(self, name: str) -> bool:
+        return name in self.on_call
+
+    def describe(self) -> str:
+        """One-line summary for prompts."""
+        parts = [f"Location: {self.location}", f"Time: {self.time}", f"Tension: {self.tension}",
+                 f"Present: {', '.join(self.present) or 'nobody'}"]
+        if self.on_call:
+            parts.append(f"On a call: {', '.join(self.on_call)}")
+        held = "; ".join(f"{name}: {', '.join(items)}" for name, items in self.holdings.items() if items)
+        parts.append(f"Items: {held or 'none'}")
+        return " | ".join(parts)
+
+    def _add_item(self, name: str, item: str) -> None:
+        holdings = self._writable("holdings")
+        holdings[name] = holdings.get(name, []) + [item]
+        holders = self._writable("holders")
+        if name not in holders.get(item, ()):
+            holders[item] = holders.get(item, ()) + (name,)
+
+    def _remove_item(self, name: str, item: str) -> None:
+        holdings = self._writable("holdings")
+        holdings[name] = [i for i in holdings.get(name, []) if i != item]
+        holders = self._writable("holders")
+        remaining = tuple(holder for holder in holders.get(item, ()) if holder != name)
+        if remaining:
+            holders[item] = remaining
+        else:
+            holders.pop(item, None)
+
+
+def _left(world: WorldModel, event: WorldEvent) -> None:
+    world._writable("present").pop(event.actor, None)
+
+
+def _entered(world: WorldModel, event: WorldEvent) -> None:
+    world._writable("present").setdefault(event.actor, event.turn)
+
+
+def _call_started(world: WorldModel, event: WorldEvent) -> None:
+    world._writable("on_call")[event.actor] = event.turn
+
+
+def _item_given(world: WorldModel, event: WorldEvent) -> None:
+    if event.item is None:
+        return
+    world._remove_item(event.actor, event.item)
+    # Items handed to someone outside the cast (the crowd, a passer-by) leave the scene
+    if event.target in world.holdings:
+        world._add_item(event.target, event.item)
+
+
+def _threatened(world: WorldModel, event: WorldEvent) -> None:
+    world.tension = "high"
+
+
+def _no_state_change(world: WorldModel, event: WorldEvent) -> None:
+    """Showing, taking (without an item), searching, moving and gesturing only update last_action."""
+
+
+HANDLERS: Dict[str, Callable[[WorldModel, WorldEvent], None]] = {
+    "left": _left,
+    "entered": _entered,
+    "call_started": _call_started,
+    "item_given": _item_given,
+    "item_shown": _no_state_change,
+    "threatened": _threatened,
+    "took": _no_state_change,
+    "searched": _no_state_change,
+    "moved": _no_state_change,
+    "gestured": _no_state_change,
+}
@@ -0,0 +1,59 @@
+import asyncio
+
+from langchain_core.messages import AIMessage
+
+from src.agents.base_agent import BaseAgent
+from src.config import StoryConfig
+from src.llm import backends
+from src.llm.cache import ResponseCache
+
+
+class FakeChatClient:
+    """Stands in for ChatGoogleGenerativeAI; answers with its own generation parameters."""
+
+    def __init__(self, model, temperature, max_output_tokens, max_retries):
+        self.model = model
+        self.temperature = temperature
+        self.max_output_tokens = max_output_tokens
+        self.calls = 0
+
+    async def ainvoke(self, messages):
+        self.calls += 1
+        return AIMessage(content=f"{self.model}|{self.temperature}|{self.max_output_tokens}")
+
+
+def make_agent(monkeypatch, **overrides):
+    monkeypatch.setattr(backends, "ChatGoogleGenerativeAI", FakeChatClient)
+    monkeypatch.setattr(backends, "_clients", {})
+    config = StoryConfig(llm_backend="gemini", llm_max_retries=0, **overrides)
+    return BaseAgent("Tester", config)
+
+
+def test_override_borrows_client_keyed_by_effective_parameters(monkeypatch):
+    agent = make_agent(monkeypatch)
+    default = asyncio.run(agent.generate_response("hello"))
+    override = asyncio.run(agent.generate_response("hello", temperature=0.0, max_tokens=64))
+    assert default == "gemma-3-27b-it|0.7|2000"
+    assert override == "gemma-3-27b-it|0.0|64"
+    assert set(backends._clients) == {("gemma-3-27b-it", 0.7, 2000), ("gemma-3-27b-it", 0.0, 64)}
+    # Passing the config values explicitly is the default client, not a new one
+    asyncio.run(agent.generate_response("hello", temperature=0.7, max_tokens=2000))
+    assert len(backends._clients) == 2
+
+
+def test_override_is_part_of_the_cache_key(monkeypatch, tmp_path):
+    agent = make_agent(monkeypatch, cache_dir=str(tmp_path))
+    asyncio.run(agent.generate_response("hello", max_tokens=64))
+    assert agent.cache.get(ResponseCache.make_key("gemma-3-27b-it", 0.7, 64, "hello")) == "gemma-3-27b-it|0.7|64"
+    assert agent.cache.get(ResponseCache.make_key("gemma-3-27b-it", 0.7, 2000, "hello")) is None
+
+
+def test_prewarm_creates_override_clients(monkeypatch):
+    make_agent(monkeypatch)
+    backends._clients.clear()
+    config = StoryConfig(llm_backend="gemini", fallback_models=["gemma-3-12b-it"])
+    backends.prewarm_clients(config, overrides=[(0.0, 64)])
+    assert set(backends._clients) == {
+        ("gemma-3-27b-it", 0.7, 2000), ("gemma-3-27b-it", 0.0, 64),
+        ("gemma-3-12b-it", 0.7, 2000), ("gemma-3-12b-it", 0.0, 64),
+    }
@@ -0,0 +1,46 @@
+from src.history import History
+from src.schemas import DialogueTurn, StoryState, append_items
+
+
+def test_append_keeps_earlier_views_unchanged():
+    first = append_items(History(), ["a"])
+    second = append_items(first, ["b", "c"])
+    assert list(first) == ["a"]
+    assert list(second) == ["a", "b", "c"]
+    assert second[-1] == "c" and second[1:] == ["b", "c"]
+
+
+def test_append_to_newest_view_extends_shared_storage():
+    history = History(["a"])
+    longer = append_items(history, ["b"])
+    assert longer._items is history._items
+
+
+def test_append_to_older_view_branches():
+    base = History(["a"])
+    main = append_items(base, ["b"])
+    branch = append_items(base, ["x"])
+    assert list(main) == ["a", "b"]
+    assert list(branch) == ["a", "x"]
+    assert branch._items is not main._items
+
+
+def test_empty_update_returns_same_history():
+    history = History(["a"])
+    assert append_items(history, []) is history
+
+
+def test_plain_list_is_converted():
+    assert append_items(["a"], ["b"]) == History(["a", "b"])
+
+
+def test_state_round_trips_through_json():
+    state = StoryState(seed_story={}, story_narration=["It begins."],
+                       dialogue_history=[DialogueTurn(turn_number=1, speaker="Saleem", dialogue="Bhai!")])
+    assert isinstance(state.dialogue_history, History)
+    data = state.model_dump(mode="json")
+    assert data["story_narration"] == ["It begins."]
+    assert data["dialogue_history"][0]["dialogue"] == "Bhai!"
+    restored = StoryState.model_validate(data)
+    assert restored.dialogue_history == state.dialogue_history
+    assert StoryState.model_validate_json(state.model_dump_json()).story_narration == ["It begins."]
@@ -0,0 +1,103 @@
+import asyncio
+
+from langchain_core.messages import AIMessage
+
+from src.agents.base_agent import BaseAgent
+from src.config import StoryConfig
+from src.llm import backends
+from src.llm.cache import ResponseCache
+from src.prompt_log import PromptLogStore
+
+
+def test_miss_then_hit(tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    calls = []
+
+    async def generate():
+        calls.append(1)
+        return "reply"
+
+    async def scenario():
+        return [await cache.get_or_generate("k", generate) for _ in range(2)]
+
+    assert asyncio.run(scenario()) == [("reply", False), ("reply", True)]
+    assert len(calls) == 1
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+    # Entries survive a restart
+    assert ResponseCache(str(tmp_path)).get("k") == "reply"
+
+
+def test_concurrent_identical_requests_are_coalesced(tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    calls = []
+
+    async def generate():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "reply"
+
+    async def scenario():
+        return await asyncio.gather(*(cache.get_or_generate("k", generate) for _ in range(5)))
+
+    results = asyncio.run(scenario())
+    assert len(calls) == 1
+    assert [response for response, _ in results] == ["reply"] * 5
+    assert sum(from_cache for _, from_cache in results) == 4
+    assert cache.stats()["coalesced"] == 4
+
+
+def test_failed_leader_releases_waiters(tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    calls = []
+
+    async def generate():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        if len(calls) == 1:
+            raise RuntimeError("backend down")
+        return "reply"
+
+    async def scenario():
+        return await asyncio.gather(*(cache.get_or_generate("k", generate) for _ in range(2)),
+                                    return_exceptions=True)
+
+    leader, waiter = asyncio.run(scenario())
+    assert isinstance(leader, RuntimeError)
+    assert waiter == ("reply", False)
+
+
+def test_store_callback_files_response_under_its_own_key(tmp_path):
+    cache = ResponseCache(str(tmp_path))
+
+    async def generate():
+        return "reply"
+
+    asyncio.run(cache.get_or_generate("k", generate, store=lambda response: cache.put("other", response)))
+    assert cache.get("k") is None
+    assert cache.get("other") == "reply"
+
+
+class EchoClient:
+    def __init__(self, **kwargs):
+        pass
+
+    async def ainvoke(self, messages):
+        return AIMessage(content="reply")
+
+
+def test_cache_hits_are_logged_but_not_counted_as_llm_calls(monkeypatch, tmp_path):
+    monkeypatch.setattr(backends, "ChatGoogleGenerativeAI", EchoClient)
+    monkeypatch.setattr(backends, "_clients", {})
+    prompt_log = PromptLogStore(tmp_path / "prompt_log")
+    agent = BaseAgent("Tester", StoryConfig(llm_backend="gemini", cache_dir=str(tmp_path / "cache")), prompt_log)
+
+    async def scenario():
+        for _ in range(3):
+            await agent.generate_response("hello")
+
+    asyncio.run(scenario())
+    assert agent.llm_calls == 1
+    assert agent.cached_replies == 2
+    assert prompt_log.export_json(tmp_path / "prompts_log.json") == {"llm_calls": 1, "cached_replies": 2}
+    assert [entry.get("cached", False) for entry in prompt_log.iter_entries()] == [False, True, True]
+    prompt_log.close()
@@ -0,0 +1,60 @@
+import asyncio
+import contextlib
+import io
+from pathlib import Path
+
+import pytest
+
+from src.config import StoryConfig
+from src.llm.replay import ReplayChatModel
+from src.main import load_scenario, resume_story, run_story
+from src.schemas import TrustedStoryState
+
+PROJECT_ROOT = Path(__file__).parent.parent
+SCENARIO = PROJECT_ROOT / "examples" / "rickshaw_accident"
+
+
+class Interrupted(BaseException):
+    """Stops a run mid-story the way a crash would (agents only catch Exception)."""
+
+
+def replay_config(**overrides) -> StoryConfig:
+    return StoryConfig(llm_backend="replay", cassette_path=str(PROJECT_ROOT / "prompts_log.json"),
+                       llm_max_retries=0, **overrides)
+
+
+def story(result) -> dict:
+    """The final state without per-run timestamps."""
+    data = TrustedStoryState(**result["final_state"]).model_dump(mode="json")
+    for item in data["dialogue_history"] + data["action_history"]:
+        item.pop("timestamp")
+    return data
+
+
+def run(coroutine):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return asyncio.run(coroutine)
+
+
+@pytest.mark.parametrize("interrupt_at", [5, 18])
+def test_resumed_run_matches_uninterrupted_run(tmp_path, monkeypatch, interrupt_at):
+    seed, characters = load_scenario(SCENARIO)
+    expected = run(run_story(seed, characters, replay_config(), tmp_path / "uninterrupted"))
+
+    calls = {"count": 0}
+    next_response = ReplayChatModel.next_response
+
+    def interrupting_next_response(self, prompt):
+        calls["count"] += 1
+        if calls["count"] == interrupt_at:
+            raise Interrupted()
+        return next_response(self, prompt)
+
+    monkeypatch.setattr(ReplayChatModel, "next_response", interrupting_next_response)
+    config = replay_config(checkpoint_path=str(tmp_path / "checkpoints.db"))
+    with pytest.raises(Interrupted):
+        run(run_story(seed, characters, config, tmp_path / "resumed", run_id="r1"))
+    resumed = run(resume_story("r1", config, tmp_path / "resumed"))
+
+    assert story(resumed) == story(expected)
+    assert resumed["llm_calls"] == expected["llm_calls"]
@@ -0,0 +1,52 @@
+import asyncio
+import contextlib
+import io
+import json
+from pathlib import Path
+
+from src.config import StoryConfig
+from src.graph.speaker_model import LOCAL_PICK_AGENT, SpeakerModel, examples_from_logs
+from src.main import load_scenario, run_story
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+
+def selection_prompt(dialogue: str) -> str:
+    return (f"Recent Dialogue:\n{dialogue}\n\nRecent Actions:\nNone\n\n"
+            f"Available People:\nSaleem, Ahmed Malik\n\nPick the next speaker.")
+
+
+def director_pick(dialogue: str, next_speaker: str) -> dict:
+    return {"timestamp": "", "agent": "Director", "prompt": selection_prompt(dialogue),
+            "response": json.dumps({"next_speaker": next_speaker, "narration": ""})}
+
+
+def test_local_picks_fill_in_turns_but_are_not_labels(tmp_path):
+    log = [
+        director_pick("None yet", "Saleem"),
+        director_pick("Saleem: Bhai, look at my rickshaw!", "Ahmed Malik"),
+        {"timestamp": "", "agent": LOCAL_PICK_AGENT, "next_speaker": "Saleem", "confidence": 0.9, "turn": 3},
+        director_pick("Saleem: Bhai, look at my rickshaw!\nAhmed Malik: Move it.\nSaleem: Sahib, please!",
+                      "Ahmed Malik"),
+    ]
+    path = tmp_path / "prompts_log.json"
+    path.write_text(json.dumps(log))
+    examples = examples_from_logs([str(path)])
+    assert [label for _, label in examples] == ["Saleem", "Ahmed Malik", "Ahmed Malik"]
+    assert examples[-1][0].turns == ["Saleem", "Ahmed Malik", "Saleem"]
+
+
+def test_local_picks_are_logged_and_not_counted_as_calls(tmp_path):
+    model_path = tmp_path / "speaker_model.json"
+    SpeakerModel.fit(examples_from_logs([str(PROJECT_ROOT / "prompts_log.json")])).save(str(model_path))
+    config = StoryConfig(llm_backend="replay", cassette_path=str(PROJECT_ROOT / "prompts_log.json"),
+                         llm_max_retries=0, speaker_model_path=str(model_path), speaker_model_threshold=0.0)
+    seed, characters = load_scenario(PROJECT_ROOT / "examples" / "rickshaw_accident")
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = asyncio.run(run_story(seed, characters, config, tmp_path / "run"))
+
+    log = json.loads(Path(result["prompts_path"]).read_text())
+    local_picks = [entry for entry in log if entry["agent"] == LOCAL_PICK_AGENT]
+    assert local_picks
+    assert all("prompt" not in entry for entry in local_picks)
+    assert result["llm_calls"] == len(log) - len(local_picks)
@@ -0,0 +1,59 @@
+import asyncio
+import contextlib
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+from src.config import StoryConfig
+from src.graph.degraded import degraded_gesture
+from src.main import load_scenario, run_story
+from src.observation_log import ObservationLog
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+
+def slow_replay_config(**overrides) -> StoryConfig:
+    # Every call takes 0.3s against a 0.1s director share of a 0.2s turn
+    return StoryConfig(llm_backend="replay", cassette_path=str(PROJECT_ROOT / "prompts_log.json"),
+                       replay_latency="fixed:0.3", turn_slo_seconds=0.2, min_turns=2, max_turns=3,
+                       min_actions=0, llm_max_retries=0, **overrides)
+
+
+def run_slow_story(tmp_path, **overrides) -> dict:
+    seed, characters = load_scenario(PROJECT_ROOT / "examples" / "rickshaw_accident")
+    # Only the characters the recorded cassette has replies for
+    characters = {**characters, "characters": [
+        character for character in characters["characters"] if character["name"] in ("Saleem", "Ahmed Malik")
+    ]}
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = asyncio.run(run_story(seed, characters, slow_replay_config(**overrides), tmp_path))
+    return json.loads(Path(result["output_path"]).read_text())
+
+
+@pytest.mark.parametrize("mode", [{}, {"fused_director": True}, {"speculative_director": True}])
+def test_degraded_moves_are_committed_when_the_slo_expires(tmp_path, mode):
+    output = run_slow_story(tmp_path, **mode)
+    counters = output["metadata"]["metrics"]["counters"]
+    turns = output["metadata"]["total_turns"]
+    assert turns == 3
+    # Every director pick and every reply ran over budget and was replaced locally
+    assert counters["slo_degraded_director"] == turns
+    assert counters["slo_degraded_character"] == turns
+    assert output["metadata"]["slo"]["degraded"] == turns
+    replies = [event for event in output["events"] if event["type"] in ("dialogue", "action")]
+    assert len(replies) == turns
+    assert all(event["action_type"] == "gesture" and event["metadata"]["degraded"] for event in replies)
+    assert not any(event["type"] == "narration" and not event.get("metadata") for event in output["events"])
+
+
+def test_degraded_gesture_avoids_recent_gestures():
+    log = ObservationLog()
+    log.enter("Saleem")
+    first = degraded_gesture("Saleem", ["Keys"], log)
+    assert first["response"] == "Saleem fidgets with the keys."
+    assert first["degraded"]
+    log.note("Saleem", f"I performed action: {first['response']}")
+    second = degraded_gesture("Saleem", ["Keys"], log)
+    assert second["response"] != first["response"]
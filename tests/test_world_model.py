@@ -0,0 +1,108 @@
+import asyncio
+import contextlib
+import io
+from pathlib import Path
+
+from src.agents.character_agent import CharacterAgent
+from src.agents.director_agent import DirectorAgent
+from src.config import StoryConfig
+from src.graph.narrative_graph import NarrativeGraph
+from src.main import load_scenario
+from src.schemas import StoryState, TrustedStoryState
+from src.story_state import StoryStateManager, start_scene
+from src.world_model import WorldEvent, WorldModel
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+
+def make_world() -> WorldModel:
+    world = WorldModel(location="Shahrah-e-Faisal")
+    world.join("Saleem", ["keys", "phone"])
+    world.join("Ahmed Malik", ["phone"])
+    return world
+
+
+def test_join_indexes_holdings():
+    world = make_world()
+    assert world.present_names() == ["Saleem", "Ahmed Malik"]
+    assert world.items_of("Saleem") == ["keys", "phone"]
+    assert world.holders_of("phone") == ("Saleem", "Ahmed Malik")
+
+
+def test_item_given_moves_item_between_holders():
+    world = make_world()
+    world.apply(WorldEvent(kind="item_given", actor="Saleem", target="Ahmed Malik", item="keys", turn=1))
+    assert world.items_of("Saleem") == ["phone"]
+    assert world.items_of("Ahmed Malik") == ["phone", "keys"]
+    assert world.holders_of("keys") == ("Ahmed Malik",)
+    assert world.last_action["Saleem"] == "item_given"
+
+
+def test_item_given_outside_cast_leaves_scene():
+    world = make_world()
+    world.apply(WorldEvent(kind="item_given", actor="Saleem", target="a passer-by", item="keys", turn=1))
+    assert world.holders_of("keys") == ()
+    assert "a passer-by" not in world.holdings
+
+
+def test_presence_call_and_tension_handlers():
+    world = make_world()
+    world.apply(WorldEvent(kind="left", actor="Saleem", turn=1))
+    assert not world.is_present("Saleem")
+    world.apply(WorldEvent(kind="entered", actor="Saleem", turn=2))
+    assert world.present_names() == ["Ahmed Malik", "Saleem"]
+    world.apply(WorldEvent(kind="call_started", actor="Ahmed Malik", turn=3))
+    assert world.is_on_call("Ahmed Malik")
+    world.apply(WorldEvent(kind="threatened", actor="Ahmed Malik", target="Saleem", turn=4))
+    assert world.tension == "high"
+    assert world.revision == 4 and len(world.events) == 4
+
+
+def test_indexes_rebuilt_on_validation():
+    world = make_world()
+    world.apply(WorldEvent(kind="item_given", actor="Saleem", target="Ahmed Malik", item="keys", turn=1))
+    restored = WorldModel.model_validate(world.model_dump(mode="json"))
+    assert restored.holders_of("keys") == ("Ahmed Malik",)
+    assert restored.events == world.events
+
+
+def test_snapshot_is_unchanged_by_later_events():
+    world = make_world()
+    world.apply(WorldEvent(kind="call_started", actor="Saleem", turn=1))
+    snapshot = world.snapshot()
+    before = snapshot.model_dump()
+    world.apply(WorldEvent(kind="item_given", actor="Saleem", target="Ahmed Malik", item="keys", turn=2))
+    world.apply(WorldEvent(kind="left", actor="Ahmed Malik", turn=3))
+    assert snapshot.model_dump() == before
+    assert snapshot.holders_of("keys") == ("Saleem",)
+    # and the other way round
+    snapshot.apply(WorldEvent(kind="threatened", actor="Saleem", turn=2))
+    assert world.tension == "normal"
+    assert len(world.events) == 3 and len(snapshot.events) == 2
+
+
+def test_graph_states_keep_the_world_they_were_captured_with():
+    config = StoryConfig(llm_backend="replay", cassette_path=str(PROJECT_ROOT / "prompts_log.json"), llm_max_retries=0)
+    seed, characters = load_scenario(PROJECT_ROOT / "examples" / "rickshaw_accident")
+    manager = StoryStateManager(seed, characters["characters"], config)
+    state = StoryState(seed_story=seed, character_profiles=manager.state.character_profiles)
+    start_scene(state)
+    story_graph = NarrativeGraph(
+        config,
+        [CharacterAgent(name=name, config=config) for name in manager.state.character_profiles],
+        DirectorAgent(config)
+    )
+
+    async def capture():
+        captured = []
+        async for values in story_graph.graph.astream(state, stream_mode="values"):
+            world = TrustedStoryState(**values).world
+            captured.append((world, world.model_dump()))
+        return captured
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        captured = asyncio.run(capture())
+    # The replayed story applies world events, so later states differ from earlier ones
+    assert captured[-1][0].revision > captured[0][0].revision
+    for world, dumped in captured:
+        assert world.model_dump() == dumped